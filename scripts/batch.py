@@ -0,0 +1,264 @@
+import os
+import sys
+import csv
+import glob
+import json
+import time
+import argparse
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from PIL import Image
+
+# Προσθέτουμε τον φάκελο 'scripts' στο PATH για να βρει τα modules (όπως στο main.py)
+if 'scripts' not in sys.path:
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from image_split import load_and_split_image
+from compression import reconstruct_channel_sweep, merge_and_save_image
+from evaluation import calculate_compression_ratio, evaluate_reconstructions
+from metrics_calculation import set_backend
+import main
+from main import process_channels, render_comparison_file, RANKS_TO_TEST, MATRIX_BACKEND, PLOT_FILE, EVAL_SSIM
+
+# --- Μαζική (batch) συμπίεση φακέλων εικόνων ---
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.tif', '.tiff')
+BATCH_OUTPUT_DIR = 'batch_output'
+BATCH_WORKERS = os.cpu_count() or 1
+
+# Ανώτατο πλήθος pixels (άθροισμα M*N) των εικόνων που επεξεργάζονται ταυτόχρονα.
+# Περιορίζει τη μνήμη: κάθε εικόνα χρειάζεται μερικά float64 αντίγραφα M x N ανά κανάλι.
+MAX_INFLIGHT_PIXELS = 50_000_000
+
+# Γράφημα σύγκρισης ανά εικόνα: "none" ή "file" (<output_dir>/<εικόνα>/PLOT_FILE).
+# Σχεδιάζεται σύγχρονα μέσα στη διεργασία του εργάτη (οι εικόνες τρέχουν ήδη παράλληλα),
+# ώστε ένα σφάλμα σχεδίασης να μετράει ως αποτυχία της εικόνας.
+BATCH_PLOT = 'none'
+
+# Η cache της SVD (main.USE_SVD_CACHE) είναι απενεργοποιημένη στους εργάτες: η LRU
+# εκκαθάριση δεν είναι ασφαλής όταν πολλές διεργασίες γράφουν στον ίδιο φάκελο (μια
+# διεργασία μπορεί να διαγράψει εγγραφή που φορτώνει μια άλλη) και σε μια δέσμη κάθε
+# εικόνα συμπιέζεται συνήθως μία φορά.
+BATCH_SVD_CACHE = False
+
+
+def find_images(source):
+    """
+    Επιστρέφει τις εικόνες ενός φακέλου ή ενός μοτίβου glob (π.χ. 'photos/*.png'),
+    ταξινομημένες κατά όνομα.
+    """
+    if os.path.isdir(source):
+        paths = [os.path.join(source, name) for name in os.listdir(source)]
+    else:
+        paths = glob.glob(source)
+
+    return sorted(
+        path for path in paths
+        if os.path.isfile(path) and path.lower().endswith(IMAGE_EXTENSIONS)
+    )
+
+def _image_pixels(image_path):
+    # Το Image.open διαβάζει μόνο την κεφαλίδα, όχι όλα τα pixels
+    with Image.open(image_path) as img:
+        width, height = img.size
+    return width * height
+
+def output_names(image_paths):
+    """
+    Όνομα του φακέλου εξόδου κάθε εικόνας: η διαδρομή της (με την επέκταση) σχετικά με τον
+    κοινό φάκελο όλων των εικόνων, ώστε τα a.png και a.jpg ή τα x/a.png και y/a.png
+    να μη γράφουν στον ίδιο φάκελο.
+    """
+    absolute = [os.path.abspath(path) for path in image_paths]
+    root = os.path.commonpath([os.path.dirname(path) for path in absolute])
+    return [os.path.relpath(path, root) for path in absolute]
+
+def compress_image(image_path, ranks=RANKS_TO_TEST, output_dir=BATCH_OUTPUT_DIR, plot=BATCH_PLOT, name=None,
+                   ssim=EVAL_SSIM):
+    """
+    Εκτελεί όλη τη διαδικασία SVD συμπίεσης για μία εικόνα και αποθηκεύει τις
+    ανακατασκευές στον φάκελο <output_dir>/<name>/ (προεπιλογή: το όνομα του αρχείου
+    με την επέκταση, βλ. output_names).
+
+    Επιστρέφει: Λίστα από λεξικά {image, M, N, k, CR, MSE, PSNR, SSIM}, ένα για κάθε k
+    (χωρίς SSIM αν ssim=False).
+    """
+    image_dir = os.path.join(output_dir, name or os.path.basename(image_path))
+    os.makedirs(image_dir, exist_ok=True)
+
+    R_channel, G_channel, B_channel, original_shape = load_and_split_image(image_path)
+    M, N, _ = original_shape
+
+    # Οι εικόνες τρέχουν ήδη παράλληλα, οπότε τα κανάλια κάθε εικόνας σειριακά
+    (U_R, S_R, V_R, _), (U_G, S_G, V_G, _), (U_B, S_B, V_B, _) = process_channels(
+        (R_channel, G_channel, B_channel), workers=1, k_max=max(ranks)
+    )
+
+    # Μια εικόνα χαμηλού βαθμού (π.χ. μονόχρωμη) έχει λιγότερες ιδιάζουσες τιμές από το
+    # max(ranks): τα k περιορίζονται σε αυτές, ώστε οι γραμμές να δείχνουν το πραγματικό k
+    available = min(len(S_R), len(S_G), len(S_B))
+    ranks = sorted(set(min(k, available) for k in ranks))
+
+    sweeps = zip(
+        reconstruct_channel_sweep(U_R, S_R, V_R, ranks),
+        reconstruct_channel_sweep(U_G, S_G, V_G, ranks),
+        reconstruct_channel_sweep(U_B, S_B, V_B, ranks),
+    )
+
+    compressed_images = []
+    for (k, R_k), (_, G_k), (_, B_k) in sweeps:
+        compressed_images.append(merge_and_save_image(R_k, G_k, B_k, k, original_shape, image_dir))
+
+    # MSE, PSNR (και SSIM) για όλα τα k μαζί (μέσος όρος των καναλιών: γραμμές "all")
+    original_img = np.dstack((R_channel, G_channel, B_channel))
+    metrics = evaluate_reconstructions(original_img, compressed_images, ranks, ssim=ssim)
+
+    rows = []
+    for row in metrics:
+        if row['channel'] != 'all':
+            continue
+        result = {
+            'image': image_path,
+            'M': M,
+            'N': N,
+            'k': row['k'],
+            'CR': calculate_compression_ratio(M, N, row['k']),
+            'MSE': row['MSE'],
+            'PSNR': row['PSNR'],
+        }
+        if ssim:
+            result['SSIM'] = row['SSIM']
+        rows.append(result)
+
+    if plot == 'file':
+        render_comparison_file(original_img, compressed_images, ranks, original_shape,
+                               os.path.join(image_dir, PLOT_FILE))
+
+    return rows
+
+def _init_batch_worker(backend, use_cache):
+    set_backend(backend)
+    main.USE_SVD_CACHE = use_cache
+
+def write_results(rows, output_dir=BATCH_OUTPUT_DIR):
+    """
+    Γράφει τα συγκεντρωτικά αποτελέσματα όλων των εικόνων σε results.csv και results.json
+    (χωρίς SSIM, η στήλη του CSV μένει κενή).
+    
+    Στο JSON οι μη πεπερασμένες τιμές (PSNR = inf για τέλεια ανακατασκευή) γράφονται ως
+    null, αφού το Infinity δεν είναι έγκυρο JSON.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    fields = ['image', 'M', 'N', 'k', 'CR', 'MSE', 'PSNR', 'SSIM']
+
+    with open(os.path.join(output_dir, 'results.csv'), 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        writer.writerows(rows)
+
+    with open(os.path.join(output_dir, 'results.json'), 'w', encoding='utf-8') as f:
+        json_rows = [
+            {field: None if isinstance(value, float) and not np.isfinite(value) else value
+             for field, value in row.items()}
+            for row in rows
+        ]
+        json.dump(json_rows, f, indent=2, ensure_ascii=False, allow_nan=False)
+
+def run_batch(source, output_dir=BATCH_OUTPUT_DIR, ranks=RANKS_TO_TEST,
+              workers=BATCH_WORKERS, max_inflight_pixels=MAX_INFLIGHT_PIXELS, plot=BATCH_PLOT,
+              ssim=EVAL_SSIM):
+    """
+    Συμπιέζει όλες τις εικόνες ενός φακέλου/glob μοιράζοντάς τες σε μια δεξαμενή
+    διεργασιών (process pool).
+
+    Νέα εικόνα ξεκινά μόνο αν το άθροισμα των pixels των εικόνων που τρέχουν
+    δεν ξεπερνά το max_inflight_pixels (μία εικόνα ξεκινά πάντα, όσο μεγάλη κι αν είναι).
+
+    Επιστρέφει: (rows, stats) με τα αποτελέσματα ανά εικόνα/k και τα στατιστικά
+    ρυθμού επεξεργασίας (images/s, MPix/s).
+    """
+    image_paths = find_images(source)
+    if not image_paths:
+        raise FileNotFoundError(f"Δεν βρέθηκαν εικόνες στο: {source}")
+
+    print(f"Μαζική συμπίεση {len(image_paths)} εικόνων με {workers} εργάτες...")
+
+    start = time.perf_counter()
+    rows = []
+    failed = []
+    total_pixels = 0
+    inflight = {} # future -> (διαδρομή, pixels)
+    inflight_pixels = 0
+
+    def collect(done):
+        nonlocal inflight_pixels, total_pixels
+        for future in done:
+            path, pixels = inflight.pop(future)
+            inflight_pixels -= pixels
+            try:
+                rows.extend(future.result())
+                total_pixels += pixels
+                print(f"  Ολοκληρώθηκε: {path}")
+            except Exception as e:
+                print(f"  ΣΦΑΛΜΑ στην εικόνα {path}: {e}")
+                failed.append(path)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker,
+                             initargs=(MATRIX_BACKEND, BATCH_SVD_CACHE)) as pool:
+        for path, name in zip(image_paths, output_names(image_paths)):
+            # Μια κατεστραμμένη εικόνα μετράει ως αποτυχία και δεν σταματά τη δέσμη
+            try:
+                pixels = _image_pixels(path)
+            except Exception as e:
+                print(f"  ΣΦΑΛΜΑ στην εικόνα {path}: {e}")
+                failed.append(path)
+                continue
+
+            # Αναμονή μέχρι να χωράει η νέα εικόνα στο όριο μνήμης
+            while inflight and inflight_pixels + pixels > max_inflight_pixels:
+                done, _ = wait(inflight, return_when=FIRST_COMPLETED)
+                collect(done)
+
+            future = pool.submit(compress_image, path, ranks, output_dir, plot, name, ssim)
+            inflight[future] = (path, pixels)
+            inflight_pixels += pixels
+
+        while inflight:
+            done, _ = wait(inflight, return_when=FIRST_COMPLETED)
+            collect(done)
+
+    elapsed = time.perf_counter() - start
+    write_results(rows, output_dir)
+
+    completed = len(image_paths) - len(failed)
+    stats = {
+        'images': completed,
+        'failed': len(failed),
+        'seconds': elapsed,
+        'images_per_s': completed / elapsed,
+        'mpix_per_s': total_pixels / 1e6 / elapsed,
+    }
+
+    print(f"\nΟλοκληρώθηκαν {completed} εικόνες ({len(failed)} αποτυχίες) σε {elapsed:.2f} s")
+    print(f"Ρυθμός: {stats['images_per_s']:.2f} εικόνες/s, {stats['mpix_per_s']:.2f} MPix/s")
+    print(f"Αποτελέσματα: {os.path.join(output_dir, 'results.csv')} και results.json")
+
+    return rows, stats
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Μαζική SVD συμπίεση εικόνων.")
+    parser.add_argument('source', help="Φάκελος ή μοτίβο glob με εικόνες.")
+    parser.add_argument('--output-dir', default=BATCH_OUTPUT_DIR)
+    parser.add_argument('--ranks', type=int, nargs='+', default=RANKS_TO_TEST)
+    parser.add_argument('--workers', type=int, default=BATCH_WORKERS)
+    parser.add_argument('--max-pixels', type=int, default=MAX_INFLIGHT_PIXELS,
+                        help="Μέγιστο άθροισμα pixels των εικόνων που επεξεργάζονται ταυτόχρονα.")
+    parser.add_argument('--plot', choices=('none', 'file'), default=BATCH_PLOT,
+                        help="Γράφημα σύγκρισης ανά εικόνα στον φάκελό της.")
+    parser.add_argument('--ssim', action='store_true', default=EVAL_SSIM,
+                        help="Υπολογισμός του SSIM (αργό).")
+    return parser.parse_args(argv)
+
+if __name__ == '__main__':
+    args = parse_args()
+    run_batch(args.source, args.output_dir, sorted(args.ranks), args.workers, args.max_pixels, args.plot, args.ssim)
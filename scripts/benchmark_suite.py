@@ -0,0 +1,218 @@
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import numpy as np
+
+# Προσθέτουμε τον φάκελο 'scripts' στο PATH για να βρει τα modules (όπως στο main.py)
+if 'scripts' not in sys.path:
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from metrics_calculation import matrix_multiply, matrix_transpose, set_backend, get_backend
+from image_split import normalize_and_prepare_w
+from svd_core import calculate_eigens, calculate_svd_matrices
+from compression import reconstruct_channel
+from evaluation import calculate_mse
+
+# --- Σουίτα μετρήσεων χρόνου για κάθε στάδιο της διαδικασίας, με έλεγχο οπισθοδρόμησης ---
+# Κάθε στάδιο μετριέται σε συνθετικά κανάλια διαφόρων μεγεθών (M x N). Τα αποτελέσματα
+# γράφονται σε JSON και συγκρίνονται με ένα αποθηκευμένο baseline: αν κάποιο στάδιο
+# γίνει πιο αργό από το (1 + REGRESSION_THRESHOLD) του baseline, η εκτέλεση αποτυγχάνει.
+SUITE_SIZES = [(256, 256), (512, 512), (900, 1600)]
+SUITE_RANK = 50
+SUITE_REPEATS = 5
+
+BASELINE_PATH = 'benchmark_baseline.json'
+RESULTS_PATH = 'benchmark_results.json'
+
+# Επιτρεπόμενη επιβράδυνση σε σχέση με το baseline (0.25 = 25%)
+REGRESSION_THRESHOLD = 0.25
+
+# Διαφορές κάτω από αυτό (σε s) θεωρούνται θόρυβος, όσο μεγάλος κι αν είναι ο λόγος
+MIN_REGRESSION_SECONDS = 1e-3
+
+STAGES = (
+    'matrix_multiply', 'matrix_transpose', 'normalize_and_prepare_w', 'calculate_eigens',
+    'calculate_svd_matrices', 'reconstruct_channel', 'calculate_mse',
+)
+
+
+def synthetic_channel(M, N, seed=0):
+    """
+    Συνθετικό κανάλι uint8 (M x N) με ομαλή δομή χαμηλού βαθμού και λίγο θόρυβο,
+    ώστε το φάσμα του να μοιάζει με φωτογραφίας.
+    """
+    rng = np.random.default_rng(seed)
+    y = np.linspace(0, 1, M)[:, None]
+    x = np.linspace(0, 1, N)[None, :]
+    base = sum(np.sin(2 * np.pi * (f * x + g * y)) for f, g in rng.uniform(0.5, 4, (4, 2)))
+    base = (base - base.min()) / (base.max() - base.min()) * 220 + rng.uniform(0, 35, (M, N))
+    return base.astype(np.uint8)
+
+def _median_time(func, *args, repeats=SUITE_REPEATS):
+    # Η διάμεσος είναι πιο σταθερή από τον μέσο όρο για σύγκριση μεταξύ εκτελέσεων
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func(*args)
+        times.append(time.perf_counter() - start)
+    return float(np.median(times))
+
+def benchmark_stages(sizes=SUITE_SIZES, k=SUITE_RANK, repeats=SUITE_REPEATS, seed=0):
+    """
+    Μετρά κάθε στάδιο (STAGES) για κάθε μέγεθος με τις εισόδους που δέχεται στην
+    πραγματική διαδικασία (π.χ. ο matrix_multiply ως A_norm @ V_k).
+
+    Επιστρέφει: Λίστα από λεξικά {stage, M, N, seconds}.
+    """
+    results = []
+    for M, N in sizes:
+        A_channel = synthetic_channel(M, N, seed)
+        rank = min(k, M, N)
+
+        # Οι είσοδοι κάθε σταδίου υπολογίζονται μία φορά, εκτός μέτρησης
+        A_norm, W = normalize_and_prepare_w(A_channel)
+        lambdas, V_full = calculate_eigens(W, rank)
+        U, S_vector, V = calculate_svd_matrices(A_norm, lambdas, V_full, rank)
+        A_k = reconstruct_channel(U, S_vector, V, rank)
+
+        stage_calls = {
+            'matrix_multiply': (matrix_multiply, A_norm, V),
+            'matrix_transpose': (matrix_transpose, A_norm),
+            'normalize_and_prepare_w': (normalize_and_prepare_w, A_channel),
+            'calculate_eigens': (calculate_eigens, W, rank),
+            'calculate_svd_matrices': (calculate_svd_matrices, A_norm, lambdas, V_full, rank),
+            'reconstruct_channel': (reconstruct_channel, U, S_vector, V, rank),
+            'calculate_mse': (calculate_mse, A_channel, A_k),
+        }
+
+        for stage in STAGES:
+            func, *args = stage_calls[stage]
+            results.append({
+                'stage': stage,
+                'M': M,
+                'N': N,
+                'seconds': _median_time(func, *args, repeats=repeats),
+            })
+
+    return results
+
+def _environment():
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+        'backend': get_backend(),
+    }
+
+def run_suite(sizes=SUITE_SIZES, k=SUITE_RANK, repeats=SUITE_REPEATS, backend=None):
+    """
+    Εκτελεί όλη τη σουίτα. Επιστρέφει λεξικό {environment, k, repeats, results}
+    έτοιμο για αποθήκευση σε JSON.
+    """
+    if backend is not None:
+        set_backend(backend)
+
+    return {
+        'environment': _environment(),
+        'k': k,
+        'repeats': repeats,
+        'results': benchmark_stages(sizes, k, repeats),
+    }
+
+def save_report(report, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+def load_report(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+def compare_to_baseline(report, baseline, threshold=REGRESSION_THRESHOLD,
+                        min_seconds=MIN_REGRESSION_SECONDS):
+    """
+    Συγκρίνει κάθε (στάδιο, M, N) με το baseline.
+
+    Επιστρέφει: Λίστα από λεξικά {stage, M, N, baseline_s, seconds, ratio, regressed}.
+    Μετρήσεις που δεν υπάρχουν στο baseline παραλείπονται.
+    """
+    reference = {(res['stage'], res['M'], res['N']): res['seconds'] for res in baseline['results']}
+
+    comparison = []
+    for res in report['results']:
+        key = (res['stage'], res['M'], res['N'])
+        if key not in reference:
+            continue
+
+        baseline_s = reference[key]
+        ratio = res['seconds'] / baseline_s if baseline_s > 0 else np.inf
+        comparison.append({
+            'stage': res['stage'],
+            'M': res['M'],
+            'N': res['N'],
+            'baseline_s': baseline_s,
+            'seconds': res['seconds'],
+            'ratio': ratio,
+            'regressed': ratio > 1.0 + threshold and res['seconds'] - baseline_s > min_seconds,
+        })
+
+    return comparison
+
+def print_suite_report(report, comparison=None):
+    print(f"\nΣουίτα μετρήσεων (backend {report['environment']['backend']}, k = {report['k']}, "
+          f"διάμεσος {report['repeats']} επαναλήψεων)")
+    print(f"{'Στάδιο':<24} | {'M x N':<10} | {'Χρόνος s':>9} | {'Baseline s':>10} | {'Λόγος':>6}")
+    print("-" * 72)
+
+    compared = {(c['stage'], c['M'], c['N']): c for c in comparison or []}
+    for res in report['results']:
+        c = compared.get((res['stage'], res['M'], res['N']))
+        baseline = f"{c['baseline_s']:>10.4f} | {c['ratio']:>6.2f}" if c else f"{'-':>10} | {'-':>6}"
+        flag = "  <-- ΟΠΙΣΘΟΔΡΟΜΗΣΗ" if c and c['regressed'] else ""
+        dims = f"{res['M']}x{res['N']}"
+        print(f"{res['stage']:<24} | {dims:<10} | {res['seconds']:>9.4f} | {baseline}{flag}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Μετρήσεις χρόνου των σταδίων της SVD συμπίεσης.")
+    parser.add_argument('--output', default=RESULTS_PATH, help="Αρχείο JSON για τα αποτελέσματα.")
+    parser.add_argument('--baseline', default=BASELINE_PATH, help="Αρχείο JSON του baseline.")
+    parser.add_argument('--save-baseline', action='store_true',
+                        help="Αποθήκευση των αποτελεσμάτων ως νέο baseline (χωρίς σύγκριση).")
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD,
+                        help="Επιτρεπόμενη επιβράδυνση ως κλάσμα (0.25 = 25%%).")
+    parser.add_argument('--repeats', type=int, default=SUITE_REPEATS)
+    parser.add_argument('--backend', default=None, help="Backend πράξεων πινάκων (π.χ. numpy, blocked).")
+    return parser.parse_args(argv)
+
+if __name__ == '__main__':
+    args = parse_args()
+    report = run_suite(repeats=args.repeats, backend=args.backend)
+    save_report(report, args.output)
+
+    if args.save_baseline:
+        save_report(report, args.baseline)
+        print_suite_report(report)
+        print(f"\nΤο baseline αποθηκεύτηκε στο: {args.baseline}")
+        sys.exit(0)
+
+    comparison = None
+    if os.path.isfile(args.baseline):
+        comparison = compare_to_baseline(report, load_report(args.baseline), args.threshold)
+    print_suite_report(report, comparison)
+    print(f"\nΑποτελέσματα: {args.output}")
+
+    if comparison is None:
+        print(f"Δεν βρέθηκε baseline ({args.baseline}). Δημιουργία με --save-baseline.")
+        sys.exit(0)
+
+    regressions = [c for c in comparison if c['regressed']]
+    if regressions:
+        print(f"\nΑΠΟΤΥΧΙΑ: {len(regressions)} στάδια πιο αργά από το baseline "
+              f"κατά περισσότερο από {args.threshold:.0%}.")
+        sys.exit(1)
+
+    print(f"Κανένα στάδιο πιο αργό από το baseline κατά περισσότερο από {args.threshold:.0%}.")
@@ -0,0 +1,709 @@
+import io
+import os
+import time
+import resource
+import tempfile
+import tracemalloc
+import multiprocessing
+import numpy as np
+from PIL import Image
+
+from metrics_calculation import (
+    _matrix_multiply_loops, _matrix_multiply_blocked, _matrix_multiply_numpy,
+    get_block_size, matrix_multiply, matrix_transpose, matrix_scalar_multiply, gram_matrix,
+)
+from image_split import load_and_split_image, normalize_and_prepare_w, IMAGE_PATH
+from svd_core import (
+    calculate_eigens, calculate_svd_matrices, randomized_svd, choose_gram_side, qr_svd,
+    factorization_report, stack_channels, split_stacked_factors, STACK_MODES,
+)
+from compression import reconstruct_channel, reconstruct_channel_sweep
+from evaluation import (calculate_mse, predicted_mse_curve, calculate_compression_ratio,
+                        calculate_effective_compression_ratio, evaluate_reconstructions)
+from svdc_format import write_svdc, decode_svdc_image, progressive_decode
+from color_transform import (COLOR_TRANSFORMS, fit_color_transform, apply_color_transform,
+                             inverse_color_transform_to_uint8, channel_rank_budget, luma)
+from benchmark_suite import synthetic_channel
+
+# Μεγέθη n για τις μετρήσεις (τετραγωνικοί n x n και "ψηλοί-στενοί" n x n @ n x SKINNY_COLS)
+BENCHMARK_SIZES = [256, 512, 1024, 2048]
+SKINNY_COLS = 32
+
+# Βαθμοί k για τη σύγκριση τυχαιοποιημένης και ακριβούς SVD
+SVD_BENCHMARK_RANKS = [5, 20, 50, 100]
+
+# Πόσες γραμμές του A τρέχουν στον αργό πυρήνα με βρόχους.
+# Το κόστος του είναι γραμμικό ως προς τις γραμμές, οπότε ο συνολικός χρόνος εκτιμάται με αναγωγή.
+NAIVE_SAMPLE_ROWS = 2
+
+# Διαστάσεις (πλάτος x ύψος) της συνθετικής εικόνας 4K για τη μέτρηση μνήμης
+MEMORY_BENCHMARK_SIZE = (3840, 2160)
+
+# Ψηλές και φαρδιές εικόνες (M x N) για τη σύγκριση των πλευρών του πίνακα Gram
+GRAM_SIDE_SHAPES = [(2000, 500), (500, 2000), (1600, 900), (900, 1600)]
+
+
+def _best_time(func, *args, repeats=3):
+    # Ο ελάχιστος χρόνος από μερικές επαναλήψεις (λιγότερος θόρυβος)
+    best = np.inf
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def _estimate_naive_time(A, B, sample_rows=NAIVE_SAMPLE_ROWS):
+    # Εκτίμηση χρόνου του πυρήνα με βρόχους από λίγες γραμμές του A
+    rows = min(sample_rows, A.shape[0])
+    elapsed = _best_time(_matrix_multiply_loops, A[:rows], B, repeats=1)
+    return elapsed * A.shape[0] / rows
+
+
+def benchmark_blocked_multiply(sizes=BENCHMARK_SIZES, skinny_cols=SKINNY_COLS, seed=0):
+    """
+    Συγκρίνει τον πολλαπλασιασμό σε πλακίδια ("blocked") με τον αρχικό πυρήνα
+    με βρόχους ("loops") και με το BLAS ("numpy"), για τετραγωνικούς και
+    ψηλούς-στενούς πίνακες.
+
+    Ο χρόνος του "loops" εκτιμάται από NAIVE_SAMPLE_ROWS γραμμές (αλλιώς το
+    2048 x 2048 θα χρειαζόταν ώρες).
+
+    Επιστρέφει: Λίστα από λεξικά με τους χρόνους και την επιτάχυνση ανά περίπτωση.
+    """
+    rng = np.random.default_rng(seed)
+    block_size = get_block_size()
+    results = []
+
+    for n in sizes:
+        for shape_name, (M, K, N) in (('square', (n, n, n)), ('tall-skinny', (n, n, skinny_cols))):
+            A = rng.random((M, K))
+            B = rng.random((K, N))
+
+            t_naive = _estimate_naive_time(A, B)
+            t_blocked = _best_time(_matrix_multiply_blocked, A, B)
+            t_numpy = _best_time(_matrix_multiply_numpy, A, B)
+
+            results.append({
+                'shape': shape_name,
+                'M': M, 'K': K, 'N': N,
+                'block_size': block_size,
+                'loops_s': t_naive,
+                'blocked_s': t_blocked,
+                'numpy_s': t_numpy,
+                'speedup_vs_loops': t_naive / t_blocked,
+            })
+
+    return results
+
+def print_blocked_multiply_report(results):
+    print(f"\nΠολλαπλασιασμός σε πλακίδια (block = {results[0]['block_size']}) έναντι βρόχων")
+    print(f"{'Σχήμα':<12} | {'M x K x N':<18} | {'loops (εκτ.) s':>14} | {'blocked s':>10} | {'numpy s':>9} | {'Επιτάχυνση':>10}")
+    print("-" * 88)
+    for res in results:
+        dims = f"{res['M']}x{res['K']}x{res['N']}"
+        print(f"{res['shape']:<12} | {dims:<18} | {res['loops_s']:>14.2f} | "
+              f"{res['blocked_s']:>10.4f} | {res['numpy_s']:>9.4f} | {res['speedup_vs_loops']:>9.0f}x")
+
+
+def benchmark_randomized_svd(image_path=IMAGE_PATH, ranks=SVD_BENCHMARK_RANKS,
+                             oversampling=10, power_iterations=2, seed=0):
+    """
+    Συγκρίνει την τυχαιοποιημένη SVD με την ακριβή διαδρομή (W = A^T A και πλήρης eigh)
+    σε χρόνο και MSE, για κάθε k και για τα τρία κανάλια της εικόνας.
+
+    Επιστρέφει: Λίστα από λεξικά {k, exact_s, randomized_s, exact_mse, randomized_mse}.
+    """
+    channels = load_and_split_image(image_path)[:3]
+
+    # Ακριβής διαδρομή: υπολογίζεται μία φορά και εξυπηρετεί όλα τα k
+    start = time.perf_counter()
+    exact_factors = []
+    for A_channel in channels:
+        A_norm, W = normalize_and_prepare_w(A_channel)
+        lambdas, V_full = calculate_eigens(W)
+        exact_factors.append(calculate_svd_matrices(A_norm, lambdas, V_full))
+    exact_time = time.perf_counter() - start
+
+    results = []
+    for k in ranks:
+        start = time.perf_counter()
+        randomized_factors = [
+            randomized_svd(A_channel / 255.0, k, oversampling, power_iterations, seed)
+            for A_channel in channels
+        ]
+        randomized_time = time.perf_counter() - start
+
+        exact_mse = np.mean([
+            calculate_mse(A_channel, reconstruct_channel(U, S, V, k))
+            for A_channel, (U, S, V) in zip(channels, exact_factors)
+        ])
+        randomized_mse = np.mean([
+            calculate_mse(A_channel, reconstruct_channel(U, S, V, k))
+            for A_channel, (U, S, V) in zip(channels, randomized_factors)
+        ])
+
+        results.append({
+            'k': k,
+            'exact_s': exact_time,
+            'randomized_s': randomized_time,
+            'exact_mse': exact_mse,
+            'randomized_mse': randomized_mse,
+        })
+
+    return results
+
+def print_randomized_svd_report(results):
+    print("\nΤυχαιοποιημένη SVD έναντι ακριβούς (W = A^T A, eigh) - 3 κανάλια")
+    print(f"{'k':<5} | {'Ακριβής s':>10} | {'Τυχαιοπ. s':>10} | {'MSE ακριβής':>12} | {'MSE τυχαιοπ.':>12}")
+    print("-" * 62)
+    for res in results:
+        print(f"{res['k']:<5} | {res['exact_s']:>10.3f} | {res['randomized_s']:>10.3f} | "
+              f"{res['exact_mse']:>12.2f} | {res['randomized_mse']:>12.2f}")
+
+
+def benchmark_predicted_mse_drift(image_path=IMAGE_PATH, ranks=SVD_BENCHMARK_RANKS):
+    """
+    Συγκρίνει το MSE που προβλέπει η predicted_mse_curve (μόνο από τις σ_i) με το
+    μετρούμενο MSE της κβαντισμένης (uint8) και περικομμένης ανακατασκευής.
+
+    Επιστρέφει: Λίστα από λεξικά {channel, k, predicted_mse, measured_mse, drift}.
+    """
+    channels = load_and_split_image(image_path)[:3]
+    k_max = max(ranks)
+    results = []
+
+    for channel_name, A_channel in zip(('R', 'G', 'B'), channels):
+        A_norm, W = normalize_and_prepare_w(A_channel)
+        lambdas, V_full = calculate_eigens(W, k_max)
+        U, S_vector, V = calculate_svd_matrices(A_norm, lambdas, V_full, k_max)
+
+        # Η συνολική ενέργεια ||A||_F^2 = trace(W) συμπληρώνει το περικομμένο φάσμα
+        curve = predicted_mse_curve(S_vector, A_norm.shape, total_energy=np.trace(W))
+
+        for k in ranks:
+            measured = calculate_mse(A_channel, reconstruct_channel(U, S_vector, V, k))
+            results.append({
+                'channel': channel_name,
+                'k': k,
+                'predicted_mse': curve[k],
+                'measured_mse': measured,
+                'drift': measured - curve[k],
+            })
+
+    return results
+
+def print_predicted_mse_drift_report(results):
+    print("\nΠροβλεπόμενο MSE (από σ_i) έναντι μετρούμενου (uint8, clip)")
+    print(f"{'Κανάλι':<7} | {'k':<5} | {'Πρόβλεψη':>10} | {'Μέτρηση':>10} | {'Απόκλιση':>9} | {'%':>6}")
+    print("-" * 62)
+    for res in results:
+        relative = 100.0 * res['drift'] / res['measured_mse']
+        print(f"{res['channel']:<7} | {res['k']:<5} | {res['predicted_mse']:>10.2f} | "
+              f"{res['measured_mse']:>10.2f} | {res['drift']:>9.2f} | {relative:>5.1f}%")
+
+
+def benchmark_svdc_sizes(image_path=IMAGE_PATH, ranks=SVD_BENCHMARK_RANKS,
+                         dtypes=('float16', 'int8'), codecs=('none', 'zlib', 'lzma')):
+    """
+    Συγκρίνει τα πραγματικά bytes των αρχείων .svdc (και του PNG της ανακατασκευής)
+    με τον θεωρητικό λόγο συμπίεσης της calculate_compression_ratio.
+
+    Ο λόγος στον δίσκο είναι bytes αρχικής εικόνας (M*N*3, uint8) / bytes αρχείου.
+
+    Επιστρέφει: Λίστα από λεξικά ανά (k, dtype, codec).
+    """
+    channels = load_and_split_image(image_path)[:3]
+    M, N = channels[0].shape
+    raw_bytes = M * N * 3
+    original = np.dstack(channels).astype(np.uint8)
+    k_max = max(ranks)
+
+    factors = []
+    for A_channel in channels:
+        A_norm, W = normalize_and_prepare_w(A_channel)
+        lambdas, V_full = calculate_eigens(W, k_max)
+        factors.append(calculate_svd_matrices(A_norm, lambdas, V_full, k_max))
+
+    results = []
+    for k in ranks:
+        # Μέγεθος του PNG της ανακατασκευής (όπως το γράφει η merge_and_save_image)
+        reconstructed = np.dstack([reconstruct_channel(U, S, V, k) for U, S, V in factors])
+        png_buffer = io.BytesIO()
+        Image.fromarray(reconstructed, 'RGB').save(png_buffer, format='PNG')
+
+        for dtype in dtypes:
+            for codec in codecs:
+                buffer = io.BytesIO()
+                svdc_bytes = write_svdc(buffer, factors, k, dtype, codec)
+                decoded = decode_svdc_image(buffer.getvalue())
+
+                results.append({
+                    'k': k,
+                    'dtype': dtype,
+                    'codec': codec,
+                    'svdc_bytes': svdc_bytes,
+                    'png_bytes': png_buffer.tell(),
+                    'theoretical_cr': calculate_compression_ratio(M, N, k),
+                    'disk_cr': raw_bytes / svdc_bytes,
+                    'png_cr': raw_bytes / png_buffer.tell(),
+                    'mse': calculate_mse(original, decoded),
+                })
+
+    return results
+
+def print_svdc_sizes_report(results):
+    print("\nΑρχεία .svdc: πραγματικά bytes έναντι θεωρητικού CR")
+    print(f"{'k':<5} | {'dtype':<7} | {'codec':<5} | {'bytes .svdc':>11} | {'bytes PNG':>10} | "
+          f"{'CR θεωρ.':>8} | {'CR δίσκου':>9} | {'CR PNG':>6} | {'MSE':>7}")
+    print("-" * 96)
+    for res in results:
+        print(f"{res['k']:<5} | {res['dtype']:<7} | {res['codec']:<5} | {res['svdc_bytes']:>11} | "
+              f"{res['png_bytes']:>10} | {res['theoretical_cr']:>8.2f} | {res['disk_cr']:>9.2f} | "
+              f"{res['png_cr']:>6.2f} | {res['mse']:>7.2f}")
+
+
+def benchmark_progressive_decode(image_path=IMAGE_PATH, k=100, checkpoints=(5, 20, 50, 100),
+                                 dtype='int8', codec='zlib', link_bytes_per_s=1_000_000):
+    """
+    Μετρά την καθυστέρηση μέχρι την πρώτη εικόνα (latency-to-first-frame) της
+    progressive_decode σε σύγκριση με την πλήρη αποκωδικοποίηση (decode_svdc_image).
+
+    Για κάθε checkpoint καταγράφεται ο χρόνος από την αρχή, τα bytes του stream που
+    έχουν καταναλωθεί και μια εκτίμηση της καθυστέρησης σε σύνδεση link_bytes_per_s
+    (χρόνος μεταφοράς των bytes + χρόνος αποκωδικοποίησης).
+
+    Επιστρέφει: Λίστα από λεξικά ανά checkpoint (και μία γραμμή 'full' για την πλήρη).
+    """
+    channels = load_and_split_image(image_path)[:3]
+    factors = []
+    for A_channel in channels:
+        A_norm, W = normalize_and_prepare_w(A_channel)
+        lambdas, V_full = calculate_eigens(W, k)
+        factors.append(calculate_svd_matrices(A_norm, lambdas, V_full, k))
+
+    buffer = io.BytesIO()
+    total_bytes = write_svdc(buffer, factors, k, dtype, codec)
+    stream = io.BytesIO(buffer.getvalue())
+
+    results = []
+    start = time.perf_counter()
+    for frame_k, _ in progressive_decode(stream, checkpoints):
+        elapsed = time.perf_counter() - start
+        consumed = stream.tell()
+        results.append({
+            'k': frame_k,
+            'seconds': elapsed,
+            'bytes': consumed,
+            'link_latency_s': consumed / link_bytes_per_s + elapsed,
+        })
+
+    start = time.perf_counter()
+    decode_svdc_image(buffer.getvalue())
+    elapsed = time.perf_counter() - start
+    results.append({
+        'k': 'full',
+        'seconds': elapsed,
+        'bytes': total_bytes,
+        'link_latency_s': total_bytes / link_bytes_per_s + elapsed,
+    })
+
+    return results
+
+def print_progressive_decode_report(results, link_bytes_per_s=1_000_000):
+    print(f"\nΠροοδευτική αποκωδικοποίηση .svdc (σύνδεση {link_bytes_per_s / 1e6:.1f} MB/s)")
+    print(f"{'k':<5} | {'Χρόνος s':>9} | {'Bytes':>9} | {'Καθυστέρηση με σύνδεση s':>25}")
+    print("-" * 58)
+    for res in results:
+        print(f"{res['k']!s:<5} | {res['seconds']:>9.3f} | {res['bytes']:>9} | {res['link_latency_s']:>25.3f}")
+
+
+def _make_synthetic_image(path, size=MEMORY_BENCHMARK_SIZE, seed=0):
+    # Ομαλή συνθετική εικόνα (άθροισμα λίγων ημιτόνων + θόρυβος), ώστε η SVD να
+    # συμπεριφέρεται όπως σε φωτογραφία και όχι σε λευκό θόρυβο
+    width, height = size
+    rng = np.random.default_rng(seed)
+    y = np.linspace(0, 1, height)[:, None]
+    x = np.linspace(0, 1, width)[None, :]
+    channels = []
+    for c in range(3):
+        base = sum(np.sin(2 * np.pi * (f * x + g * y + c / 3)) for f, g in rng.uniform(0.5, 4, (4, 2)))
+        channels.append(base)
+    image = np.dstack(channels)
+    image = (image - image.min()) / (image.max() - image.min()) * 220 + rng.uniform(0, 35, image.shape)
+    Image.fromarray(image.astype(np.uint8), 'RGB').save(path)
+
+def _peak_rss_worker(image_path, mode, k):
+    # Εκτελείται σε νέα διεργασία, ώστε το ru_maxrss να αφορά μόνο αυτή τη μέτρηση
+    if mode == 'legacy':
+        # Η παλιά διαδρομή: ολόκληρη η εικόνα σε float64 και strided views ανά κανάλι
+        with Image.open(image_path) as img:
+            img_np = np.array(img.convert('RGB'), dtype=np.float64)
+        channels = [img_np[:, :, c] for c in range(3)]
+        dtype = np.float64
+    else:
+        channels = load_and_split_image(image_path)[:3]
+        dtype = np.float32 if mode == 'float32' else np.float64
+
+    for A_channel in channels:
+        A_norm, W = normalize_and_prepare_w(A_channel, dtype=dtype)
+        lambdas, V_full = calculate_eigens(W, k)
+        U, S_vector, V = calculate_svd_matrices(A_norm, lambdas, V_full, k)
+        del A_norm, W
+        for _ in reconstruct_channel_sweep(U, S_vector, V, [k]):
+            pass
+
+    return _peak_rss_mb()
+
+def _peak_rss_mb():
+    # Στο Linux το VmHWM αφορά μόνο την τρέχουσα εικόνα της διεργασίας, ενώ το
+    # ru_maxrss κληρονομείται από τη γονική διεργασία μέσω fork/exec
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024.0
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+def benchmark_peak_memory(size=MEMORY_BENCHMARK_SIZE, k=50, modes=('legacy', 'float64', 'float32')):
+    """
+    Μέγιστη μνήμη (peak RSS, MB) της διαδικασίας φόρτωση -> SVD -> ανακατασκευή για
+    μια συνθετική εικόνα 4K, για την παλιά φόρτωση σε float64 ("legacy") και για τη
+    φόρτωση σε uint8 με υπολογισμούς σε float64 ή float32.
+
+    Κάθε μέτρηση τρέχει σε ξεχωριστή διεργασία (spawn).
+
+    Επιστρέφει: Λίστα από λεξικά {mode, seconds, peak_rss_mb}.
+    """
+    context = multiprocessing.get_context('spawn')
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        image_path = os.path.join(tmp_dir, 'synthetic_4k.png')
+        _make_synthetic_image(image_path, size)
+
+        for mode in modes:
+            with context.Pool(1) as pool:
+                start = time.perf_counter()
+                peak = pool.apply(_peak_rss_worker, (image_path, mode, k))
+                elapsed = time.perf_counter() - start
+            results.append({'mode': mode, 'seconds': elapsed, 'peak_rss_mb': peak})
+
+    return results
+
+def print_peak_memory_report(results, size=MEMORY_BENCHMARK_SIZE):
+    print(f"\nΜέγιστη μνήμη (peak RSS) για εικόνα {size[0]}x{size[1]}")
+    print(f"{'Τρόπος':<8} | {'Χρόνος s':>9} | {'Peak RSS MB':>12}")
+    print("-" * 36)
+    for res in results:
+        print(f"{res['mode']:<8} | {res['seconds']:>9.2f} | {res['peak_rss_mb']:>12.1f}")
+
+
+def _reconstruct_channel_unfused(U, S_vector, V, k):
+    # Η αρχική ανακατασκευή: diag(S_k), δύο γινόμενα, κλιμάκωση, περικοπή, μετατροπή
+    A_k = matrix_multiply(matrix_multiply(U[:, :k], np.diag(S_vector[:k])), matrix_transpose(V[:, :k]))
+    return np.clip(matrix_scalar_multiply(A_k, 255.0), 0, 255).astype(np.uint8)
+
+def _time_and_peak(func, *args, repeats=3):
+    # Καλύτερος χρόνος και μέγιστη μνήμη που δεσμεύτηκε (tracemalloc, περιλαμβάνει τα NumPy buffers)
+    best = _best_time(func, *args, repeats=repeats)
+    tracemalloc.start()
+    func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+def benchmark_fused_reconstruct(image_path=IMAGE_PATH, ranks=SVD_BENCHMARK_RANKS):
+    """
+    Συγκρίνει την αρχική ανακατασκευή (τέσσερις ενδιάμεσοι πίνακες M x N) με τη
+    συγχωνευμένη reconstruct_channel (λωρίδες γραμμών, έξοδος κατευθείαν σε uint8),
+    σε χρόνο, μέγιστη δεσμευμένη μνήμη και διαφορά αποτελέσματος.
+
+    Επιστρέφει: Λίστα από λεξικά ανά k.
+    """
+    A_channel = load_and_split_image(image_path)[0]
+    A_norm, W = normalize_and_prepare_w(A_channel)
+    lambdas, V_full = calculate_eigens(W, max(ranks))
+    U, S_vector, V = calculate_svd_matrices(A_norm, lambdas, V_full, max(ranks))
+
+    results = []
+    for k in ranks:
+        unfused_s, unfused_peak = _time_and_peak(_reconstruct_channel_unfused, U, S_vector, V, k)
+        fused_s, fused_peak = _time_and_peak(reconstruct_channel, U, S_vector, V, k)
+
+        diff = np.abs(_reconstruct_channel_unfused(U, S_vector, V, k).astype(np.int16)
+                      - reconstruct_channel(U, S_vector, V, k))
+        results.append({
+            'k': k,
+            'unfused_s': unfused_s,
+            'fused_s': fused_s,
+            'unfused_peak_mb': unfused_peak / 1024 ** 2,
+            'fused_peak_mb': fused_peak / 1024 ** 2,
+            'max_abs_diff': int(diff.max()),
+        })
+
+    return results
+
+def print_fused_reconstruct_report(results):
+    print("\nΑνακατασκευή: αρχική vs συγχωνευμένη (ένα κανάλι)")
+    print(f"{'k':<5} | {'Αρχική s':>9} | {'Fused s':>8} | {'Αρχική MB':>10} | {'Fused MB':>9} | {'Max |Δ|':>7}")
+    print("-" * 62)
+    for res in results:
+        print(f"{res['k']:<5} | {res['unfused_s']:>9.4f} | {res['fused_s']:>8.4f} | "
+              f"{res['unfused_peak_mb']:>10.1f} | {res['fused_peak_mb']:>9.1f} | {res['max_abs_diff']:>7}")
+
+
+def benchmark_gram_side(shapes=GRAM_SIDE_SHAPES, k=None, seed=0):
+    """
+    Χρόνος σχηματισμού του πίνακα Gram και ιδιοανάλυσης για W = A^T A ("right") και
+    W = A A^T ("left") σε ψηλές και φαρδιές εικόνες, καθώς και η πλευρά που επιλέγει
+    η choose_gram_side. k: Όπως το k_max (None για πλήρη ιδιοανάλυση).
+
+    Επιστρέφει: Λίστα από λεξικά {M, N, side, auto, n, gram_s, eigen_s, u_s, max_sigma_diff}.
+    """
+    results = []
+    for M, N in shapes:
+        A_channel = synthetic_channel(M, N, seed)
+        auto = choose_gram_side((M, N))
+
+        sigmas = {}
+        for side in ('right', 'left'):
+            start = time.perf_counter()
+            A_norm, W = normalize_and_prepare_w(A_channel, side=side)
+            gram_s = time.perf_counter() - start
+
+            start = time.perf_counter()
+            lambdas, eigvecs = calculate_eigens(W, k)
+            eigen_s = time.perf_counter() - start
+
+            start = time.perf_counter()
+            _, S_vector, _ = calculate_svd_matrices(A_norm, lambdas, eigvecs, k, side=side)
+            u_s = time.perf_counter() - start
+
+            sigmas[side] = S_vector
+            results.append({
+                'M': M, 'N': N, 'side': side, 'auto': side == auto, 'n': W.shape[0],
+                'gram_s': gram_s, 'eigen_s': eigen_s, 'u_s': u_s,
+            })
+
+        # Οι δύο πλευρές πρέπει να δίνουν τις ίδιες ιδιάζουσες τιμές
+        rank = min(len(sigmas['right']), len(sigmas['left']), 50)
+        diff = np.max(np.abs(sigmas['right'][:rank] - sigmas['left'][:rank]))
+        for res in results[-2:]:
+            res['max_sigma_diff'] = diff
+
+    return results
+
+def print_gram_side_report(results):
+    print("\nΠλευρά του πίνακα Gram: A^T A (right) vs A A^T (left)")
+    print(f"{'M x N':<11} | {'Πλευρά':<6} | {'W n x n':>9} | {'Gram s':>7} | {'Eigen s':>8} | "
+          f"{'U/V s':>6} | {'max|Δσ|':>8}")
+    print("-" * 74)
+    for res in results:
+        dims = f"{res['M']}x{res['N']}"
+        side = res['side'] + ('*' if res['auto'] else '')
+        print(f"{dims:<11} | {side:<6} | {res['n']:>9} | {res['gram_s']:>7.3f} | {res['eigen_s']:>8.3f} | "
+              f"{res['u_s']:>6.3f} | {res['max_sigma_diff']:>8.1e}")
+    print("(* η πλευρά που επιλέγει η choose_gram_side)")
+
+
+def _gram_svd(A_norm, k_max=None):
+    # Η διαδρομή eigh του main (μικρότερος πίνακας Gram) για ήδη ομαλοποιημένο A
+    side = choose_gram_side(A_norm.shape)
+    W = gram_matrix(A_norm if side == 'right' else A_norm.T)
+    lambdas, eigvecs = calculate_eigens(W, k_max)
+    return calculate_svd_matrices(A_norm, lambdas, eigvecs, k_max, side=side)
+
+def benchmark_svd_engines(image_path=IMAGE_PATH, ranks=SVD_BENCHMARK_RANKS,
+                          dtypes=(np.float64, np.float32)):
+    """
+    Συγκρίνει την SVD μέσω πίνακα Gram ("eigh") με την QR-then-SVD ("qr") σε float64 και
+    float32, σε ένα κανάλι της εικόνας με πλήρη βαθμό (εκεί φαίνεται η ουρά των μικρών σ_i):
+    χρόνος, πλήθος σ_i που κρατήθηκαν, ορθογωνιότητα, σφάλμα των σ_i ως προς την
+    QR σε float64 και MSE για κάθε k των ranks.
+
+    Επιστρέφει: Λίστα από λεξικά ανά (engine, dtype).
+    """
+    A_channel = load_and_split_image(image_path)[0]
+    engines = {'eigh': _gram_svd, 'qr': qr_svd}
+
+    reference = None
+    results = []
+    for dtype in dtypes:
+        A_norm = A_channel.astype(dtype) / dtype(255.0)
+        for engine, svd in engines.items():
+            start = time.perf_counter()
+            U, S_vector, V = svd(A_norm)
+            elapsed = time.perf_counter() - start
+
+            if reference is None:
+                # Η πρώτη μέτρηση σε float64 ως αναφορά για τις σ_i
+                reference = qr_svd(A_channel / 255.0)[1]
+
+            report = factorization_report(A_channel / 255.0, U, S_vector, V, reference)
+            mse = {k: calculate_mse(A_channel, reconstruct_channel(U, S_vector, V, k)) for k in ranks}
+            results.append({'engine': engine, 'dtype': np.dtype(dtype).name, 'seconds': elapsed,
+                            'mse': mse, **report})
+
+    return results
+
+def print_svd_engines_report(results):
+    print("\nSVD μέσω πίνακα Gram (eigh) vs QR-then-SVD (qr), πλήρης βαθμός, ένα κανάλι")
+    print(f"{'Μηχανή':<6} | {'Τύπος':<7} | {'Χρόνος s':>8} | {'k':>4} | {'|UᵀU-I|':>8} | {'|VᵀV-I|':>8} | "
+          f"{'Υπόλοιπο':>8} | {'Δσ/σ1':>8} | MSE ανά k")
+    print("-" * 112)
+    for res in results:
+        mse = ", ".join(f"{k}: {value:.2f}" for k, value in res['mse'].items())
+        print(f"{res['engine']:<6} | {res['dtype']:<7} | {res['seconds']:>8.3f} | {res['k']:>4} | "
+              f"{res['orthogonality_U']:>8.1e} | {res['orthogonality_V']:>8.1e} | "
+              f"{res['residual']:>8.1e} | {res['sigma_error']:>8.1e} | {mse}")
+
+def benchmark_color_transforms(image_path=IMAGE_PATH, ranks=SVD_BENCHMARK_RANKS, transforms=COLOR_TRANSFORMS):
+    """
+    Συγκρίνει την SVD στα R, G, B με την SVD στα Y/Cb/Cr και KLT (με μικρότερο βαθμό στα
+    κανάλια χρώματος, βλ. channel_rank_budget): χρόνος SVD, πραγματικός CR, MSE στα R, G, B
+    και MSE της φωτεινότητας Y (που είναι πιο κοντά σε αυτό που βλέπει το μάτι).
+
+    Επιστρέφει: Λίστα από λεξικά {transform, k, budget, cr, mse_rgb, mse_luma, svd_s}.
+    """
+    R, G, B, shape = load_and_split_image(image_path)
+    M, N = shape[:2]
+    original = (R, G, B)
+    original_luma = luma(original)
+    ranks = sorted(ranks)
+
+    results = []
+    for transform in transforms:
+        T = fit_color_transform(original, transform)
+        coded = apply_color_transform(original, T)
+        budgets = [channel_rank_budget(k, transform) for k in ranks]
+
+        start = time.perf_counter()
+        factors = [_gram_svd(channel / 255.0, max(b[c] for b in budgets)) for c, channel in enumerate(coded)]
+        svd_s = time.perf_counter() - start
+
+        sweeps = zip(*(reconstruct_channel_sweep(U, S_vector, V, [b[c] for b in budgets], as_uint8=False)
+                       for c, (U, S_vector, V) in enumerate(factors)))
+        for k, budget, outputs in zip(ranks, budgets, sweeps):
+            decoded = inverse_color_transform_to_uint8([A_k for _, A_k in outputs], T)
+            results.append({
+                'transform': transform,
+                'k': k,
+                'budget': budget,
+                'cr': calculate_effective_compression_ratio(M, N, budget),
+                'mse_rgb': sum(calculate_mse(a, d) for a, d in zip(original, decoded)) / 3.0,
+                'mse_luma': float(np.mean((original_luma - luma(decoded)) ** 2)),
+                'svd_s': svd_s,
+            })
+
+    return results
+
+def print_color_transforms_report(results):
+    print("\nSVD ανά κανάλι σε RGB vs YCbCr / KLT με μικρότερο βαθμό στο χρώμα")
+    print(f"{'Χώρος':<6} | {'k ανά κανάλι':<12} | {'CR':>7} | {'MSE RGB':>8} | {'MSE Y':>8} | {'SVD s':>6}")
+    print("-" * 62)
+    for res in results:
+        budget = "/".join(map(str, res['budget']))
+        print(f"{res['transform']:<6} | {budget:<12} | {res['cr']:>7.2f} | {res['mse_rgb']:>8.2f} | "
+              f"{res['mse_luma']:>8.2f} | {res['svd_s']:>6.3f}")
+
+def benchmark_stacked_svd(image_path=IMAGE_PATH, ranks=SVD_BENCHMARK_RANKS, modes=STACK_MODES):
+    """
+    Συγκρίνει την SVD ανά κανάλι ("none") με την κοινή SVD των στοιβαγμένων καναλιών
+    ("horizontal": M x 3N, κοινός U, "vertical": 3M x N, κοινός V): χρόνος SVD
+    (και οι τρεις SVD στο "none"), αποθηκευμένα στοιχεία, CR και MSE για κάθε k.
+
+    Επιστρέφει: Λίστα από λεξικά {stack, k, svd_s, stored, cr, mse}.
+    """
+    R, G, B, shape = load_and_split_image(image_path)
+    M, N = shape[:2]
+    channels = (R, G, B)
+    k_max = max(ranks)
+
+    results = []
+    for stack in modes:
+        start = time.perf_counter()
+        if stack == 'none':
+            factors = [_gram_svd(channel / 255.0, k_max) for channel in channels]
+        else:
+            factors = split_stacked_factors(*_gram_svd(stack_channels(channels, stack) / 255.0, k_max),
+                                            stack, len(channels))
+        svd_s = time.perf_counter() - start
+
+        for k in ranks:
+            cr = calculate_compression_ratio(M, N, k, channels=len(channels), stack=stack)
+            mse = sum(calculate_mse(channel, reconstruct_channel(U, S_vector, V, k))
+                      for channel, (U, S_vector, V) in zip(channels, factors)) / len(channels)
+            results.append({'stack': stack, 'k': k, 'svd_s': svd_s,
+                            'stored': int(round(len(channels) * M * N / cr)), 'cr': cr, 'mse': mse})
+
+    return results
+
+def print_stacked_svd_report(results):
+    print("\nSVD ανά κανάλι (none) vs κοινή SVD στοιβαγμένων καναλιών")
+    print(f"{'Στοίβαξη':<10} | {'k':>4} | {'SVD s':>6} | {'Στοιχεία':>9} | {'CR':>7} | {'MSE':>8}")
+    print("-" * 60)
+    for res in results:
+        print(f"{res['stack']:<10} | {res['k']:>4} | {res['svd_s']:>6.3f} | {res['stored']:>9} | "
+              f"{res['cr']:>7.2f} | {res['mse']:>8.2f}")
+
+def _per_channel_mse(original, reconstructions):
+    # Η αρχική αξιολόγηση του main: μία calculate_mse ανά κανάλι και k
+    return [sum(calculate_mse(original[:, :, c], rec[:, :, c]) for c in range(original.shape[2]))
+            / original.shape[2] for rec in reconstructions]
+
+def benchmark_batch_evaluation(image_path=IMAGE_PATH, ranks=SVD_BENCHMARK_RANKS, chunk_rows=(32, 128)):
+    """
+    Συγκρίνει την αξιολόγηση με calculate_mse ανά κανάλι και k με την evaluate_reconstructions
+    (όλα τα k και τα κανάλια μαζί ανά λωρίδα), μόνο MSE και MSE + PSNR + SSIM, σε χρόνο,
+    μέγιστη δεσμευμένη μνήμη και μέγιστη διαφορά του MSE.
+
+    Επιστρέφει: Λίστα από λεξικά {method, chunk_rows, seconds, peak_mb, max_mse_diff}.
+    """
+    channels = load_and_split_image(image_path)[:3]
+    original = np.dstack(channels)
+    factors = [_gram_svd(channel / 255.0, max(ranks)) for channel in channels]
+    reconstructions = [np.dstack([reconstruct_channel(U, S_vector, V, k) for U, S_vector, V in factors])
+                       for k in ranks]
+
+    reference = _per_channel_mse(original, reconstructions)
+    seconds, peak = _time_and_peak(_per_channel_mse, original, reconstructions)
+    results = [{'method': 'calculate_mse', 'chunk_rows': None, 'seconds': seconds,
+                'peak_mb': peak / 1024 ** 2, 'max_mse_diff': 0.0}]
+
+    for ssim in (False, True):
+        for rows in chunk_rows:
+            evaluate = lambda: evaluate_reconstructions(original, reconstructions, ranks, ssim=ssim,
+                                                        chunk_rows=rows)
+            seconds, peak = _time_and_peak(evaluate)
+            mse = [row['MSE'] for row in evaluate() if row['channel'] == 'all']
+            results.append({'method': 'batch + SSIM' if ssim else 'batch', 'chunk_rows': rows,
+                            'seconds': seconds, 'peak_mb': peak / 1024 ** 2,
+                            'max_mse_diff': float(np.max(np.abs(np.subtract(mse, reference))))})
+
+    return results
+
+def print_batch_evaluation_report(results):
+    print("\nΑξιολόγηση όλων των k: calculate_mse ανά κανάλι vs evaluate_reconstructions")
+    print(f"{'Μέθοδος':<14} | {'Γραμμές':>7} | {'Χρόνος s':>8} | {'Peak MB':>8} | {'Διαφορά MSE':>11}")
+    print("-" * 60)
+    for res in results:
+        rows = res['chunk_rows'] if res['chunk_rows'] is not None else '-'
+        print(f"{res['method']:<14} | {rows:>7} | {res['seconds']:>8.3f} | {res['peak_mb']:>8.1f} | "
+              f"{res['max_mse_diff']:>11.1e}")
+
+
+# --- ΔΟΚΙΜΑΣΤΙΚΟ ΜΕΡΟΣ ---
+if __name__ == '__main__':
+    print_blocked_multiply_report(benchmark_blocked_multiply())
+    print_randomized_svd_report(benchmark_randomized_svd())
+    print_predicted_mse_drift_report(benchmark_predicted_mse_drift())
+    print_svdc_sizes_report(benchmark_svdc_sizes())
+    print_progressive_decode_report(benchmark_progressive_decode())
+    print_peak_memory_report(benchmark_peak_memory())
+    print_fused_reconstruct_report(benchmark_fused_reconstruct())
+    print_gram_side_report(benchmark_gram_side())
+    print_svd_engines_report(benchmark_svd_engines())
+    print_color_transforms_report(benchmark_color_transforms())
+    print_stacked_svd_report(benchmark_stacked_svd())
+    print_batch_evaluation_report(benchmark_batch_evaluation())
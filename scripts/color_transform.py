@@ -0,0 +1,122 @@
+import numpy as np
+
+# --- Μετασχηματισμός χρώματος πριν από την SVD ---
+# Τα R, G, B είναι έντονα συσχετισμένα: ένας μετασχηματισμός 3x3 συγκεντρώνει σχεδόν όλη
+# την πληροφορία στο πρώτο κανάλι (φωτεινότητα), ενώ τα άλλα δύο (χρώμα) χρειάζονται πολύ
+# μικρότερο βαθμό k, αφού το μάτι είναι λιγότερο ευαίσθητο σε αυτά.
+#
+# "rgb":   Χωρίς μετασχηματισμό (τα κανάλια όπως είναι).
+# "ycbcr": Y, Cb, Cr του JPEG (ITU-R BT.601, πλήρες εύρος).
+# "klt":   Μετασχηματισμός Karhunen-Loeve της εικόνας: τα ιδιοδιανύσματα του 3x3 πίνακα
+#          ροπών των pixels, ώστε τα κανάλια να είναι ασυσχέτιστα και με φθίνουσα ενέργεια.
+#
+# Οι σταθερές μετατοπίσεις του JPEG (+128 στα Cb, Cr) παραλείπονται: ένας σταθερός όρος
+# είναι πίνακας βαθμού 1 και θα "έτρωγε" μία ιδιάζουσα τιμή από τον περιορισμένο βαθμό
+# των καναλιών χρώματος. Τα μετασχηματισμένα κανάλια είναι float (όχι περικομμένα στο
+# 0-255)· η περικοπή γίνεται μόνο στο τέλος, μετά τον αντίστροφο μετασχηματισμό.
+COLOR_TRANSFORMS = ('rgb', 'ycbcr', 'klt')
+
+YCBCR_MATRIX = np.array([
+    [0.299, 0.587, 0.114],
+    [-0.168736, -0.331264, 0.5],
+    [0.5, -0.418688, -0.081312],
+])
+
+CHANNEL_LABELS = {
+    'rgb': ("Κόκκινο", "Πράσινο", "Μπλε"),
+    'ycbcr': ("Y", "Cb", "Cr"),
+    'klt': ("KLT 1", "KLT 2", "KLT 3"),
+}
+
+# Βαθμός κάθε καναλιού ως κλάσμα του k (φωτεινότητα, χρώμα, χρώμα) για "ycbcr" και "klt"
+CHANNEL_RANK_FRACTIONS = (1.0, 0.25, 0.25)
+
+
+def fit_color_transform(channels, transform='ycbcr'):
+    """
+    Επιστρέφει τον 3x3 πίνακα T του μετασχηματισμού (νέα κανάλια = T * [R, G, B]).
+
+    channels: Τα κανάλια R, G, B (M x N), χρειάζονται μόνο για το "klt".
+    """
+    if transform not in COLOR_TRANSFORMS:
+        raise ValueError(f"Άγνωστος μετασχηματισμός: '{transform}'. Διαθέσιμοι: {', '.join(COLOR_TRANSFORMS)}.")
+
+    if transform == 'rgb':
+        return np.eye(3)
+    if transform == 'ycbcr':
+        return YCBCR_MATRIX.copy()
+
+    # KLT: C = sum_p x_p x_p^T (3x3) για όλα τα pixels x_p = (R, G, B), χωρίς αφαίρεση
+    # της μέσης τιμής, ώστε η ενέργεια (και όχι η διασπορά) να συγκεντρώνεται στο 1ο κανάλι
+    # όπως στην SVD. Υπολογίζεται ανά ζεύγος καναλιών, χωρίς πίνακα (M*N) x 3.
+    C = np.empty((3, 3))
+    for i in range(3):
+        for j in range(i, 3):
+            C[i, j] = C[j, i] = np.vdot(channels[i].astype(np.float64), channels[j].astype(np.float64))
+
+    lambdas, E = np.linalg.eigh(C)
+    E = E[:, ::-1]
+    # Πρόσημο: θετικό βάρος στο άθροισμα των R, G, B (το 1ο κανάλι ~ φωτεινότητα)
+    E *= np.where(E.sum(axis=0) < 0, -1.0, 1.0)
+    return E.T
+
+def apply_color_transform(channels, T, dtype=np.float64):
+    """
+    Εφαρμόζει τον 3x3 πίνακα T σε τρία κανάλια: out_c = sum_j T[c, j] * channels[j].
+
+    Επιστρέφει: Λίστα με τα τρία νέα κανάλια (M x N, τύπου dtype).
+    """
+    outputs = []
+    for row in T:
+        out = np.multiply(channels[0], row[0], dtype=dtype)
+        for weight, channel in zip(row[1:], channels[1:]):
+            out += np.multiply(channel, weight, dtype=dtype)
+        outputs.append(out)
+    return outputs
+
+def inverse_color_transform_to_uint8(channels, T):
+    """
+    Αντίστροφος μετασχηματισμός (με τον T^-1) ανακατασκευασμένων καναλιών (float, κλίμακα
+    0-255), περικοπή στο [0, 255] και μετατροπή σε uint8.
+
+    Επιστρέφει: Λίστα με τα R, G, B (uint8).
+    """
+    rgb = apply_color_transform(channels, np.linalg.inv(T), dtype=channels[0].dtype)
+    for channel in rgb:
+        # Στρογγυλοποίηση: το T^-1 T διαφέρει από το I κατά ~1e-16, οπότε χωρίς αυτήν
+        # ένα 255 θα γινόταν 254.99999 -> 254
+        np.rint(channel, out=channel)
+        np.clip(channel, 0, 255, out=channel)
+    return [channel.astype(np.uint8) for channel in rgb]
+
+def channel_rank_budget(k, transform='ycbcr', fractions=CHANNEL_RANK_FRACTIONS):
+    """
+    Βαθμός για κάθε κανάλι: k για όλα στο "rgb", αλλιώς ceil(k * fraction) (τουλάχιστον 1).
+
+    Επιστρέφει: Πλειάδα με τρεις βαθμούς.
+    """
+    if transform == 'rgb':
+        return (k, k, k)
+    return tuple(max(1, int(np.ceil(k * fraction))) for fraction in fractions)
+
+def luma(channels):
+    """
+    Η φωτεινότητα Y (BT.601) από τα R, G, B, ως float64.
+    """
+    return apply_color_transform(channels, YCBCR_MATRIX[:1])[0]
+
+
+# --- ΔΟΚΙΜΑΣΤΙΚΟ ΜΕΡΟΣ ---
+if __name__ == '__main__':
+    rng = np.random.default_rng(0)
+    base = rng.integers(0, 256, (64, 64))
+    channels = [np.clip(base + rng.integers(-20, 20, base.shape), 0, 255).astype(np.uint8) for _ in range(3)]
+
+    for transform in COLOR_TRANSFORMS:
+        T = fit_color_transform(channels, transform)
+        coded = apply_color_transform(channels, T)
+        decoded = inverse_color_transform_to_uint8(coded, T)
+        energy = [float(np.sum(c ** 2)) for c in coded]
+        error = max(int(np.max(np.abs(d.astype(int) - c))) for d, c in zip(decoded, channels))
+        print(f"{transform:<6} ενέργεια ανά κανάλι: {np.round(np.array(energy) / sum(energy), 4)}, "
+              f"max σφάλμα μετά τον αντίστροφο: {error}")
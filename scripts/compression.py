@@ -72,40 +72,121 @@
 
 
 
+import os
 import numpy as np
 from PIL import Image
 from metrics_calculation import matrix_multiply, matrix_transpose,matrix_scalar_multiply
 
-def reconstruct_channel(U, S_vector, V, k):
-    # 1. Επιλογή των k κορυφαίων συνιστωσών ποιο σημαντικές επομένως έχω συμπίεση πληροφορίας
-    U_k = U[:, :k]
-    S_k = S_vector[:k]
-    V_k = V[:, :k]
-    
-    # 2. Ανακατασκευή του πίνακα A_k (Βήμα 5)
-    # Δημιουργία διαγώνιου πίνακα Σ_k (k x k)
-    Sigma_k = np.diag(S_k)
-    
-    # Πρώτος πολλαπλασιασμός: U_k (M x k) * Sigma_k (k x k)
-    temp = matrix_multiply(U_k, Sigma_k)
+# Ύψος (σε γραμμές) των λωρίδων της συγχωνευμένης ανακατασκευής: κάθε λωρίδα
+# χρειάζεται μόνο έναν προσωρινό πίνακα chunk_rows x N αντί για ολόκληρο M x N.
+RECONSTRUCT_CHUNK_ROWS = 256
+
+def reconstruct_channel(U, S_vector, V, k, out=None, chunk_rows=RECONSTRUCT_CHUNK_ROWS):
+    """
+    Ανακατασκευή του καναλιού A_k για βαθμό k (Βήμα 5), απευθείας σε uint8 (0-255).
     
-    # Δεύτερος πολλαπλασιασμός: temp (M x k) * V_k^T (k x N)
-    # Χρήση custom matrix_transpose για το V_k
-    A_k = matrix_multiply(temp, matrix_transpose(V_k))
+    Συγχωνευμένη (fused) εκδοχή: αντί για Σ_k = diag(S_k), U_k Σ_k, (U_k Σ_k) V_k^T,
+    κλιμάκωση x255, περικοπή και μετατροπή (τέσσερις πίνακες M x N), οι στήλες του U_k
+    πολλαπλασιάζονται με S_k * 255 (πίνακας M x k), γίνεται ένας πολλαπλασιασμός ανά
+    λωρίδα γραμμών και η λωρίδα περικόπτεται και γράφεται κατευθείαν στην έξοδο uint8.
     
-    # 3. Απο-ομαλοποίηση και Κλιμάκωση
-    A_k_denorm = matrix_scalar_multiply(A_k,255.0)
-    A_k_clipped = np.clip(A_k_denorm, 0, 255).astype(np.uint8)
+    out: Προαιρετικός πίνακας uint8 (M x N) για την έξοδο (π.χ. για επαναχρησιμοποίηση).
+    chunk_rows: Γραμμές ανά λωρίδα (None για μία λωρίδα με όλες τις γραμμές).
     
-    return A_k_clipped
+    Επιστρέφει: Ο A_k σε uint8 (ο out, αν δόθηκε).
+    """
+    # 1. Επιλογή των k κορυφαίων συνιστωσών ποιο σημαντικές επομένως έχω συμπίεση πληροφορίας
+    # Η κλίμακα 255 (απο-ομαλοποίηση) μπαίνει μαζί με τις σ_i στις στήλες του U_k
+    U_scaled = U[:, :k] * (np.asarray(S_vector[:k]) * 255.0)
+    V_k_T = matrix_transpose(V[:, :k])
+    
+    M, N = U_scaled.shape[0], V_k_T.shape[1]
+    if out is None:
+        out = np.empty((M, N), dtype=np.uint8)
+    
+    # 2. Ανακατασκευή ανά λωρίδα γραμμών: A_k[r0:r1] = (U_k Σ_k 255)[r0:r1] V_k^T
+    step = chunk_rows or M
+    for r0 in range(0, M, step):
+        r1 = min(r0 + step, M)
+        block = matrix_multiply(U_scaled[r0:r1], V_k_T)
+        
+        # 3. Περικοπή επί τόπου και μετατροπή σε uint8 απευθείας στην έξοδο
+        np.clip(block, 0, 255, out=block)
+        np.copyto(out[r0:r1], block, casting='unsafe')
+    
+    return out
+
+def reconstruct_channel_sweep(U, S_vector, V, ranks, as_uint8=True):
+    """
+    Σταδιακή (incremental) ανακατασκευή για πολλά k σε αύξουσα σειρά.
+    
+    Αντί να ξαναϋπολογίζεται το A_k από την αρχή για κάθε k, κρατάμε το
+    A_{k_prev} και προσθέτουμε μόνο τις συνιστώσες k_prev+1 .. k:
+    A_k = A_{k_prev} + sum_{i=k_prev+1}^{k} (sigma_i * u_i * v_i^T)
+    Έτσι μια σάρωση για όλα τα k κοστίζει περίπου όσο μία ανακατασκευή για το μέγιστο k.
+    
+    as_uint8: Με False ο A_k επιστρέφεται ως float στην κλίμακα 0-255 χωρίς περικοπή
+              (π.χ. για κανάλια μετασχηματισμένου χώρου χρώματος, βλ. color_transform).
+    
+    Επιστρέφει (generator): Ζεύγη (k, A_k) με τον A_k σε uint8 (0-255), όπως η reconstruct_channel.
+    ValueError αν κάποιο k ξεπερνά το πλήθος των συνιστωσών (len(S_vector)).
+    """
+    rank = len(S_vector)
+    if any(k > rank for k in ranks):
+        raise ValueError(f"Ζητήθηκε k = {max(ranks)}, αλλά υπάρχουν μόνο {rank} συνιστώσες (ιδιάζουσες τιμές).")
+    
+    M, N = U.shape[0], V.shape[0]
+    A_acc = np.zeros((M, N), dtype=U.dtype)
+    k_prev = 0
+    
+    for k in sorted(ranks):
+        if k > k_prev:
+            add_rank_update(A_acc, U[:, k_prev:k], S_vector[k_prev:k], V[:, k_prev:k])
+            k_prev = k
+        
+        # Ο A_acc μένει ανέπαφος για το επόμενο k: η απο-ομαλοποίηση γίνεται ανά λωρίδα
+        if as_uint8:
+            yield k, denormalize_into_uint8(A_acc)
+        else:
+            yield k, matrix_scalar_multiply(A_acc, 255.0)
+
+def add_rank_update(A_acc, U_delta, S_delta, V_delta):
+    """
+    Προσθέτει στον A_acc (in-place) τις συνιστώσες sum_i (sigma_i * u_i * v_i^T)
+    των U_delta (M x d), S_delta (d), V_delta (N x d): A_acc += (U_Δ * S_Δ) @ V_Δ^T.
+    """
+    U_scaled = U_delta * S_delta
+    A_acc += matrix_multiply(U_scaled, matrix_transpose(V_delta))
+    return A_acc
+
+def denormalize_into_uint8(A_norm, out=None, chunk_rows=RECONSTRUCT_CHUNK_ROWS):
+    """
+    Απο-ομαλοποίηση [0, 1] -> [0, 255], περικοπή και μετατροπή σε uint8, ανά λωρίδα
+    γραμμών και κατευθείαν σε πίνακα uint8 (out), χωρίς να αλλάζει ο A_norm και χωρίς
+    προσωρινό πίνακα M x N.
+    """
+    M = A_norm.shape[0]
+    if out is None:
+        out = np.empty(A_norm.shape, dtype=np.uint8)
+    
+    step = chunk_rows or M
+    for r0 in range(0, M, step):
+        r1 = min(r0 + step, M)
+        block = np.multiply(A_norm[r0:r1], 255.0)
+        np.clip(block, 0, 255, out=block)
+        np.copyto(out[r0:r1], block, casting='unsafe')
+    
+    return out
 
-def merge_and_save_image(R_k, G_k, B_k, k, original_shape):
+def merge_and_save_image(R_k, G_k, B_k, k, original_shape, output_dir=None):
     # Βήμα 6: Επανένωση καναλιών
     compressed_image_np = np.dstack((R_k, G_k, B_k))
     
-    # Μετατροπή σε εικόνα και αποθήκευση
+    # Μετατροπή σε εικόνα και αποθήκευση (στον τρέχοντα φάκελο ή στον output_dir)
     compressed_image = Image.fromarray(compressed_image_np, 'RGB')
     output_filename = f'compressed_k{k}.png'
+    if output_dir is not None:
+        output_filename = os.path.join(output_dir, output_filename)
     compressed_image.save(output_filename)
     
     print(f"Εικόνα k={k} αποθηκεύτηκε ως: {output_filename}")
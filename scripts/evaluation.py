@@ -27,20 +27,43 @@ def calculate_mse(original_channel, compressed_channel):
     
     return mse
 
-def calculate_compression_ratio(M, N, k):
+def calculate_psnr(mse, max_value=255.0):
+    """
+    Υπολογίζει τον λόγο σήματος προς θόρυβο (PSNR, σε dB) από το MSE.
+    
+    Τύπος: PSNR = 10 * log10(max_value^2 / MSE)
+    """
+    if mse <= 0:
+        return np.inf # Τέλεια ανακατασκευή
+    
+    return 10.0 * np.log10(max_value ** 2 / mse)
+
+def calculate_compression_ratio(M, N, k, channels=1, stack='none'):
     """
     Υπολογίζει τον Λόγο Συμπίεσης (CR) για έναν πίνακα M x N με βαθμό προσέγγισης k.
     
     CR = (M * N) / (k * (M + N + 1))
+    
+    channels, stack: Για C κανάλια με κοινή SVD (βλ. svd_core.STACK_MODES) ο κοινός
+    παράγοντας και οι σ_i αποθηκεύονται μία φορά:
+        "horizontal": CR = (C * M * N) / (k * (M + C * N + 1))
+        "vertical":   CR = (C * M * N) / (k * (C * M + N + 1))
+        "none":       ίδιος CR με ένα κανάλι (C ξεχωριστές SVD).
     """
     
-    # Αριθμός στοιχείων αρχικής εικόνας (για ένα κανάλι)
-    original_size = M * N
+    # Αριθμός στοιχείων αρχικής εικόνας (για όλα τα κανάλια)
+    original_size = channels * M * N
     
     # Αριθμός στοιχείων συμπιεσμένης εικόνας (για ένα κανάλι)
     # Χρειάζονται k στήλες του U (M*k), k ιδιάζουσες τιμές (k), k στήλες του V (N*k)
     # Συνολικά: M*k + k + N*k = k * (M + N + 1)
-    compressed_size = k * (M + N + 1)
+    # Με στοίβαξη ο κοινός παράγοντας (U ή V) και οι σ_i μετρούν μία φορά
+    if stack == 'horizontal':
+        compressed_size = k * (M + channels * N + 1)
+    elif stack == 'vertical':
+        compressed_size = k * (channels * M + N + 1)
+    else:
+        compressed_size = channels * k * (M + N + 1)
     
     if compressed_size == 0:
         return np.inf # Αδιανόητο αλλά για λόγους ασφαλείας
@@ -49,6 +72,161 @@ def calculate_compression_ratio(M, N, k):
     
     return compression_ratio
 
+def calculate_effective_compression_ratio(M, N, channel_ranks):
+    """
+    Λόγος Συμπίεσης για πολλά κανάλια M x N με διαφορετικό βαθμό k_c το καθένα
+    (π.χ. Y, Cb, Cr με μικρότερο βαθμό στο χρώμα).
+    
+    CR = (C * M * N) / sum_c (k_c * (M + N + 1))
+    
+    Για ίδιο k σε όλα τα κανάλια ταυτίζεται με την calculate_compression_ratio.
+    """
+    original_size = len(channel_ranks) * M * N
+    compressed_size = sum(channel_ranks) * (M + N + 1)
+    
+    if compressed_size == 0:
+        return np.inf
+    
+    return original_size / compressed_size
+
+def predicted_mse_curve(S_vector, shape, total_energy=None):
+    """
+    Υπολογίζει την καμπύλη MSE(k) για k = 0, 1, ..., len(S_vector) απευθείας από τις
+    ιδιάζουσες τιμές, χωρίς ανακατασκευή της εικόνας.
+    
+    Για την αποκοπή βαθμού k ισχύει ||A - A_k||_F^2 = sum_{i>k} σ_i^2 (Eckart-Young), άρα
+    MSE_k = 255^2 * (sum_{i>k} σ_i^2) / (M*N), αφού οι σ_i αφορούν το ομαλοποιημένο κανάλι (0-1).
+    
+    S_vector: Οι ιδιάζουσες τιμές σε φθίνουσα σειρά.
+    shape: Οι διαστάσεις (M, N) του καναλιού.
+    total_energy: Το ||A_norm||_F^2 (= sum όλων των σ_i^2). Χρειάζεται όταν το S_vector
+                  είναι περικομμένο (π.χ. με k_max)· αν λείπει, θεωρείται ότι το S_vector
+                  περιέχει όλο το φάσμα.
+    
+    Σημείωση: Η μετρούμενη MSE διαφέρει λίγο, επειδή η ανακατασκευή περικόπτεται
+    στο [0, 255] (μειώνει το σφάλμα σε κορεσμένα pixels) και κβαντίζεται σε uint8
+    (το αυξάνει). Στο mario_clean.png η πρόβλεψη είναι 0-14% πάνω από τη μέτρηση.
+    
+    Επιστρέφει: Πίνακας μήκους len(S_vector) + 1 με το προβλεπόμενο MSE για κάθε k.
+    """
+    M, N = shape[0], shape[1]
+    energies = np.square(np.asarray(S_vector, dtype=np.float64))
+    
+    if total_energy is None:
+        total_energy = np.sum(energies)
+    
+    # Ενέργεια που απορρίπτεται για κάθε k: συνολική - αθροιστική των k πρώτων
+    kept_energy = np.concatenate(([0.0], np.cumsum(energies)))
+    discarded_energy = np.maximum(total_energy - kept_energy, 0.0)
+    
+    return (255.0 ** 2) * discarded_energy / (M * N)
+
+# --- Μαζική αξιολόγηση πολλών ανακατασκευών (όλα τα k και κανάλια μαζί) ---
+# Γραμμές ανά λωρίδα: η μνήμη είναι ~ 8 * (K + 1) * EVAL_CHUNK_ROWS * N * C bytes ανά ενδιάμεσο.
+# Μικρές λωρίδες μένουν στην cache: στο mario (K = 4) 32 γραμμές είναι ταχύτερες από 128
+# με το 1/4 της μνήμης (39 MB αντί για 150 MB).
+EVAL_CHUNK_ROWS = 32
+
+# SSIM με ομοιόμορφο παράθυρο w x w (όπως το skimage.metrics.structural_similarity)
+SSIM_WINDOW = 7
+SSIM_K1 = 0.01
+SSIM_K2 = 0.03
+
+def _box_mean(X, window):
+    # Μέσος όρος κάθε παραθύρου window x window (μόνο πλήρη παράθυρα) στους άξονες
+    # γραμμών/στηλών (-3, -2), με αθροιστικά αθροίσματα ανά άξονα (διαχωρίσιμο φίλτρο):
+    # άθροισμα_παραθύρου[i] = cumsum[i + window - 1] - cumsum[i - 1]
+    S = np.cumsum(X, axis=-3)
+    rows = S[..., window - 1:, :, :].copy()
+    rows[..., 1:, :, :] -= S[..., :-window, :, :]
+    
+    S = np.cumsum(rows, axis=-2)
+    box = S[..., window - 1:, :].copy()
+    box[..., 1:, :] -= S[..., :-window, :]
+    box *= 1.0 / (window * window)
+    return box
+
+def _ssim_sums(X, Y, window, max_value):
+    # Άθροισμα του χάρτη SSIM ανά (k, κανάλι) για τη λωρίδα: X (1 x h x N x C), Y (K x h x N x C)
+    C1 = (SSIM_K1 * max_value) ** 2
+    C2 = (SSIM_K2 * max_value) ** 2
+    # Δειγματική (αμερόληπτη) διασπορά μέσα στο παράθυρο
+    unbiased = window * window / (window * window - 1.0)
+    
+    mu_x = _box_mean(X, window)
+    mu_y = _box_mean(Y, window)
+    var_x = (_box_mean(X * X, window) - mu_x * mu_x) * unbiased
+    var_y = (_box_mean(Y * Y, window) - mu_y * mu_y) * unbiased
+    cov = (_box_mean(X * Y, window) - mu_x * mu_y) * unbiased
+    
+    ssim_map = ((2 * mu_x * mu_y + C1) * (2 * cov + C2)) / \
+               ((mu_x * mu_x + mu_y * mu_y + C1) * (var_x + var_y + C2))
+    return ssim_map.sum(axis=(1, 2))
+
+def evaluate_reconstructions(original, reconstructions, ranks=None, channel_names=None,
+                             ssim=True, window=SSIM_WINDOW, chunk_rows=EVAL_CHUNK_ROWS, max_value=255.0):
+    """
+    Υπολογίζει MSE, PSNR και SSIM για πολλές ανακατασκευές της ίδιας εικόνας με ένα
+    πέρασμα ανά λωρίδα γραμμών, για όλα τα k και όλα τα κανάλια μαζί.
+    
+    Αντί για μία calculate_mse ανά κανάλι και k (με δύο αντίγραφα float64 και τον πίνακα
+    διαφορών ολόκληρου του καναλιού κάθε φορά), η αρχική εικόνα μετατρέπεται μία φορά ανά
+    λωρίδα και συγκρίνεται ταυτόχρονα με όλες τις ανακατασκευές (broadcasting στον άξονα k).
+    
+    original: Η αρχική εικόνα uint8 (M x N x C ή M x N).
+    reconstructions: Ακολουθία K ανακατασκευών ίδιου σχήματος (λίστα ή πίνακας K x M x N x C).
+    ranks: Ετικέτες των ανακατασκευών (π.χ. τα k), προεπιλογή 0..K-1.
+    channel_names: Ονόματα των καναλιών, προεπιλογή 0..C-1.
+    ssim: Υπολογισμός SSIM (παράθυρο window x window, μέσος όρος στα πλήρη παράθυρα).
+    chunk_rows: Γραμμές ανά λωρίδα (None για μία λωρίδα).
+    
+    Επιστρέφει: Πίνακα (λίστα από λεξικά) {k, channel, MSE, PSNR, SSIM} με μία γραμμή ανά
+    (k, κανάλι) και μία γραμμή channel = "all" ανά k (μέσος όρος των καναλιών).
+    """
+    original = np.asarray(original)
+    if original.ndim == 2:
+        original = original[:, :, None]
+        reconstructions = [np.asarray(rec)[:, :, None] for rec in reconstructions]
+    
+    M, N, C = original.shape
+    K = len(reconstructions)
+    ranks = list(range(K)) if ranks is None else list(ranks)
+    channel_names = list(range(C)) if channel_names is None else list(channel_names)
+    
+    # Για εικόνα μικρότερη από το παράθυρο δεν ορίζεται SSIM
+    ssim = ssim and M >= window and N >= window
+    squared_error = np.zeros((K, C))
+    ssim_total = np.zeros((K, C))
+    
+    step = chunk_rows or M
+    for r0 in range(0, M, step):
+        r1 = min(r0 + step, M)
+        # Η λωρίδα περιλαμβάνει και window - 1 γραμμές μετά το r1 για τα παράθυρα του SSIM
+        e1 = min(r1 + window - 1, M) if ssim else r1
+        X = original[None, r0:e1].astype(np.float64)
+        Y = np.stack([np.asarray(rec[r0:e1], dtype=np.float64) for rec in reconstructions])
+        
+        diff = Y[:, :r1 - r0] - X[:, :r1 - r0]
+        squared_error += np.einsum('kijc,kijc->kc', diff, diff)
+        del diff
+        
+        if ssim and e1 - r0 >= window:
+            ssim_total += _ssim_sums(X, Y, window, max_value)
+    
+    mse = squared_error / (M * N)
+    ssim_values = ssim_total / ((M - window + 1) * (N - window + 1)) if ssim else np.full((K, C), np.nan)
+    
+    table = []
+    for i, k in enumerate(ranks):
+        for c, name in enumerate(channel_names):
+            table.append({'k': k, 'channel': name, 'MSE': float(mse[i, c]),
+                          'PSNR': float(calculate_psnr(mse[i, c], max_value)), 'SSIM': float(ssim_values[i, c])})
+        avg_mse = float(np.mean(mse[i]))
+        table.append({'k': k, 'channel': 'all', 'MSE': avg_mse,
+                      'PSNR': float(calculate_psnr(avg_mse, max_value)), 'SSIM': float(np.mean(ssim_values[i]))})
+    
+    return table
+
 # --- ΔΟΚΙΜΑΣΤΙΚΟ ΜΕΡΟΣ ---
 if __name__ == '__main__':
     print("Το evaluation.py περιέχει συναρτήσεις για MSE και CR.")
@@ -57,4 +235,18 @@ if __name__ == '__main__':
     M_test, N_test = 500, 300
     k_test = 10
     cr = calculate_compression_ratio(M_test, N_test, k_test)
-    print(f"\nCR για 500x300 και k=10: {cr:.2f}") # Περίπου 14.97
\ No newline at end of file
+    print(f"\nCR για 500x300 και k=10: {cr:.2f}") # Περίπου 14.97
+    
+    # Κοινός U για 3 κανάλια (οριζόντια στοίβαξη) έναντι 3 ξεχωριστών SVD
+    for stack in ('none', 'horizontal', 'vertical'):
+        cr = calculate_compression_ratio(M_test, N_test, k_test, channels=3, stack=stack)
+        print(f"CR για 3 x 500x300, k=10, στοίβαξη {stack}: {cr:.2f}")
+    
+    # Μαζική αξιολόγηση: ίδιο MSE με την calculate_mse, για δύο "ανακατασκευές"
+    rng = np.random.default_rng(0)
+    original = rng.integers(0, 256, (40, 30, 3)).astype(np.uint8)
+    noisy = [np.clip(original + rng.normal(0, sigma, original.shape), 0, 255).astype(np.uint8) for sigma in (5, 20)]
+    for row in evaluate_reconstructions(original, noisy, ranks=(5, 20), chunk_rows=16):
+        print(f"  σ={row['k']:<3} κανάλι {row['channel']!s:<4} MSE {row['MSE']:>8.3f}  "
+              f"PSNR {row['PSNR']:>6.2f} dB  SSIM {row['SSIM']:.4f}")
+    print(f"  Έλεγχος με calculate_mse (σ=20, κανάλι 0): {calculate_mse(original[:, :, 0], noisy[1][:, :, 0]):.3f}")
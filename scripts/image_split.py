@@ -1,28 +1,35 @@
 import numpy as np
 from PIL import Image
-import matplotlib.pyplot as plt
-from metrics_calculation import matrix_multiply, matrix_transpose
+from metrics_calculation import gram_matrix
 
 
 # --- 1. Ορισμός Σταθερών και Φόρτωση Εικόνας ---
 IMAGE_PATH = 'mario_clean.png' 
 
+# Τύπος κινητής υποδιαστολής για τους υπολογισμούς (np.float64 ή np.float32).
+# Με float32 η μνήμη και το εύρος ζώνης μνήμης των πινάκων υποδιπλασιάζονται.
+COMPUTE_DTYPE = np.float64
+
 def load_and_split_image(image_path):
     """
     Φορτώνει μια έγχρωμη εικόνα, την μετατρέπει σε πίνακα NumPy, 
     και εξάγει τα κανάλια RGB (μη ομαλοποιημένα).
+    
+    Τα κανάλια επιστρέφονται ως ξεχωριστοί συνεχείς (contiguous) πίνακες uint8
+    (1 byte/pixel), που δημιουργούνται μία φορά. Η μετατροπή σε float γίνεται
+    μόνο κατά την ομαλοποίηση (normalize_channel).
     """
     try:
         # Φόρτωση εικόνας (Pillow)
         img = Image.open(image_path).convert('RGB') # Προσθήκη convert('RGB') για σταθερότητα
         
-        # Μετατροπή σε πίνακα NumPy
-        img_np = np.array(img, dtype=np.float64)
+        # Μετατροπή σε πίνακα NumPy (uint8, χωρίς αντίγραφο float64 ολόκληρης της εικόνας)
+        img_np = np.asarray(img, dtype=np.uint8)
         
-        # Εξαγωγή των καναλιών RGB (Βήμα 1)
-        A_R = img_np[:, :, 0]
-        A_G = img_np[:, :, 1]
-        A_B = img_np[:, :, 2]
+        # Εξαγωγή των καναλιών RGB (Βήμα 1) σε συνεχείς πίνακες αντί για strided views
+        A_R = np.ascontiguousarray(img_np[:, :, 0])
+        A_G = np.ascontiguousarray(img_np[:, :, 1])
+        A_B = np.ascontiguousarray(img_np[:, :, 2])
         
         print(f"Εικόνα φορτώθηκε. Διαστάσεις: {img_np.shape}")
         
@@ -36,18 +43,34 @@ def load_and_split_image(image_path):
         print(f"ΣΦΑΛΜΑ κατά τη φόρτωση της εικόνας: {e}")
         raise
 
-def normalize_and_prepare_w(A_channel):
+def normalize_channel(A_channel, dtype=None):
+    """
+    Ομαλοποίηση (Normalization): Μετατροπή των τιμών [0-255] σε [0-1], στον τύπο dtype
+    (προεπιλογή COMPUTE_DTYPE), με μία μόνο δέσμευση μνήμης.
+    """
+    dtype = np.dtype(COMPUTE_DTYPE if dtype is None else dtype)
+    
+    return np.multiply(A_channel, dtype.type(1.0 / 255.0), dtype=dtype)
+
+def normalize_and_prepare_w(A_channel, chunk_rows=None, dtype=None, side='right'):
     """
     Ομαλοποιεί ένα κανάλι (A_channel) και υπολογίζει τον πίνακα W = A^T A (Βήμα 2).
     
+    chunk_rows: Αν δοθεί, ο W συσσωρεύεται ανά ομάδες γραμμών (για μεγάλες εικόνες).
+    dtype: Τύπος των υπολογισμών (προεπιλογή COMPUTE_DTYPE).
+    side: "right" για W = A^T A (N x N) ή "left" για W = A A^T (M x M),
+          βλ. svd_core.choose_gram_side.
+    
     Επιστρέφει: Το ομαλοποιημένο κανάλι και τον πίνακα W.
     """
     
     # Ομαλοποίηση (Normalization): Μετατροπή των τιμών [0-255] σε [0-1]
-    A_norm = A_channel / 255.0
+    A_norm = normalize_channel(A_channel, dtype)
     
     # Βήμα 2: Υπολογισμός W = A^T A
-    W = matrix_multiply(matrix_transpose(A_norm), A_norm)
+    # Ο W είναι συμμετρικός: υπολογίζεται μόνο το άνω τρίγωνο, χωρίς τον ανάστροφο A^T
+    # Για side="left" ο A A^T είναι ο πίνακας Gram του A^T (view, χωρίς αντίγραφο)
+    W = gram_matrix(A_norm if side == 'right' else A_norm.T, chunk_rows)
     
     return A_norm, W
 
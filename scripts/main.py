@@ -1,7 +1,9 @@
 import numpy as np
-import matplotlib.pyplot as plt
 import os
 import sys
+import argparse
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from multiprocessing import shared_memory
 
 # Προσθέτουμε τον φάκελο 'scripts' στο PATH για να βρει τα modules (απαραίτητο αν τρέχουμε από διαφορετικό φάκελο)
 if 'scripts' not in sys.path:
@@ -11,62 +13,432 @@ if 'scripts' not in sys.path:
 
 # --- ΕΙΣΑΓΩΓΗ ΣΥΝΑΡΤΗΣΕΩΝ (IMPORTS) ---
 # Συναρτήσεις από τα άλλα scripts
-from image_split import load_and_split_image, normalize_and_prepare_w, IMAGE_PATH
-from svd_core import calculate_eigens, calculate_svd_matrices
-from compression import reconstruct_channel, merge_and_save_image
-from evaluation import calculate_mse, calculate_compression_ratio
-from metrics_calculation import matrix_multiply,matrix_transpose,matrix_scalar_multiply
+from image_split import load_and_split_image, normalize_and_prepare_w, normalize_channel, IMAGE_PATH, COMPUTE_DTYPE
+from svd_core import (calculate_eigens, calculate_svd_matrices, randomized_svd, qr_svd, choose_gram_side,
+                      stack_channels, split_stacked_factors, STACK_MODES)
+from compression import reconstruct_channel_sweep, merge_and_save_image
+from evaluation import calculate_compression_ratio, calculate_effective_compression_ratio, evaluate_reconstructions
+from color_transform import (fit_color_transform, apply_color_transform, inverse_color_transform_to_uint8,
+                             channel_rank_budget, CHANNEL_LABELS, COLOR_TRANSFORMS)
+from rank_selection import select_rank
+from metrics_calculation import matrix_multiply,matrix_transpose,matrix_scalar_multiply, set_backend, get_backend
+from svd_cache import cache_key, load_factors, save_factors
+from svdc_format import write_svdc
+from profiling import (stage, stage_iter, enable_profiling, print_profile_report, export_json,
+                       export_chrome_trace, gram_flops, matmul_flops, full_eigh_flops)
 
 # --- 1. Ορισμός Σταθερών Εκτέλεσης ---
 # Οι βαθμίδες προσέγγισης k που θα χρησιμοποιήσουμε για τη συμπίεση
 RANKS_TO_TEST = [5, 20, 50, 100]
 
-def process_channel(A_channel, channel_name):
+# Στόχος για αυτόματη επιλογή του k ανά κανάλι αντί για τη σταθερή λίστα RANKS_TO_TEST,
+# π.χ. {'psnr': 30.0}, {'mse': 50.0}, {'energy': 0.99} ή {'cr': 10.0}. None για τη λίστα.
+# Η αναζήτηση γίνεται στις K_MAX ιδιάζουσες τιμές που υπολογίζονται.
+RANK_TARGET = None
+
+# Υπολογίζουμε μόνο τις K_MAX κορυφαίες ιδιάζουσες τριάδες (σ_i, u_i, v_i),
+# αφού καμία ανακατασκευή δεν χρειάζεται περισσότερες. None για πλήρη SVD.
+K_MAX = max(RANKS_TO_TEST)
+
+# Μέθοδος SVD: "eigh" (ιδιοανάλυση του W = A^T A), "randomized"
+# (τυχαιοποιημένη SVD για πολύ μεγάλες εικόνες, απαιτεί K_MAX) ή "qr" (QR και SVD του
+# τριγωνικού παράγοντα, χωρίς W: αριθμητικά ευσταθής και με image_split.COMPUTE_DTYPE = np.float32)
+SVD_METHOD = 'eigh'
+
+# Πλευρά του πίνακα Gram για τη μέθοδο "eigh": "right" (W = A^T A, N x N),
+# "left" (W = A A^T, M x M) ή "auto" για τον μικρότερο (βλ. svd_core.choose_gram_side).
+GRAM_SIDE = 'auto'
+
+# Backend για τις πράξεις πινάκων του metrics_calculation.
+# "numpy" για κανονική εκτέλεση, "blocked" για τον χειρόγραφο πυρήνα σε πλακίδια,
+# "loops" για την υλοποίηση αναφοράς με βρόχους.
+MATRIX_BACKEND = 'numpy'
+
+# Μόνιμη cache των U, S, V ανά κανάλι (φάκελος svd_cache.CACHE_DIR), ώστε μια νέα
+# εκτέλεση με άλλα RANKS_TO_TEST να μην ξαναϋπολογίζει την SVD της ίδιας εικόνας.
+USE_SVD_CACHE = True
+
+# Παράλληλη επεξεργασία των καναλιών R, G, B (είναι ανεξάρτητα μεταξύ τους).
+# WORKERS = 1 για σειριακή εκτέλεση (ή --workers από τη γραμμή εντολών).
+# EXECUTOR: "thread" (για τα backends με BLAS, που αφήνουν ελεύθερο το GIL),
+# "process" (για το "loops", που είναι καθαρή Python) ή "auto" για αυτόματη επιλογή.
+WORKERS = 1
+EXECUTOR = 'auto'
+
+CHANNEL_NAMES = ("Κόκκινο", "Πράσινο", "Μπλε")
+
+# Υπολογισμός SSIM στην αξιολόγηση (ή --ssim). Είναι πολύ ακριβότερος από MSE/PSNR
+# (τοπικοί μέσοι όροι και διασπορές σε κάθε παράθυρο), οπότε είναι απενεργοποιημένος.
+EVAL_SSIM = False
+
+# Μετασχηματισμός χρώματος πριν από την SVD: "rgb" (κανένας), "ycbcr" ή "klt"
+# (βλ. color_transform). Με "ycbcr"/"klt" κάθε κανάλι έχει δικό του βαθμό: k για τη
+# φωτεινότητα και color_transform.CHANNEL_RANK_FRACTIONS * k για τα κανάλια χρώματος.
+COLOR_TRANSFORM = 'rgb'
+
+# Κοινή SVD για τα τρία κανάλια (βλ. svd_core.STACK_MODES): "horizontal" (M x 3N, κοινός U),
+# "vertical" (3M x N, κοινός V) ή "none" για ξεχωριστή SVD ανά κανάλι.
+# Μία ιδιοανάλυση αντί για τρεις και ο κοινός παράγοντας αποθηκεύεται μία φορά.
+STACK_CHANNELS = 'none'
+
+# Ο τύπος κινητής υποδιαστολής των υπολογισμών (float64 ή float32) ορίζεται μία φορά,
+# στο image_split.COMPUTE_DTYPE.
+
+# Αποθήκευση των περικομμένων παραγόντων U_k, S_k, V_k σε αρχείο .svdc για κάθε k
+# (το πραγματικό "συμπιεσμένο" αρχείο, σε αντίθεση με το PNG πλήρους ανάλυσης).
+# SVDC_DTYPE: "float16" ή "int8", SVDC_CODEC: "none", "zlib" ή "lzma".
+SAVE_SVDC = True
+SVDC_DTYPE = 'int8'
+SVDC_CODEC = 'zlib'
+
+# Εμφάνιση της σύγκρισης αρχικής/συμπιεσμένων εικόνων:
+# "show" (παράθυρο matplotlib, περιμένει να κλείσει), "file" (PNG στο PLOT_FILE με το
+# Agg, σε νήμα παρασκηνίου), "none" (καθόλου γράφημα) ή "auto" ("show" αν υπάρχει
+# οθόνη, αλλιώς "file"). Το matplotlib φορτώνεται μόνο όταν ζητηθεί γράφημα.
+PLOT_MODE = 'auto'
+PLOT_FILE = 'comparison.png'
+PLOT_MODES = ('auto', 'show', 'file', 'none')
+
+def process_channel(A_channel, channel_name, k_max=K_MAX, dtype=None):
     """
     Εκτελεί τα Βήματα 2, 3, και 4 για ένα συγκεκριμένο κανάλι χρώματος.
     Υπολογίζει U, S, V και επιστρέφει το ομαλοποιημένο κανάλι.
     
+    k_max: Πλήθος κορυφαίων ιδιάζουσων τριάδων που υπολογίζονται (None για πλήρη SVD).
+    dtype: Τύπος των υπολογισμών (προεπιλογή COMPUTE_DTYPE).
+    
     Επιστρέφει: U, S_vector, V, A_norm
     """
     print(f"\n--- Επεξεργασία {channel_name} Καναλιού (Βήματα 2, 3, 4) ---")
     
-    # Βήμα 2: Ομαλοποίηση και Υπολογισμός W = A^T A
-    A_norm, W = normalize_and_prepare_w(A_channel)
+    # Αναζήτηση στην cache με κλειδί το hash των pixels και τις παραμέτρους της SVD
+    dtype = np.dtype(COMPUTE_DTYPE if dtype is None else dtype)
+    side = choose_gram_side(A_channel.shape, GRAM_SIDE)
     
-    # Βήμα 3: Υπολογισμός Ιδιοτιμών/Ιδιοδιανυσμάτων
-    # Χρησιμοποιούμε την np.linalg.eigh (επιτρεπόμενη έτοιμη συνάρτηση)
-    lambdas, V_full = calculate_eigens(W)
+    key = None
+    cached = None
+    if USE_SVD_CACHE:
+        with stage('cache_lookup'):
+            key = cache_key(A_channel, method=SVD_METHOD, k_max=k_max, backend=MATRIX_BACKEND,
+                            dtype=dtype.name, gram_side=side)
+            cached = load_factors(key)
     
-    # Βήμα 4: Υπολογισμός U, Sigma, V (αυτο-υλοποίηση του U)
-    U, S_vector, V = calculate_svd_matrices(A_norm, lambdas, V_full)
+    M, N = A_channel.shape
+    if cached is not None:
+        print("  Οι παράγοντες U, S, V φορτώθηκαν από την cache.")
+        with stage('normalize', flops=M * N):
+            A_norm = normalize_channel(A_channel, dtype)
+        U, S_vector, V = cached
+    elif SVD_METHOD == 'randomized':
+        # Τυχαιοποιημένη SVD απευθείας στο ομαλοποιημένο κανάλι (χωρίς W)
+        with stage('normalize', flops=M * N):
+            A_norm = normalize_channel(A_channel, dtype)
+        with stage('randomized_svd'):
+            U, S_vector, V = randomized_svd(A_norm, k_max)
+    elif SVD_METHOD == 'qr':
+        # QR και SVD του τριγωνικού παράγοντα, χωρίς τον πίνακα Gram
+        with stage('normalize', flops=M * N):
+            A_norm = normalize_channel(A_channel, dtype)
+        with stage('qr_svd'):
+            U, S_vector, V = qr_svd(A_norm, k_max)
+    else:
+        # Βήμα 2: Ομαλοποίηση και Υπολογισμός W = A^T A (ή A A^T, αν είναι μικρότερος)
+        # n: Διάσταση του W
+        n = N if side == 'right' else M
+        print(f"  Πίνακας Gram: {'A^T A' if side == 'right' else 'A A^T'} ({n} x {n})")
+        with stage('W', flops=M * N + gram_flops(M * N // n, n)):
+            A_norm, W = normalize_and_prepare_w(A_channel, dtype=dtype, side=side)
+        
+        # Βήμα 3: Υπολογισμός Ιδιοτιμών/Ιδιοδιανυσμάτων
+        # Πλήρης np.linalg.eigh ή, αν οριστεί K_MAX, μόνο οι K_MAX μεγαλύτερες ιδιοτιμές
+        # (οι επαναλήψεις της μερικής λύσης δεν είναι γνωστές εκ των προτέρων: χωρίς FLOPs)
+        with stage('eigensolve', flops=full_eigh_flops(n) if k_max is None or k_max >= n else None):
+            lambdas, V_full = calculate_eigens(W, k_max)
+        
+        # Βήμα 4: Υπολογισμός U, Sigma, V (ο παράγοντας που λείπει, U ή V, από τον A)
+        rank = n if k_max is None else min(k_max, n)
+        with stage('U', flops=matmul_flops(M, N, rank)):
+            U, S_vector, V = calculate_svd_matrices(A_norm, lambdas, V_full, k_max, side=side)
+    
+    if key is not None and cached is None:
+        with stage('cache_save'):
+            save_factors(key, U, S_vector, V)
     
     # Έλεγχος: Εμφάνιση του rank και της μεγαλύτερης ιδιάζουσας τιμής
     rank = len(S_vector)
     print(f"  Διαστάσεις {channel_name}: {A_norm.shape}")
-    print(f"  Rank (Αριθμός μη μηδενικών σ): {rank}")
+    print(f"  Αριθμός μη μηδενικών σ που υπολογίστηκαν: {rank}")
     print(f"  Μεγαλύτερη σ1: {S_vector[0]:.4f}")
     
     return U, S_vector, V, A_norm
 
-def run_compression_pipeline():
+def _init_channel_worker(backend):
+    # Κάθε νέα διεργασία ξεκινά με το ίδιο backend πράξεων πινάκων
+    set_backend(backend)
+
+def _process_shared_channel(shm_name, shape, dtype, index, channel_name, k_max, compute_dtype):
+    # Εκτελείται σε ξεχωριστή διεργασία: το κανάλι διαβάζεται από την κοινή μνήμη
+    # (shared memory) αντί να αντιγραφεί με pickle.
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        channels = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        U, S_vector, V, _ = process_channel(channels[index], channel_name, k_max, compute_dtype)
+        # Το A_norm δεν επιστρέφεται (ξαναϋπολογίζεται φθηνά στην κύρια διεργασία)
+        return np.asarray(U), np.asarray(S_vector), np.asarray(V)
+    finally:
+        shm.close()
+
+def process_channels(channels, workers=None, executor=None, k_max=K_MAX, dtype=None, names=None):
+    """
+    Εκτελεί την process_channel για τα κανάλια R, G, B, σειριακά ή παράλληλα.
+    
+    workers: Πλήθος παράλληλων εργατών (προεπιλογή WORKERS).
+    executor: "thread", "process" ή "auto" (προεπιλογή EXECUTOR). Με "auto" επιλέγονται
+              διεργασίες για το backend "loops" και νήματα για τα υπόλοιπα.
+    k_max, dtype: Όπως στην process_channel. Το k_max μπορεί να είναι και λίστα με
+                  ένα k_max ανά κανάλι (π.χ. μικρότερο για τα κανάλια χρώματος).
+    names: Ονόματα των καναλιών για τα μηνύματα (προεπιλογή CHANNEL_NAMES).
+    
+    Επιστρέφει: Λίστα με (U, S_vector, V, A_norm) για κάθε κανάλι.
+    """
+    workers = WORKERS if workers is None else workers
+    executor = EXECUTOR if executor is None else executor
+    dtype = np.dtype(COMPUTE_DTYPE if dtype is None else dtype)
+    names = CHANNEL_NAMES if names is None else names
+    k_maxes = list(k_max) if isinstance(k_max, (list, tuple)) else [k_max] * len(channels)
+    
+    if workers <= 1:
+        return [process_channel(A_channel, name, channel_k_max, dtype)
+                for A_channel, name, channel_k_max in zip(channels, names, k_maxes)]
+    
+    if executor == 'auto':
+        executor = 'process' if get_backend() == 'loops' else 'thread'
+    
+    if executor == 'thread':
+        # Τα νήματα μοιράζονται ήδη τη μνήμη της εικόνας
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(process_channel, channels, names, k_maxes, [dtype] * len(channels)))
+    
+    if executor != 'process':
+        raise ValueError(f"Άγνωστος executor: '{executor}'. Διαθέσιμοι: thread, process, auto.")
+    
+    # Διεργασίες: τα κανάλια γράφονται μία φορά σε κοινή μνήμη (3 x M x N)
+    stacked_shape = (len(channels),) + channels[0].shape
+    channel_dtype = channels[0].dtype
+    shm = shared_memory.SharedMemory(create=True, size=int(np.prod(stacked_shape)) * channel_dtype.itemsize)
+    try:
+        shared = np.ndarray(stacked_shape, dtype=channel_dtype, buffer=shm.buf)
+        for index, A_channel in enumerate(channels):
+            shared[index] = A_channel
+        
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_channel_worker,
+                                 initargs=(get_backend(),)) as pool:
+            futures = [
+                pool.submit(_process_shared_channel, shm.name, stacked_shape, channel_dtype,
+                            index, name, channel_k_max, dtype)
+                for index, (name, channel_k_max) in enumerate(zip(names, k_maxes))
+            ]
+            factors = [future.result() for future in futures]
+    finally:
+        shm.close()
+        shm.unlink()
+    
+    return [(U, S_vector, V, normalize_channel(A_channel, dtype))
+            for (U, S_vector, V), A_channel in zip(factors, channels)]
+
+def select_target_ranks(channel_spectra):
+    """
+    Επιλέγει k για κάθε κανάλι ώστε να ικανοποιείται ο RANK_TARGET, μόνο από τις
+    ιδιάζουσες τιμές (χωρίς ανακατασκευές).
+    
+    channel_spectra: Λίστα από ζεύγη (S_vector, A_norm) ανά κανάλι.
+    
+    Επιστρέφει: Λίστα με ένα k (το μεγαλύτερο των καναλιών, ώστε να ικανοποιούν
+    όλα τον στόχο) ή τη RANKS_TO_TEST αν ο στόχος δεν επιτυγχάνεται.
+    """
+    print(f"\n--- Αυτόματη επιλογή k για στόχο {RANK_TARGET} ---")
+    
+    selected = []
+    for (S_vector, A_norm), name in zip(channel_spectra, CHANNEL_NAMES):
+        # Η συνολική ενέργεια ||A||_F^2 συμπληρώνει το (πιθανώς περικομμένο) φάσμα
+        k = select_rank(S_vector, A_norm.shape, RANK_TARGET, total_energy=np.sum(np.square(A_norm)))
+        print(f"  {name}: k = {k}")
+        selected.append(k)
+    
+    if any(k is None for k in selected):
+        print("  Ο στόχος δεν επιτυγχάνεται με τις διαθέσιμες ιδιάζουσες τιμές· χρήση RANKS_TO_TEST.")
+        return RANKS_TO_TEST
+    
+    return [max(selected)]
+
+_plot_pool = None
+_pending_plots = []
+
+def _resolve_plot_mode(mode):
+    if mode != 'auto':
+        return mode
+    # Χωρίς γραφικό περιβάλλον (π.χ. server) το plt.show() δεν έχει νόημα
+    if sys.platform.startswith('linux') and not (os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY')):
+        return 'file'
+    return 'show'
+
+def _draw_comparison(fig, original_img, compressed_images, ranks, original_shape):
+    axes = fig.subplots(1, len(compressed_images) + 1)
+    
+    # Αρχική Εικόνα
+    axes[0].imshow(original_img)
+    axes[0].set_title(f"Original\n({original_shape[0]}x{original_shape[1]})")
+    
+    # Συμπιεσμένες Εικόνες (χρησιμοποιούμε τα UINT8)
+    # (με τη σειρά της σάρωσης, δηλαδή αύξουσα ως προς k)
+    for ax, image, k in zip(axes[1:], compressed_images, ranks):
+        ax.imshow(image)
+        ax.set_title(f"k = {k}")
+    
+    for ax in axes:
+        ax.axis('off')
+    
+    fig.tight_layout()
+
+def render_comparison_file(original_img, compressed_images, ranks, original_shape, path=PLOT_FILE):
+    """
+    Σχεδιάζει τη σύγκριση σε αρχείο εικόνας με το Agg (χωρίς pyplot και χωρίς οθόνη),
+    ώστε να μπορεί να τρέξει σε νήμα παρασκηνίου.
+    """
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    
+    fig = Figure(figsize=(18, 5))
+    FigureCanvasAgg(fig)
+    _draw_comparison(fig, original_img, compressed_images, ranks, original_shape)
+    fig.savefig(path)
+    return path
+
+def plot_results(original_img, compressed_images, ranks, original_shape, mode=None, path=None):
+    """
+    Εμφανίζει ή αποθηκεύει τη σύγκριση αρχικής/συμπιεσμένων εικόνων (Βήμα Ε).
+    
+    mode: Όπως το PLOT_MODE (προεπιλογή PLOT_MODE).
+    path: Αρχείο για τη λειτουργία "file" (προεπιλογή PLOT_FILE).
+    
+    Επιστρέφει: Ένα Future για τη λειτουργία "file" (η σχεδίαση συνεχίζει στο
+    παρασκήνιο, βλ. wait_for_plots), αλλιώς None.
+    """
+    global _plot_pool
+    mode = _resolve_plot_mode(PLOT_MODE if mode is None else mode)
+    
+    if mode == 'none':
+        return None
+    
+    if mode == 'file':
+        if _plot_pool is None:
+            _plot_pool = ThreadPoolExecutor(max_workers=1)
+        future = _plot_pool.submit(render_comparison_file, original_img, list(compressed_images),
+                                   list(ranks), original_shape, path or PLOT_FILE)
+        _pending_plots.append(future)
+        return future
+    
+    if mode != 'show':
+        raise ValueError(f"Άγνωστη λειτουργία γραφήματος: '{mode}'. Διαθέσιμες: {', '.join(PLOT_MODES)}.")
+    
+    import matplotlib.pyplot as plt
+    fig = plt.figure(figsize=(18, 5))
+    _draw_comparison(fig, original_img, compressed_images, ranks, original_shape)
+    plt.show()
+    return None
+
+def wait_for_plots():
+    """
+    Περιμένει να ολοκληρωθούν τα γραφήματα που σχεδιάζονται στο παρασκήνιο.
+    
+    Επιστρέφει: Τα αρχεία που γράφτηκαν.
+    """
+    paths = [future.result() for future in _pending_plots]
+    _pending_plots.clear()
+    return paths
+
+def run_compression_pipeline(workers=None, plot_mode=None, color=None, stack=None, ssim=None):
     """
     Κεντρική λειτουργία που συνδέει όλα τα βήματα της SVD συμπίεσης.
+    
+    workers: Πλήθος παράλληλων εργατών για τα κανάλια (προεπιλογή WORKERS).
+    plot_mode: Λειτουργία γραφήματος (προεπιλογή PLOT_MODE).
+    color: Μετασχηματισμός χρώματος (προεπιλογή COLOR_TRANSFORM).
+    stack: Κοινή SVD των καναλιών (προεπιλογή STACK_CHANNELS).
+    ssim: Υπολογισμός SSIM στην αξιολόγηση (προεπιλογή EVAL_SSIM).
     """
+    color = COLOR_TRANSFORM if color is None else color
+    stack = STACK_CHANNELS if stack is None else stack
+    ssim = EVAL_SSIM if ssim is None else ssim
+    # Ο κοινός παράγοντας επιβάλλει ίδιο k σε όλα τα κανάλια, ενώ ο μετασχηματισμός
+    # χρώματος δίνει διαφορετικό βαθμό ανά κανάλι
+    if stack != 'none' and color != 'rgb':
+        raise ValueError("Η στοίβαξη καναλιών δεν συνδυάζεται με μετασχηματισμό χρώματος.")
+    # Η τυχαιοποιημένη SVD υπολογίζει μόνο k κορυφαίες τριάδες, δεν έχει "πλήρη" εκδοχή
+    if SVD_METHOD == 'randomized' and K_MAX is None:
+        raise ValueError("Το SVD_METHOD = 'randomized' απαιτεί K_MAX (όχι None).")
     
     print("=========================================")
     print(f"Ξεκινά η SVD Συμπίεση για εικόνα: {IMAGE_PATH}")
     print("=========================================")
+
+    set_backend(MATRIX_BACKEND)
+    print(f"Backend πράξεων πινάκων: {MATRIX_BACKEND}")
     
     try:
         # --- Α) Βήμα 1: Φόρτωση και Διαχωρισμός Εικόνας ---
         # R_channel, G_channel, B_channel είναι ΜΗ ομαλοποιημένα (0-255)
-        R_channel, G_channel, B_channel, original_shape = load_and_split_image(IMAGE_PATH)
+        with stage('load'):
+            R_channel, G_channel, B_channel, original_shape = load_and_split_image(IMAGE_PATH)
 
         # --- Β) Βήματα 2, 3, 4: Υπολογισμός SVD Matrices (U, S, V) για κάθε κανάλι ---
         # R_norm, G_norm, B_norm είναι τα ομαλοποιημένα κανάλια (0-1)
-        U_R, S_R, V_R, R_norm = process_channel(R_channel, "Κόκκινο")
-        U_G, S_G, V_G, G_norm = process_channel(G_channel, "Πράσινο")
-        U_B, S_B, V_B, B_norm = process_channel(B_channel, "Μπλε")
+        # Τα τρία κανάλια είναι ανεξάρτητα και μπορούν να επεξεργαστούν παράλληλα
+        # Με μετασχηματισμό χρώματος η SVD γίνεται στα κανάλια Y/Cb/Cr (ή KLT), με μικρότερο
+        # βαθμό στα κανάλια χρώματος. Τα ονόματα U_R, ... αναφέρονται τότε στα κανάλια 1, 2, 3.
+        ranks = sorted(RANKS_TO_TEST)
+        if color == 'rgb':
+            coded_channels, channel_names, k_max = (R_channel, G_channel, B_channel), CHANNEL_NAMES, K_MAX
+        else:
+            print(f"Μετασχηματισμός χρώματος: {color} (βαθμοί ανά κανάλι: "
+                  f"{', '.join('/'.join(map(str, channel_rank_budget(k, color))) for k in ranks)})")
+            with stage('color_transform'):
+                T_color = fit_color_transform((R_channel, G_channel, B_channel), color)
+                coded_channels = apply_color_transform((R_channel, G_channel, B_channel), T_color, COMPUTE_DTYPE)
+            channel_names = CHANNEL_LABELS[color]
+            k_max = K_MAX if K_MAX is None else list(channel_rank_budget(K_MAX, color))
+        
+        if stack == 'none':
+            (U_R, S_R, V_R, R_norm), (U_G, S_G, V_G, G_norm), (U_B, S_B, V_B, B_norm) = \
+                process_channels(coded_channels, workers, k_max=k_max, names=channel_names)
+        else:
+            # Μία SVD για τον στοιβαγμένο πίνακα (ίδιος βαθμός k για όλα τα κανάλια)
+            with stage('stack'):
+                A_stacked = stack_channels(coded_channels, stack)
+            U_S, S_S, V_S, _ = process_channel(A_stacked, f"RGB ({stack} στοίβαξη)", K_MAX)
+            del A_stacked
+            (U_R, S_R, V_R), (U_G, S_G, V_G), (U_B, S_B, V_B) = split_stacked_factors(U_S, S_S, V_S, stack, 3)
+
+        if RANK_TARGET is not None:
+            if color == 'rgb' and stack == 'none':
+                ranks = select_target_ranks([(S_R, R_norm), (S_G, G_norm), (S_B, B_norm)])
+            else:
+                print("Το RANK_TARGET αγνοείται με μετασχηματισμό χρώματος ή στοίβαξη "
+                      "(χρησιμοποιείται το RANKS_TO_TEST).")
+        budgets = [channel_rank_budget(k, color) for k in ranks]
+
+        # Κανένα k δεν ξεπερνά τις ιδιάζουσες τιμές που υπολογίστηκαν (K_MAX ή ο βαθμός του
+        # καναλιού): περιορίζεται, ώστε οι ετικέτες και ο CR να αντιστοιχούν στην ανακατασκευή
+        channel_ranks = (len(S_R), len(S_G), len(S_B))
+        capped = [tuple(min(b_c, rank) for b_c, rank in zip(budget, channel_ranks)) for budget in budgets]
+        if capped != budgets:
+            print(f"Σημείωση: υπολογίστηκαν {'/'.join(map(str, channel_ranks))} ιδιάζουσες τιμές ανά κανάλι· "
+                  f"τα μεγαλύτερα k περιορίζονται σε αυτές.")
+            if color == 'rgb':
+                ranks = sorted(set(min(k, min(channel_ranks)) for k in ranks))
+                budgets = [channel_rank_budget(k, color) for k in ranks]
+            else:
+                budgets = capped
 
         # --- Γ) Βήματα 5 & 6: Ανακατασκευή, Αποθήκευση και Αξιολόγηση ---
         print("\n--- Βήματα 5, 6 & Αξιολόγηση ---")
@@ -75,65 +447,89 @@ def run_compression_pipeline():
         results_table = [] # Για αποθήκευση αποτελεσμάτων
         compressed_images = []
         
-        for k in RANKS_TO_TEST:
-            print(f"Ανακατασκευή και Αξιολόγηση για k = {k}...")
-            
-            # Βήμα 5: Ανακατασκευή κάθε καναλιού (Επιστρέφει UNINT8, 0-255)
-            R_k = reconstruct_channel(U_R, S_R, V_R, k)
-            G_k = reconstruct_channel(U_G, S_G, V_G, k)
-            B_k = reconstruct_channel(U_B, S_B, V_B, k)
+        # Βήμα 5: Σταδιακή ανακατασκευή κάθε καναλιού (Επιστρέφει UNINT8, 0-255)
+        # Κάθε A_k χτίζεται πάνω στο προηγούμενο A_{k_prev}, με αύξουσα σειρά k
+        # (με μετασχηματισμό χρώματος: float, και μετά αντίστροφος μετασχηματισμός σε R, G, B)
+        as_uint8 = color == 'rgb'
+        sweeps = stage_iter('reconstruct', zip(
+            reconstruct_channel_sweep(U_R, S_R, V_R, [b[0] for b in budgets], as_uint8),
+            reconstruct_channel_sweep(U_G, S_G, V_G, [b[1] for b in budgets], as_uint8),
+            reconstruct_channel_sweep(U_B, S_B, V_B, [b[2] for b in budgets], as_uint8),
+        ))
+        
+        for k, budget, ((_, R_k), (_, G_k), (_, B_k)) in zip(ranks, budgets, sweeps):
+            if color == 'rgb':
+                print(f"Ανακατασκευή και Αξιολόγηση για k = {k}...")
+            else:
+                print(f"Ανακατασκευή και Αξιολόγηση για k = {'/'.join(map(str, budget))}...")
+                with stage('color_transform'):
+                    R_k, G_k, B_k = inverse_color_transform_to_uint8((R_k, G_k, B_k), T_color)
             
             # Βήμα 6: Επανένωση και Αποθήκευση
-            compressed_image_np = merge_and_save_image(R_k, G_k, B_k, k, original_shape)
+            with stage('png'):
+                compressed_image_np = merge_and_save_image(R_k, G_k, B_k, k, original_shape)
             compressed_images.append(compressed_image_np)
-
-            # --- Υπολογισμός Μετρικών (evaluation.py) ---
-            
-            # 1. Μέσο Τετραγωνικό Σφάλμα (MSE)
-            # Υπολογίζεται για κάθε κανάλι και λαμβάνεται ο μέσος όρος
-            mse_r = calculate_mse(R_channel, R_k)
-            mse_g = calculate_mse(G_channel, G_k)
-            mse_b = calculate_mse(B_channel, B_k)
-            avg_mse = (mse_r + mse_g + mse_b) / 3.0
             
-            # 2. Λόγος Συμπίεσης (CR)
-            cr = calculate_compression_ratio(M, N, k)
+            # Αποθήκευση των παραγόντων (U_k, S_k, V_k) στη μορφή .svdc
+            # (η μορφή .svdc έχει ένα k για όλα τα κανάλια, κανέναν μετασχηματισμό χρώματος
+            # και ξεχωριστούς U, V ανά κανάλι)
+            if SAVE_SVDC and color == 'rgb' and stack == 'none':
+                svdc_filename = f'compressed_k{k}.svdc'
+                with stage('svdc'):
+                    svdc_bytes = write_svdc(svdc_filename, [(U_R, S_R, V_R), (U_G, S_G, V_G), (U_B, S_B, V_B)],
+                                            k, SVDC_DTYPE, SVDC_CODEC)
+                print(f"Παράγοντες k={k} αποθηκεύτηκαν ως: {svdc_filename} "
+                      f"({svdc_bytes} bytes, CR στον δίσκο {M * N * 3 / svdc_bytes:.2f})")
+
+            # --- Λόγος Συμπίεσης (CR), με τον βαθμό κάθε καναλιού (evaluation.py) ---
+            if color == 'rgb':
+                cr = calculate_compression_ratio(M, N, k, channels=3, stack=stack)
+            else:
+                cr = calculate_effective_compression_ratio(M, N, budget)
             
             # Αποθήκευση αποτελεσμάτων
             results_table.append({
                 'k': k, 
                 'CR': cr, 
-                'MSE': avg_mse
+                'budget': budget
             })
 
+        # --- Υπολογισμός Μετρικών (evaluation.py) ---
+        # MSE, PSNR (και SSIM, αν ζητηθεί) για όλα τα k και τα κανάλια μαζί, σε ένα πέρασμα
+        # ανά λωρίδα γραμμών. Το MSE κάθε k είναι ο μέσος όρος των τριών καναλιών (γραμμή "all").
+        original_img = np.dstack((R_channel, G_channel, B_channel))
+        with stage('evaluate'):
+            metrics = evaluate_reconstructions(original_img, compressed_images, ranks, CHANNEL_NAMES,
+                                               ssim=ssim)
+        overall = {row['k']: row for row in metrics if row['channel'] == 'all'}
+        for res in results_table:
+            res.update(MSE=overall[res['k']]['MSE'], PSNR=overall[res['k']]['PSNR'],
+                       SSIM=overall[res['k']]['SSIM'])
+
         # --- Δ) Παρουσίαση Αποτελεσμάτων Πίνακα ---
         print("\n=========================================")
         print("📊 ΠOΣΟΤΙΚΗ ΑΞΙΟΛΟΓΗΣΗ ΣΥΜΠΙΕΣΗΣ")
         print("=========================================")
-        print(f"{'k':<5} | {'Λόγος Συμπίεσης (CR)':<25} | {'Μέσο Σφάλμα (MSE)':<20}")
-        print("-" * 52)
+        if color != 'rgb':
+            print(f"Χώρος χρώματος: {color}, k ανά κανάλι: {'/'.join(CHANNEL_LABELS[color])}")
+        k_width = 5 if color == 'rgb' else 10
+        ssim_header = f" | {'SSIM':<6}" if ssim else ""
+        print(f"{'k':<{k_width}} | {'Λόγος Συμπίεσης (CR)':<25} | {'Μέσο Σφάλμα (MSE)':<20} | "
+              f"{'PSNR (dB)':<9}{ssim_header}")
+        print("-" * ((68 if ssim else 59) + k_width))
         for res in results_table:
             # Εμφάνιση Λόγου Συμπίεσης ως CR : 1.00
-            print(f"{res['k']:<5} | {res['CR']:.2f} : 1.00{'':<18} | {res['MSE']:.2f}{'':<20}")
+            k_label = res['k'] if color == 'rgb' else '/'.join(map(str, res['budget']))
+            cr_label = f"{res['CR']:.2f} : 1.00"
+            ssim_label = f" | {res['SSIM']:<6.4f}" if ssim else ""
+            print(f"{k_label:<{k_width}} | {cr_label:<25} | {res['MSE']:<20.2f} | "
+                  f"{res['PSNR']:<9.2f}{ssim_label}")
             
         # --- Ε) Οπτικοποίηση Αποτελεσμάτων ---
-        fig, axes = plt.subplots(1, len(RANKS_TO_TEST) + 1, figsize=(18, 5))
-        
-        # Αρχική Εικόνα (χρησιμοποιούμε τα ομαλοποιημένα κανάλια για εμφάνιση)
-        original_img_norm = np.dstack((R_norm, G_norm, B_norm))
-        axes[0].imshow(original_img_norm)
-        axes[0].set_title(f"Original\n({original_shape[0]}x{original_shape[1]})")
-        
-        # Συμπιεσμένες Εικόνες (χρησιμοποιούμε τα UINT8)
-        for i, k in enumerate(RANKS_TO_TEST):
-            axes[i + 1].imshow(compressed_images[i])
-            axes[i + 1].set_title(f"k = {k}")
-            
-        for ax in axes:
-            ax.axis('off')
-
-        plt.tight_layout()
-        plt.show()
+        # Αρχική Εικόνα από τα κανάλια uint8 (ίδια εμφάνιση με τα ομαλοποιημένα)
+        with stage('plot'):
+            plot_results(original_img, compressed_images,
+                         [res['k'] for res in results_table], original_shape, plot_mode)
 
         # Ολοκλήρωση
         print("\nΗ διαδικασία συμπίεσης SVD ολοκληρώθηκε επιτυχώς.")
@@ -145,8 +541,45 @@ def run_compression_pipeline():
         # Έξοδος για αποφυγή προβλημάτων
         exit()
 
+def parse_args(argv=None):
+    """
+    Ορίσματα γραμμής εντολών του main.py.
+    """
+    parser = argparse.ArgumentParser(description="SVD συμπίεση εικόνας.")
+    parser.add_argument('--workers', type=int, default=WORKERS,
+                        help="Πλήθος παράλληλων εργατών για τα κανάλια R, G, B (1 = σειριακά).")
+    parser.add_argument('--plot', choices=PLOT_MODES, default=PLOT_MODE,
+                        help="Γράφημα σύγκρισης: show, file (σε PLOT_FILE), none ή auto.")
+    parser.add_argument('--color', choices=COLOR_TRANSFORMS, default=COLOR_TRANSFORM,
+                        help="Μετασχηματισμός χρώματος πριν από την SVD (rgb = κανένας).")
+    parser.add_argument('--stack', choices=STACK_MODES, default=STACK_CHANNELS,
+                        help="Κοινή SVD των καναλιών: horizontal (κοινός U), vertical (κοινός V) ή none.")
+    parser.add_argument('--ssim', action='store_true', default=EVAL_SSIM,
+                        help="Υπολογισμός και εμφάνιση του SSIM (αργό).")
+    parser.add_argument('--profile', nargs='?', const='profile', default=None, metavar='PREFIX',
+                        help="Καταγραφή χρόνου/μνήμης ανά στάδιο σε <PREFIX>.json και "
+                             "<PREFIX>_trace.json (Chrome trace).")
+    args = parser.parse_args(argv)
+    if args.stack != 'none' and args.color != 'rgb':
+        parser.error("το --stack δεν συνδυάζεται με --color ycbcr/klt (η κοινή SVD απαιτεί ίδιο k σε όλα τα κανάλια)")
+    return args
+
 if __name__ == '__main__':
     # Βεβαιωθείτε ότι η εικόνα (mario_clean.png) βρίσκεται στον βασικό φάκελο,
     # ένα επίπεδο πάνω από τον φάκελο 'scripts'.
+    args = parse_args()
+    
+    if args.profile:
+        enable_profiling()
+    
+    run_compression_pipeline(workers=args.workers, plot_mode=args.plot, color=args.color, stack=args.stack,
+                             ssim=args.ssim)
+    
+    for path in wait_for_plots():
+        print(f"Γράφημα σύγκρισης αποθηκεύτηκε ως: {path}")
     
-    run_compression_pipeline()
\ No newline at end of file
+    if args.profile:
+        print_profile_report()
+        export_json(f"{args.profile}.json")
+        export_chrome_trace(f"{args.profile}_trace.json")
+        print(f"Καταγραφή σταδίων: {args.profile}.json, {args.profile}_trace.json")
\ No newline at end of file
@@ -1,10 +1,25 @@
+import time
 import numpy as np
 
-def matrix_multiply(A, B):
-    """
-    Υπολογίζει το γινόμενο C = A @ B χρησιμοποιώντας εμφωλευμένους βρόχους (loops).
-    """
-    
+# --- Backends (μηχανές υπολογισμού) ---
+# Οι υλοποιήσεις με βρόχους κρατιούνται ως αναφορά ("loops"),
+# ενώ η κανονική εκτέλεση χρησιμοποιεί διανυσματικούς πυρήνες NumPy/BLAS ("numpy").
+# Το "blocked" είναι χειρόγραφος πυρήνας σε πλακίδια (tiles) για όταν απαιτείται δική μας υλοποίηση.
+DEFAULT_BACKEND = 'numpy'
+_active_backend = DEFAULT_BACKEND
+
+# Μέγεθος πλακιδίου για το "blocked" backend.
+# None σημαίνει αυτόματη ρύθμιση (auto-tuning) κατά την πρώτη χρήση.
+BLOCK_SIZE_CANDIDATES = (32, 64, 128, 256)
+_block_size = None
+
+# Πλάτος των λωρίδων στηλών (panels) στον υπολογισμό του W = A^T A
+GRAM_PANEL_SIZE = 256
+
+
+# --- Υλοποιήσεις αναφοράς με εμφωλευμένους βρόχους ---
+
+def _check_multiply_shapes(A, B):
     # Έλεγχος συμβατότητας διαστάσεων
     # Ο Α πρέπει να είναι M x K και ο Β πρέπει να είναι K x N
     if A.shape[1] != B.shape[0]:
@@ -12,14 +27,20 @@ def matrix_multiply(A, B):
             f"Οι διαστάσεις δεν είναι συμβατές για πολλαπλασιασμό: "
             f"A ({A.shape[0]}x{A.shape[1]}) και B ({B.shape[0]}x{B.shape[1]})."
         )
-    
+
+def _matrix_multiply_loops(A, B):
+    """
+    Υπολογίζει το γινόμενο C = A @ B χρησιμοποιώντας εμφωλευμένους βρόχους (loops).
+    """
+    _check_multiply_shapes(A, B)
+
     M = A.shape[0]  # Αριθμός γραμμών του C
     K = A.shape[1]  # Κοινή διάσταση (εσωτερικός βρόχος)
     N = B.shape[1]  # Αριθμός στηλών του C
-    
+
     # Δημιουργία του πίνακα αποτελέσματος C (M x N) με αρχικοποίηση στο μηδέν
     C = np.zeros((M, N), dtype=A.dtype)
-    
+
     # Εμφωλευμένοι βρόχοι για τον υπολογισμό του C[i, j]
     for i in range(M):      # Διασχίζει τις γραμμές του Α
         for j in range(N):  # Διασχίζει τις στήλες του Β
@@ -28,25 +49,25 @@ def matrix_multiply(A, B):
                 # Ορισμός του C[i, j] = sum_{k} A[i, k] * B[k, j]
                 sum_val += A[i, k] * B[k, j]
             C[i, j] = sum_val
-            
+
     return C
 
-def matrix_transpose(A):
+def _matrix_transpose_loops(A):
     """
     Υπολογίζει τον ανάστροφο πίνακα A^T.
     """
     M, N = A.shape
     # Ο ανάστροφος έχει διαστάσεις N x M
     A_T = np.zeros((N, M), dtype=np.float64)
-    
+
     for i in range(M):
         for j in range(N):
             # Η θέση (i,j) γίνεται (j,i)
             A_T[j, i] = A[i, j]
-            
+
     return A_T
 
-def matrix_scalar_multiply(A, scalar):
+def _matrix_scalar_multiply_loops(A, scalar):
     """
     Πολλαπλασιάζει κάθε στοιχείο του πίνακα Α με έναν αριθμό (scalar).
     Υλοποίηση με εμφωλευμένους βρόχους (loops).
@@ -54,11 +75,318 @@ def matrix_scalar_multiply(A, scalar):
     M, N = A.shape
     # Δημιουργία νέου πίνακα ίδιων διαστάσεων
     result = np.zeros((M, N), dtype=np.float64)
-    
+
     for i in range(M):
         for j in range(N):
             # Πολλαπλασιάζουμε το κάθε στοιχείο ξεχωριστά
             result[i, j] = A[i, j] * scalar
-            
+
     return result
 
+def _gram_matrix_loops(A, chunk_rows=None):
+    """
+    Υπολογίζει τον συμμετρικό πίνακα W = A^T A με βρόχους, μόνο για j >= i,
+    και αντιγράφει το άνω τρίγωνο στο κάτω. Δεν δημιουργεί τον A^T.
+    """
+    M, N = A.shape
+    W = np.zeros((N, N), dtype=np.float64)
+
+    for i in range(N):
+        for j in range(i, N):
+            sum_val = 0
+            for r in range(M):
+                # W[i, j] = sum_r A[r, i] * A[r, j]
+                sum_val += A[r, i] * A[r, j]
+            W[i, j] = sum_val
+            W[j, i] = sum_val
+
+    return W
+
+
+# --- Διανυσματικές υλοποιήσεις (NumPy / BLAS) ---
+# Κρατούν τον τύπο κινητής υποδιαστολής της εισόδου (float32 ή float64), ώστε να
+# μπορεί να γίνει όλος ο υπολογισμός σε float32. Οι ακέραιοι τύποι γίνονται float64.
+
+def _float_dtype(A):
+    if np.issubdtype(A.dtype, np.floating):
+        return A.dtype
+    return np.float64
+
+def _matrix_multiply_numpy(A, B):
+    """
+    Υπολογίζει το γινόμενο C = A @ B με έναν πυρήνα BLAS (np.matmul).
+    """
+    _check_multiply_shapes(A, B)
+    # Ίδιος τύπος αποτελέσματος με την υλοποίηση αναφοράς (dtype του A)
+    return np.matmul(A, B).astype(A.dtype, copy=False)
+
+def _matrix_transpose_numpy(A):
+    """
+    Υπολογίζει τον ανάστροφο A^T ως νέο συνεχή (contiguous) πίνακα.
+    """
+    return np.ascontiguousarray(A.T, dtype=_float_dtype(A))
+
+def _matrix_scalar_multiply_numpy(A, scalar):
+    """
+    Πολλαπλασιάζει κάθε στοιχείο του Α με το scalar σε ένα διανυσματικό βήμα.
+    """
+    return np.multiply(A, scalar, dtype=_float_dtype(A))
+
+
+def _gram_matrix_panels(A, multiply, chunk_rows=None, panel_size=GRAM_PANEL_SIZE):
+    # Κοινός πυρήνας (τύπου SYRK) για W = A^T A:
+    # για κάθε λωρίδα στηλών j0:j1 υπολογίζεται μόνο το W[j0:j1, j0:] (άνω τρίγωνο),
+    # με το A[:, j0:j1].T ως όψη (view) και όχι ως νέο ανάστροφο αντίγραφο.
+    # Με chunk_rows ο A διατρέχεται σε ομάδες γραμμών και το W συσσωρεύεται.
+    M, N = A.shape
+    W = np.zeros((N, N), dtype=_float_dtype(A))
+    row_step = chunk_rows or M
+
+    for r0 in range(0, M, row_step):
+        A_rows = A[r0:r0 + row_step]
+        for j0 in range(0, N, panel_size):
+            j1 = min(j0 + panel_size, N)
+            W[j0:j1, j0:] += multiply(A_rows[:, j0:j1].T, A_rows[:, j0:])
+
+    # Καθρέφτισμα του άνω τριγώνου στο κάτω
+    for j0 in range(0, N, panel_size):
+        j1 = min(j0 + panel_size, N)
+        W[j1:, j0:j1] = W[j0:j1, j1:].T
+
+    return W
+
+def _gram_matrix_numpy(A, chunk_rows=None):
+    """
+    Υπολογίζει τον W = A^T A κατά λωρίδες του άνω τριγώνου με BLAS.
+    """
+    return _gram_matrix_panels(A, np.matmul, chunk_rows)
+
+
+# --- Υλοποιήσεις σε πλακίδια (cache-blocked / tiled) ---
+
+def _matrix_multiply_blocked(A, B, block_size=None):
+    """
+    Υπολογίζει το γινόμενο C = A @ B σε πλακίδια (tiles) μεγέθους block_size x block_size.
+
+    Κάθε πλακίδιο του C ενημερώνεται με C_ij += A_ik @ B_kj, όπου τα A_ik, B_kj
+    είναι υπο-πίνακες NumPy που χωράνε στην cache. Η σειρά i -> k -> j διατρέχει
+    τον B κατά γραμμές, όχι στοιχείο-στοιχείο κατά στήλες.
+    """
+    _check_multiply_shapes(A, B)
+    if block_size is None:
+        block_size = get_block_size()
+
+    M, K = A.shape
+    N = B.shape[1]
+    C = np.zeros((M, N), dtype=A.dtype)
+
+    for i0 in range(0, M, block_size):
+        i1 = min(i0 + block_size, M)
+        for k0 in range(0, K, block_size):
+            k1 = min(k0 + block_size, K)
+            A_block = A[i0:i1, k0:k1]
+            for j0 in range(0, N, block_size):
+                j1 = min(j0 + block_size, N)
+                C[i0:i1, j0:j1] += A_block @ B[k0:k1, j0:j1]
+
+    return C
+
+def _matrix_transpose_blocked(A, block_size=None):
+    """
+    Υπολογίζει τον ανάστροφο A^T αντιγράφοντας πλακίδια, ώστε οι αναγνώσεις
+    και οι εγγραφές να μένουν τοπικές στην cache.
+    """
+    if block_size is None:
+        block_size = get_block_size()
+
+    M, N = A.shape
+    A_T = np.empty((N, M), dtype=_float_dtype(A))
+
+    for i0 in range(0, M, block_size):
+        i1 = min(i0 + block_size, M)
+        for j0 in range(0, N, block_size):
+            j1 = min(j0 + block_size, N)
+            A_T[j0:j1, i0:i1] = A[i0:i1, j0:j1].T
+
+    return A_T
+
+def _gram_matrix_blocked(A, chunk_rows=None):
+    """
+    Υπολογίζει τον W = A^T A κατά λωρίδες του άνω τριγώνου με τον πυρήνα σε πλακίδια.
+    """
+    return _gram_matrix_panels(A, _matrix_multiply_blocked, chunk_rows)
+
+def autotune_block_size(sample_size=512, candidates=BLOCK_SIZE_CANDIDATES, repeats=2, seed=0):
+    """
+    Επιλέγει το ταχύτερο μέγεθος πλακιδίου για τον _matrix_multiply_blocked,
+    χρονομετρώντας έναν τετραγωνικό πολλαπλασιασμό sample_size x sample_size.
+
+    Επιστρέφει: Το καλύτερο μέγεθος πλακιδίου (το οποίο και ενεργοποιείται).
+    """
+    rng = np.random.default_rng(seed)
+    A = rng.random((sample_size, sample_size))
+    B = rng.random((sample_size, sample_size))
+
+    best_size, best_time = None, np.inf
+    for size in candidates:
+        elapsed = np.inf
+        for _ in range(repeats):
+            start = time.perf_counter()
+            _matrix_multiply_blocked(A, B, block_size=size)
+            elapsed = min(elapsed, time.perf_counter() - start)
+        if elapsed < best_time:
+            best_size, best_time = size, elapsed
+
+    set_block_size(best_size)
+    return best_size
+
+def set_block_size(block_size):
+    """
+    Ορίζει το μέγεθος πλακιδίου του "blocked" backend (None για αυτόματη ρύθμιση).
+    """
+    global _block_size
+    if block_size is not None and block_size < 1:
+        raise ValueError(f"Το μέγεθος πλακιδίου πρέπει να είναι θετικό, δόθηκε {block_size}.")
+    _block_size = block_size
+
+def get_block_size():
+    """
+    Επιστρέφει το μέγεθος πλακιδίου, εκτελώντας auto-tuning την πρώτη φορά αν δεν έχει οριστεί.
+    """
+    if _block_size is None:
+        autotune_block_size()
+    return _block_size
+
+
+# --- Μητρώο (registry) των backends ---
+# Κάθε backend ορίζει τις βασικές πράξεις πινάκων του project.
+_BACKENDS = {
+    'loops': {
+        'matrix_multiply': _matrix_multiply_loops,
+        'matrix_transpose': _matrix_transpose_loops,
+        'matrix_scalar_multiply': _matrix_scalar_multiply_loops,
+        'gram_matrix': _gram_matrix_loops,
+    },
+    'numpy': {
+        'matrix_multiply': _matrix_multiply_numpy,
+        'matrix_transpose': _matrix_transpose_numpy,
+        'matrix_scalar_multiply': _matrix_scalar_multiply_numpy,
+        'gram_matrix': _gram_matrix_numpy,
+    },
+    'blocked': {
+        'matrix_multiply': _matrix_multiply_blocked,
+        'matrix_transpose': _matrix_transpose_blocked,
+        'matrix_scalar_multiply': _matrix_scalar_multiply_numpy,
+        'gram_matrix': _gram_matrix_blocked,
+    },
+}
+
+def available_backends():
+    """
+    Επιστρέφει τα ονόματα των διαθέσιμων backends.
+    """
+    return list(_BACKENDS)
+
+def get_backend():
+    """
+    Επιστρέφει το όνομα του ενεργού backend.
+    """
+    return _active_backend
+
+def set_backend(name):
+    """
+    Επιλέγει το backend που θα χρησιμοποιούν οι matrix_multiply, matrix_transpose,
+    matrix_scalar_multiply και gram_matrix ("loops", "numpy" ή "blocked").
+
+    Επιστρέφει: Το όνομα του backend που ήταν ενεργό πριν την αλλαγή.
+    """
+    global _active_backend
+    if name not in _BACKENDS:
+        raise ValueError(
+            f"Άγνωστο backend: '{name}'. Διαθέσιμα: {', '.join(_BACKENDS)}."
+        )
+    previous = _active_backend
+    _active_backend = name
+    return previous
+
+def _kernel(operation):
+    return _BACKENDS[_active_backend][operation]
+
+
+# --- Δημόσιες συναρτήσεις (δρομολόγηση στο ενεργό backend) ---
+
+def matrix_multiply(A, B):
+    """
+    Υπολογίζει το γινόμενο C = A @ B με το ενεργό backend.
+    """
+    return _kernel('matrix_multiply')(A, B)
+
+def matrix_transpose(A):
+    """
+    Υπολογίζει τον ανάστροφο πίνακα A^T με το ενεργό backend.
+    """
+    return _kernel('matrix_transpose')(A)
+
+def matrix_scalar_multiply(A, scalar):
+    """
+    Πολλαπλασιάζει κάθε στοιχείο του πίνακα Α με έναν αριθμό (scalar) με το ενεργό backend.
+    """
+    return _kernel('matrix_scalar_multiply')(A, scalar)
+
+def gram_matrix(A, chunk_rows=None):
+    """
+    Υπολογίζει τον συμμετρικό πίνακα W = A^T A (N x N) με το ενεργό backend.
+
+    Υπολογίζεται μόνο το άνω τρίγωνο (περίπου οι μισές πράξεις) και καθρεφτίζεται,
+    χωρίς να δημιουργηθεί ο ανάστροφος A^T. Με chunk_rows ο A διατρέχεται σε
+    ομάδες γραμμών, ώστε να μη χρειάζεται ποτέ ολόκληρο αντίγραφο του A.
+    """
+    return _kernel('gram_matrix')(A, chunk_rows)
+
+
+def check_backend_parity(shapes=((7, 5, 3), (16, 16, 16), (33, 12, 20)), atol=1e-10, seed=0):
+    """
+    Ελέγχει ότι όλα τα backends δίνουν τα ίδια αποτελέσματα (εντός ανοχής atol)
+    με την υλοποίηση αναφοράς "loops".
+
+    shapes: Λίστα από τριάδες (M, K, N) για τους πολλαπλασιασμούς A (M x K) @ B (K x N).
+
+    Επιστρέφει: Λεξικό {backend: μέγιστη απόκλιση}. Εγείρει AssertionError αν
+    κάποιο backend αποκλίνει περισσότερο από atol.
+    """
+    rng = np.random.default_rng(seed)
+    reference = _BACKENDS['loops']
+    max_errors = {}
+
+    for name, kernels in _BACKENDS.items():
+        max_err = 0.0
+        for M, K, N in shapes:
+            A = rng.random((M, K))
+            B = rng.random((K, N))
+
+            pairs = [
+                (kernels['matrix_multiply'](A, B), reference['matrix_multiply'](A, B)),
+                (kernels['matrix_transpose'](A), reference['matrix_transpose'](A)),
+                (kernels['matrix_scalar_multiply'](A, 255.0), reference['matrix_scalar_multiply'](A, 255.0)),
+                (kernels['gram_matrix'](A), reference['gram_matrix'](A)),
+                (kernels['gram_matrix'](A, chunk_rows=4), reference['gram_matrix'](A)),
+            ]
+            for result, expected in pairs:
+                if result.shape != expected.shape:
+                    raise AssertionError(
+                        f"Backend '{name}': λάθος διαστάσεις {result.shape} αντί για {expected.shape}."
+                    )
+                max_err = max(max_err, float(np.max(np.abs(result - expected))))
+
+        if max_err > atol:
+            raise AssertionError(f"Backend '{name}' αποκλίνει κατά {max_err:.3e} (ανοχή {atol:.0e}).")
+        max_errors[name] = max_err
+
+    return max_errors
+
+
+# --- ΔΟΚΙΜΑΣΤΙΚΟ ΜΕΡΟΣ ---
+if __name__ == '__main__':
+    print("Έλεγχος συμφωνίας (parity) των backends με την υλοποίηση αναφοράς:")
+    for backend_name, error in check_backend_parity().items():
+        print(f"  {backend_name:<8} μέγιστη απόκλιση: {error:.2e}")
@@ -0,0 +1,281 @@
+import os
+import json
+import time
+import threading
+import functools
+import tracemalloc
+from contextlib import nullcontext
+
+# --- Ελαφριά καταγραφή χρόνου/μνήμης ανά στάδιο της διαδικασίας ---
+# Κάθε στάδιο τυλίγεται με `with stage("όνομα"):` ή με τον decorator @profiled("όνομα").
+# Όταν η καταγραφή είναι ανενεργή (προεπιλογή), το stage() επιστρέφει ένα κοινό
+# κενό context manager, οπότε το κόστος είναι μία κλήση συνάρτησης.
+#
+# Για κάθε στάδιο καταγράφονται: χρόνος (wall), χρόνος CPU της διεργασίας, μέγιστη
+# μνήμη που δεσμεύτηκε μέσα στο στάδιο (tracemalloc, περιλαμβάνει τα buffers του NumPy)
+# και, αν δοθεί, μια εκτίμηση των πράξεων κινητής υποδιαστολής (FLOPs).
+# Με νήματα η μέγιστη μνήμη είναι κοινή για όλα (προσεγγιστική), ενώ οι διεργασίες
+# του ProcessPoolExecutor έχουν δική τους (μη καταγεγραμμένη) κατάσταση.
+
+_enabled = False
+_trace_memory = False
+_records = []
+_origin = time.perf_counter()
+_local = threading.local()
+_NULL_STAGE = nullcontext()
+
+
+def enable_profiling(memory=True):
+    """
+    Ενεργοποιεί την καταγραφή και μηδενίζει τις προηγούμενες εγγραφές.
+
+    memory: Καταγραφή της μέγιστης μνήμης με tracemalloc (επιβαρύνει λίγο τις δεσμεύσεις).
+    """
+    global _enabled, _trace_memory, _origin
+    reset_profile()
+    _enabled = True
+    _trace_memory = memory
+    _origin = time.perf_counter()
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+def disable_profiling():
+    global _enabled
+    _enabled = False
+    if _trace_memory and tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+def is_profiling():
+    return _enabled
+
+def reset_profile():
+    _records.clear()
+
+def get_records():
+    """
+    Επιστρέφει τις εγγραφές: λεξικά {name, start_s, wall_s, cpu_s, peak_bytes, flops,
+    depth, pid, tid} με τη σειρά που ολοκληρώθηκαν τα στάδια.
+    """
+    return list(_records)
+
+def _stack():
+    stack = getattr(_local, 'stack', None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+class _Stage:
+    # Ενεργό στάδιο (μόνο όταν η καταγραφή είναι ενεργή)
+    __slots__ = ('name', 'flops', 'discard', 'start_wall', 'start_cpu', 'start_mem', 'peak_mem')
+
+    def __init__(self, name, flops):
+        self.name = name
+        self.flops = flops
+        self.discard = False
+
+    def __enter__(self):
+        stack = _stack()
+        if _trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            # Το μέγιστο του γονικού σταδίου μέχρι εδώ κρατιέται πριν μηδενιστεί ο μετρητής
+            if stack:
+                stack[-1].peak_mem = max(stack[-1].peak_mem, peak)
+            tracemalloc.reset_peak()
+            self.start_mem = self.peak_mem = current
+        stack.append(self)
+        self.start_cpu = time.process_time()
+        self.start_wall = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        wall = time.perf_counter() - self.start_wall
+        cpu = time.process_time() - self.start_cpu
+        stack = _stack()
+        stack.pop()
+
+        peak_bytes = None
+        if _trace_memory:
+            self.peak_mem = max(self.peak_mem, tracemalloc.get_traced_memory()[1])
+            peak_bytes = self.peak_mem - self.start_mem
+            if stack:
+                stack[-1].peak_mem = max(stack[-1].peak_mem, self.peak_mem)
+            tracemalloc.reset_peak()
+
+        if self.discard:
+            return False
+        _records.append({
+            'name': self.name,
+            'start_s': self.start_wall - _origin,
+            'wall_s': wall,
+            'cpu_s': cpu,
+            'peak_bytes': peak_bytes,
+            'flops': self.flops,
+            'depth': len(stack),
+            'pid': os.getpid(),
+            'tid': threading.get_ident(),
+        })
+        return False
+
+def stage(name, flops=None):
+    """
+    Context manager για ένα στάδιο: `with stage("eigensolve", flops=9 * N**3): ...`
+
+    flops: Εκτίμηση των πράξεων κινητής υποδιαστολής του σταδίου (προαιρετική).
+    """
+    if not _enabled:
+        return _NULL_STAGE
+    return _Stage(name, flops)
+
+def profiled(name=None, flops=None):
+    """
+    Decorator που καταγράφει κάθε κλήση της συνάρτησης ως στάδιο.
+
+    flops: Σταθερός αριθμός ή συνάρτηση (*args, **kwargs) -> FLOPs.
+    """
+    def decorator(func):
+        stage_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            estimate = flops(*args, **kwargs) if callable(flops) else flops
+            with _Stage(stage_name, estimate):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+def stage_iter(name, iterable):
+    """
+    Τυλίγει έναν generator ώστε κάθε βήμα του (η κλήση next) να καταγράφεται ως στάδιο,
+    π.χ. για τη σταδιακή ανακατασκευή που γίνεται μέσα στον generator.
+    """
+    iterator = iter(iterable)
+    while True:
+        current = stage(name)
+        with current:
+            try:
+                item = next(iterator)
+            except StopIteration:
+                # Η τελευταία (κενή) κλήση δεν είναι βήμα του generator
+                if current is not _NULL_STAGE:
+                    current.discard = True
+                return
+        yield item
+
+
+# --- Εκτιμήσεις FLOPs (πολλαπλασιασμοί + προσθέσεις) ---
+
+def gram_flops(M, N):
+    # W = A^T A: μόνο το άνω τρίγωνο υπολογίζεται (SYRK), M * N * (N + 1)
+    return M * N * (N + 1)
+
+def matmul_flops(M, K, N):
+    return 2 * M * K * N
+
+def full_eigh_flops(N):
+    # Συμμετρική ιδιοανάλυση με ιδιοδιανύσματα, περίπου 9 N^3 (Golub & Van Loan)
+    return 9 * N ** 3
+
+
+# --- Αναφορά και εξαγωγή ---
+
+def summarize(records=None):
+    """
+    Συγκεντρώνει τις εγγραφές ανά όνομα σταδίου (με τη σειρά πρώτης εμφάνισης).
+
+    Επιστρέφει: Λίστα από λεξικά {name, calls, wall_s, cpu_s, peak_bytes, flops, gflops_per_s}.
+    """
+    records = _records if records is None else records
+    by_name = {}
+    for rec in sorted(records, key=lambda r: r['start_s']):
+        entry = by_name.setdefault(rec['name'], {
+            'name': rec['name'], 'calls': 0, 'wall_s': 0.0, 'cpu_s': 0.0,
+            'peak_bytes': None, 'flops': None,
+        })
+        entry['calls'] += 1
+        entry['wall_s'] += rec['wall_s']
+        entry['cpu_s'] += rec['cpu_s']
+        if rec['peak_bytes'] is not None:
+            entry['peak_bytes'] = max(entry['peak_bytes'] or 0, rec['peak_bytes'])
+        if rec['flops'] is not None:
+            entry['flops'] = (entry['flops'] or 0) + rec['flops']
+
+    summary = list(by_name.values())
+    for entry in summary:
+        entry['gflops_per_s'] = None
+        if entry['flops'] is not None and entry['wall_s'] > 0:
+            entry['gflops_per_s'] = entry['flops'] / entry['wall_s'] / 1e9
+    return summary
+
+def print_profile_report(records=None):
+    summary = summarize(records)
+    print("\n=========================================")
+    print("ΧΡΟΝΟΙ ΚΑΙ ΜΝΗΜΗ ΑΝΑ ΣΤΑΔΙΟ")
+    print("=========================================")
+    print(f"{'Στάδιο':<18} | {'Κλήσεις':>7} | {'Wall s':>8} | {'CPU s':>8} | {'Peak MB':>8} | {'GFLOP/s':>8}")
+    print("-" * 72)
+    for entry in summary:
+        peak = f"{entry['peak_bytes'] / 1024 ** 2:>8.1f}" if entry['peak_bytes'] is not None else f"{'-':>8}"
+        rate = f"{entry['gflops_per_s']:>8.2f}" if entry['gflops_per_s'] is not None else f"{'-':>8}"
+        print(f"{entry['name']:<18} | {entry['calls']:>7} | {entry['wall_s']:>8.3f} | "
+              f"{entry['cpu_s']:>8.3f} | {peak} | {rate}")
+
+def export_json(path, records=None):
+    """
+    Γράφει τις εγγραφές και τη σύνοψη ανά στάδιο σε αρχείο JSON.
+    """
+    records = _records if records is None else records
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'records': records, 'summary': summarize(records)}, f, indent=2, ensure_ascii=False)
+
+def export_chrome_trace(path, records=None):
+    """
+    Γράφει τις εγγραφές σε μορφή Chrome trace (chrome://tracing ή ui.perfetto.dev).
+    """
+    records = _records if records is None else records
+    events = []
+    for rec in records:
+        args = {'cpu_s': rec['cpu_s']}
+        if rec['peak_bytes'] is not None:
+            args['peak_bytes'] = rec['peak_bytes']
+        if rec['flops'] is not None:
+            args['flops'] = rec['flops']
+        events.append({
+            'name': rec['name'],
+            'ph': 'X',
+            'ts': rec['start_s'] * 1e6,
+            'dur': rec['wall_s'] * 1e6,
+            'pid': rec['pid'],
+            'tid': rec['tid'],
+            'args': args,
+        })
+
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+
+
+# --- ΔΟΚΙΜΑΣΤΙΚΟ ΜΕΡΟΣ ---
+if __name__ == '__main__':
+    import numpy as np
+
+    # Κόστος όταν η καταγραφή είναι ανενεργή
+    calls = 1_000_000
+    start = time.perf_counter()
+    for _ in range(calls):
+        with stage('noop'):
+            pass
+    print(f"Ανενεργό stage(): {(time.perf_counter() - start) / calls * 1e9:.0f} ns ανά κλήση")
+
+    enable_profiling()
+    A = np.random.default_rng(0).random((1000, 500))
+    with stage('gram', flops=gram_flops(*A.shape)):
+        W = A.T @ A
+        with stage('eigh', flops=full_eigh_flops(W.shape[0])):
+            np.linalg.eigh(W)
+    disable_profiling()
+
+    print_profile_report()
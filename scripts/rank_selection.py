@@ -0,0 +1,127 @@
+import numpy as np
+from evaluation import predicted_mse_curve, calculate_compression_ratio
+
+# Επιλογή βαθμού k με βάση στόχο ποιότητας ή συμπίεσης, αντί για σταθερή λίστα k.
+# Όλες οι αναζητήσεις γίνονται με δυαδική αναζήτηση (binary search) πάνω σε
+# μονότονες καμπύλες που προκύπτουν μόνο από τις ιδιάζουσες τιμές του svd_core.
+
+def _smallest_k(values, satisfied):
+    # Δυαδική αναζήτηση: το μικρότερο k με satisfied(values[k]) == True,
+    # όταν η συνθήκη είναι μονότονη (False ... False True ... True).
+    # Επιστρέφει None αν δεν ικανοποιείται για κανένα k.
+    low, high = 0, len(values) - 1
+    if high < 0 or not satisfied(values[high]):
+        return None
+    
+    while low < high:
+        mid = (low + high) // 2
+        if satisfied(values[mid]):
+            high = mid
+        else:
+            low = mid + 1
+    
+    return low
+
+def select_rank_for_mse(S_vector, shape, max_mse, total_energy=None):
+    """
+    Το μικρότερο k με προβλεπόμενο MSE <= max_mse.
+    
+    Επιστρέφει: Το k ή None αν ο στόχος δεν επιτυγχάνεται με τις διαθέσιμες σ_i.
+    """
+    curve = predicted_mse_curve(S_vector, shape, total_energy)
+    return _smallest_k(curve, lambda mse: mse <= max_mse)
+
+def select_rank_for_psnr(S_vector, shape, min_psnr, total_energy=None):
+    """
+    Το μικρότερο k με PSNR >= min_psnr (dB).
+    
+    Το PSNR = 10 * log10(255^2 / MSE) είναι φθίνον ως προς το MSE, άρα ο στόχος
+    μετατρέπεται σε όριο MSE: MSE <= 255^2 / 10^(min_psnr / 10).
+    """
+    max_mse = (255.0 ** 2) / (10.0 ** (min_psnr / 10.0))
+    return select_rank_for_mse(S_vector, shape, max_mse, total_energy)
+
+def select_rank_for_energy(S_vector, fraction, total_energy=None):
+    """
+    Το μικρότερο k που κρατά τουλάχιστον fraction (π.χ. 0.99) της φασματικής
+    ενέργειας sum σ_i^2.
+    """
+    energies = np.square(np.asarray(S_vector, dtype=np.float64))
+    if total_energy is None:
+        total_energy = np.sum(energies)
+    
+    # Ποσοστό ενέργειας που κρατιέται για k = 0, 1, ..., len(S_vector)
+    retained = np.concatenate(([0.0], np.cumsum(energies))) / total_energy
+    return _smallest_k(retained, lambda value: value >= fraction)
+
+def select_rank_for_compression_ratio(shape, min_cr):
+    """
+    Το μεγαλύτερο k με λόγο συμπίεσης CR >= min_cr.
+    
+    Το CR = M*N / (k*(M+N+1)) είναι φθίνον ως προς k, οπότε αναζητούμε το πρώτο k
+    που παραβιάζει τον στόχο και επιστρέφουμε το προηγούμενο.
+    """
+    M, N = shape[0], shape[1]
+    candidate_ks = np.arange(1, min(M, N) + 1)
+    first_violation = _smallest_k(
+        candidate_ks, lambda k: calculate_compression_ratio(M, N, k) < min_cr
+    )
+    
+    if first_violation is None:
+        return int(candidate_ks[-1])
+    if first_violation == 0:
+        return None # Ούτε με k = 1 δεν επιτυγχάνεται ο στόχος
+    return int(candidate_ks[first_violation - 1])
+
+def select_rank(S_vector, shape, target, total_energy=None):
+    """
+    Επιλέγει k για ένα κανάλι με βάση ένα λεξικό στόχων, π.χ.
+    {'psnr': 30.0}, {'mse': 50.0}, {'energy': 0.99} ή {'cr': 10.0}.
+    
+    Οι στόχοι ποιότητας (mse, psnr, energy) δίνουν ελάχιστο k (κρατάμε το μεγαλύτερο),
+    ενώ ο στόχος 'cr' δίνει μέγιστο k. Αν συγκρούονται, υπερισχύει το 'cr'.
+    Το k δεν ξεπερνά ποτέ το len(S_vector): με μόνο 'cr' (π.χ. {'cr': 3.0}) επιστρέφεται
+    το πολύ το πλήθος των ιδιάζουσων τιμών που υπολογίστηκαν (K_MAX).
+    
+    Επιστρέφει: Το k ή None αν κάποιος στόχος ποιότητας δεν επιτυγχάνεται.
+    """
+    quality_ks = []
+    for criterion, value in target.items():
+        if criterion == 'mse':
+            quality_ks.append(select_rank_for_mse(S_vector, shape, value, total_energy))
+        elif criterion == 'psnr':
+            quality_ks.append(select_rank_for_psnr(S_vector, shape, value, total_energy))
+        elif criterion == 'energy':
+            quality_ks.append(select_rank_for_energy(S_vector, value, total_energy))
+        elif criterion != 'cr':
+            raise ValueError(f"Άγνωστο κριτήριο επιλογής βαθμού: '{criterion}'.")
+    
+    if any(k is None for k in quality_ks):
+        return None
+    
+    # Για k = 0 θα έμενε κενή εικόνα, κρατάμε τουλάχιστον μία συνιστώσα
+    k = max(quality_ks + [1])
+    
+    if 'cr' in target:
+        k_cr = select_rank_for_compression_ratio(shape, target['cr'])
+        if k_cr is None or len(S_vector) == 0:
+            return None
+        # Ο CR επιτρέπει μεγαλύτερο k από όσες σ_i υπάρχουν: το μικρότερο k έχει μεγαλύτερο CR
+        k_cr = min(k_cr, len(S_vector))
+        if not quality_ks:
+            return k_cr
+        k = min(k, k_cr)
+    
+    return k
+
+
+# --- ΔΟΚΙΜΑΣΤΙΚΟ ΜΕΡΟΣ ---
+if __name__ == '__main__':
+    print("Το rank_selection.py επιλέγει βαθμό k από στόχους MSE/PSNR/ενέργειας/CR.")
+    
+    # Συνθετικό φάσμα με εκθετική απόσβεση για ένα κανάλι 500 x 300
+    S_test = 50.0 * np.exp(-np.arange(300) / 20.0)
+    shape_test = (500, 300)
+    print(f"k για PSNR >= 30 dB: {select_rank_for_psnr(S_test, shape_test, 30.0)}")
+    print(f"k για 99% ενέργεια: {select_rank_for_energy(S_test, 0.99)}")
+    print(f"k για CR >= 10: {select_rank_for_compression_ratio(shape_test, 10.0)}") # 18
@@ -0,0 +1,123 @@
+import os
+import shutil
+import hashlib
+import tempfile
+import numpy as np
+
+# --- Μόνιμη cache (στον δίσκο) των παραγόντων U, S, V ανά κανάλι ---
+# Κάθε εγγραφή είναι ένας φάκελος <CACHE_DIR>/<κλειδί>/ με τα U.npy, S.npy, V.npy.
+# Χρησιμοποιούμε .npy (και όχι .npz) ώστε να φορτώνονται με memory-mapping.
+CACHE_DIR = '.svd_cache'
+
+# Μέγιστο συνολικό μέγεθος της cache· οι λιγότερο πρόσφατα χρησιμοποιημένες
+# εγγραφές (LRU) διαγράφονται όταν ξεπεραστεί.
+CACHE_MAX_BYTES = 512 * 1024 ** 2
+
+# Έκδοση του αλγορίθμου: αλλάζει όταν αλλάζει ο τρόπος υπολογισμού των παραγόντων,
+# ώστε να μη χρησιμοποιούνται παλιές εγγραφές.
+# 2: σχετικό κατώφλι βαθμού (svd_core.rank_tolerance) και έλεγχος σύγκλισης σε float32.
+CACHE_VERSION = 2
+
+FACTOR_NAMES = ('U', 'S', 'V')
+
+
+def cache_key(A_channel, **params):
+    """
+    Υπολογίζει το κλειδί (SHA-256) μιας εγγραφής από τα bytes των pixels του καναλιού,
+    τις διαστάσεις/τύπο του, την CACHE_VERSION και τις παραμέτρους του υπολογισμού
+    (π.χ. method, k_max, backend).
+    """
+    A_channel = np.ascontiguousarray(A_channel)
+
+    digest = hashlib.sha256()
+    digest.update(f"v{CACHE_VERSION}|{A_channel.shape}|{A_channel.dtype.str}|".encode())
+    digest.update(repr(sorted(params.items())).encode())
+    digest.update(A_channel.tobytes())
+
+    return digest.hexdigest()
+
+def load_factors(key, cache_dir=CACHE_DIR):
+    """
+    Φορτώνει τους παράγοντες U, S, V μιας εγγραφής ως memory-mapped πίνακες (μόνο ανάγνωση).
+
+    Επιστρέφει: (U, S_vector, V) ή None αν η εγγραφή δεν υπάρχει.
+    """
+    entry_dir = os.path.join(cache_dir, key)
+    paths = [os.path.join(entry_dir, f"{name}.npy") for name in FACTOR_NAMES]
+    if not all(os.path.isfile(path) for path in paths):
+        return None
+
+    try:
+        factors = tuple(np.load(path, mmap_mode='r') for path in paths)
+    except (OSError, ValueError):
+        # Κατεστραμμένη εγγραφή: τη θεωρούμε ανύπαρκτη
+        return None
+
+    # Ενημέρωση του χρόνου τελευταίας χρήσης για την πολιτική LRU
+    os.utime(entry_dir)
+
+    return factors
+
+def save_factors(key, U, S_vector, V, cache_dir=CACHE_DIR, max_bytes=CACHE_MAX_BYTES):
+    """
+    Αποθηκεύει τους παράγοντες μιας εγγραφής και εφαρμόζει την πολιτική LRU.
+
+    Τα αρχεία γράφονται πρώτα σε προσωρινό φάκελο και μετονομάζονται, ώστε μια
+    διακοπή να μην αφήνει μισογραμμένη εγγραφή.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    entry_dir = os.path.join(cache_dir, key)
+
+    tmp_dir = tempfile.mkdtemp(prefix='.tmp-', dir=cache_dir)
+    try:
+        for name, factor in zip(FACTOR_NAMES, (U, S_vector, V)):
+            np.save(os.path.join(tmp_dir, f"{name}.npy"), np.ascontiguousarray(factor))
+
+        if os.path.isdir(entry_dir):
+            shutil.rmtree(entry_dir)
+        os.replace(tmp_dir, entry_dir)
+    except Exception:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+    evict_lru(cache_dir, max_bytes, keep=key)
+
+def _entry_size(entry_dir):
+    return sum(
+        entry.stat().st_size for entry in os.scandir(entry_dir) if entry.is_file()
+    )
+
+def evict_lru(cache_dir=CACHE_DIR, max_bytes=CACHE_MAX_BYTES, keep=None):
+    """
+    Διαγράφει τις λιγότερο πρόσφατα χρησιμοποιημένες εγγραφές μέχρι το συνολικό
+    μέγεθος της cache να πέσει κάτω από max_bytes. Η εγγραφή keep δεν διαγράφεται.
+
+    Επιστρέφει: Τα κλειδιά των εγγραφών που διαγράφηκαν.
+    """
+    if not os.path.isdir(cache_dir):
+        return []
+
+    entries = [
+        (entry.stat().st_mtime, entry.name, _entry_size(entry.path))
+        for entry in os.scandir(cache_dir)
+        if entry.is_dir() and not entry.name.startswith('.tmp-')
+    ]
+    total = sum(size for _, _, size in entries)
+
+    evicted = []
+    for _, name, size in sorted(entries):
+        if total <= max_bytes:
+            break
+        if name == keep:
+            continue
+        shutil.rmtree(os.path.join(cache_dir, name), ignore_errors=True)
+        total -= size
+        evicted.append(name)
+
+    return evicted
+
+def clear_cache(cache_dir=CACHE_DIR):
+    """
+    Διαγράφει ολόκληρη την cache.
+    """
+    shutil.rmtree(cache_dir, ignore_errors=True)
@@ -1,8 +1,66 @@
+import warnings
 import numpy as np
-from metrics_calculation import matrix_multiply, matrix_transpose
+from metrics_calculation import matrix_multiply
 
-def calculate_eigens(W_matrix):
+# Πλευρά του πίνακα Gram: "right" για W = A^T A (N x N, ιδιοδιανύσματα = V),
+# "left" για W = A A^T (M x M, ιδιοδιανύσματα = U), "auto" για τον μικρότερο από τους δύο.
+GRAM_SIDES = ('auto', 'right', 'left')
+
+def choose_gram_side(shape, side='auto'):
+    """
+    Επιλέγει την πλευρά του πίνακα Gram για έναν πίνακα διαστάσεων shape = (M, N).
+    
+    Οι μη μηδενικές ιδιοτιμές των A^T A και A A^T είναι ίδιες (σ_i^2), οπότε με "auto"
+    επιλέγεται ο μικρότερος: για μια φαρδιά εικόνα (N > M) ο M x M πίνακας A A^T,
+    ώστε το κόστος της ιδιοανάλυσης να εξαρτάται από το min(M, N).
+    
+    Επιστρέφει: "right" ή "left".
+    """
+    if side not in GRAM_SIDES:
+        raise ValueError(f"Άγνωστη πλευρά Gram: '{side}'. Διαθέσιμες: {', '.join(GRAM_SIDES)}.")
+    if side != 'auto':
+        return side
+    
+    M, N = shape
+    return 'left' if M < N else 'right'
+
+# Στοίβαξη των C καναλιών για μία κοινή SVD αντί για C ξεχωριστές:
+# "horizontal": [A_R A_G A_B] (M x CN) = U S [V_R; V_G; V_B]^T, κοινός U για όλα τα κανάλια
+# "vertical":   [A_R; A_G; A_B] (CM x N) = [U_R; U_G; U_B] S V^T, κοινός V για όλα τα κανάλια
+# "none":       ξεχωριστή SVD ανά κανάλι.
+# Ο κοινός παράγοντας (και οι σ_i) αποθηκεύεται μία φορά (βλ. calculate_compression_ratio).
+STACK_MODES = ('none', 'horizontal', 'vertical')
+
+def stack_channels(channels, stack='horizontal'):
+    """
+    Ενώνει τα κανάλια (M x N το καθένα) σε έναν πίνακα M x CN ή CM x N.
+    """
+    if stack == 'horizontal':
+        return np.hstack(channels)
+    if stack == 'vertical':
+        return np.vstack(channels)
+    raise ValueError(f"Άγνωστη στοίβαξη: '{stack}'. Διαθέσιμες: horizontal, vertical.")
+
+def split_stacked_factors(U, S_vector, V, stack, n_channels):
+    """
+    Χωρίζει την SVD του στοιβαγμένου πίνακα σε παράγοντες ανά κανάλι, ώστε
+    A_c ~ U_c diag(S) V_c^T. Ο κοινός παράγοντας και οι σ_i είναι ίδιοι (όχι αντίγραφα)
+    για όλα τα κανάλια, οπότε η ανακατασκευή ανά κανάλι μένει όπως είναι.
+    
+    Επιστρέφει: Λίστα με (U_c, S_vector, V_c) για κάθε κανάλι.
+    """
+    if stack == 'horizontal':
+        return [(U, S_vector, V_c) for V_c in np.split(V, n_channels, axis=0)]
+    if stack == 'vertical':
+        return [(U_c, S_vector, V) for U_c in np.split(U, n_channels, axis=0)]
+    raise ValueError(f"Άγνωστη στοίβαξη: '{stack}'. Διαθέσιμες: horizontal, vertical.")
+
+def calculate_eigens(W_matrix, k_max=None):
     # Βήμα 3: Υπολογισμός ιδιοτιμών (lambdas) και ιδιοδιανυσμάτων (V)
+    # Αν ζητηθούν μόνο οι k_max μεγαλύτερες, δεν κάνουμε πλήρη ιδιοανάλυση του N x N πίνακα
+    if k_max is not None and k_max < W_matrix.shape[0]:
+        return calculate_top_eigens(W_matrix, k_max)
+
     # Χρησιμοποιούμε την np.linalg.eigh όπως ρητά επιτρέπεται από τις οδηγίες
     lambdas, V = np.linalg.eigh(W_matrix)
     
@@ -14,38 +72,225 @@ def calculate_eigens(W_matrix):
     
     return lambdas, V
 
-def calculate_svd_matrices(A_norm, lambdas, V_full):
+def calculate_top_eigens(W_matrix, k, oversampling=None, tol=1e-8, max_iter=100, seed=0):
+    """
+    Υπολογίζει μόνο τις k μεγαλύτερες ιδιοτιμές και τα αντίστοιχα ιδιοδιανύσματα
+    του συμμετρικού W με επανάληψη υποχώρου (subspace iteration) και Rayleigh-Ritz.
+    
+    Σε κάθε βήμα ο υπόχωρος Q (N x (k + oversampling)) πολλαπλασιάζεται με τον W και
+    ορθοκανονικοποιείται (QR). Η ιδιοανάλυση γίνεται μόνο στον μικρό πίνακα Q^T W Q.
+    Σταματά όταν το σχετικό υπόλοιπο ||W v_i - λ_i v_i|| / λ_1 πέσει κάτω από tol.
+    Το tol δεν μπορεί να είναι μικρότερο από 10 * eps του τύπου του W: σε float32 το
+    υπόλοιπο σταματά να πέφτει γύρω στο 5e-7 (~4 eps), οπότε ένα tol = 1e-8 δεν θα
+    ικανοποιούνταν ποτέ. Αν φτάσει τις max_iter επαναλήψεις χωρίς σύγκλιση, δίνει
+    RuntimeWarning.
+    
+    Επιστρέφει: lambdas (k) και V (N x k), σε φθίνουσα σειρά όπως η calculate_eigens.
+    """
+    N = W_matrix.shape[0]
+    tol = max(tol, 10 * np.finfo(W_matrix.dtype).eps)
+    if oversampling is None:
+        oversampling = max(k, 10)
+    block = min(N, k + oversampling)
+
+    # Σταθερός σπόρος για αναπαραγώγιμα αποτελέσματα
+    rng = np.random.default_rng(seed)
+    Q, _ = np.linalg.qr(rng.standard_normal((N, block)).astype(W_matrix.dtype))
+
+    for _ in range(max_iter):
+        Z = matrix_multiply(W_matrix, Q)
+        
+        # Rayleigh-Ritz: ιδιοανάλυση του μικρού (block x block) πίνακα T = Q^T W Q
+        T = matrix_multiply(Q.T, Z)
+        thetas, S = np.linalg.eigh(T)
+        thetas = thetas[::-1][:k]
+        S = S[:, ::-1][:, :k]
+        
+        V = matrix_multiply(Q, S)
+        residual = matrix_multiply(Z, S) - V * thetas
+        relative_residual = np.max(np.linalg.norm(residual, axis=0)) / max(abs(thetas[0]), 1e-300)
+        if relative_residual <= tol:
+            break
+        
+        Q, _ = np.linalg.qr(Z)
+    else:
+        warnings.warn(f"calculate_top_eigens: δεν συνέκλινε σε {max_iter} επαναλήψεις "
+                      f"(σχετικό υπόλοιπο {relative_residual:.1e} > tol {tol:.1e}).", RuntimeWarning)
+
+    return thetas, V
+
+def rank_tolerance(A_norm, sigmas):
+    """
+    Όριο αριθμητικού βαθμού: max(M, N) * eps * σ_1, με το eps του τύπου του A (για τις
+    ιδιοτιμές λ_i του W δίνεται max(M, N) * eps * λ_1). Ένα απόλυτο όριο (π.χ. 1e-10)
+    αγνοεί την κλίμακα του A και την ακρίβεια του float32.
+    """
+    sigma_1 = np.max(sigmas) if len(sigmas) else 0.0
+    return max(A_norm.shape) * np.finfo(A_norm.dtype).eps * sigma_1
+
+def calculate_svd_matrices(A_norm, lambdas, V_full, k_max=None, column_block=None, side='right'):
+    # Αν τα ιδιοδιανύσματα προέρχονται από τον W = A A^T (side="left"), είναι τα u_i:
+    # ο άλλος παράγοντας βγαίνει συμμετρικά, v_i = (1/σ_i) * (A^T u_i)
+    if side == 'left':
+        V_matrix, S_vector, U_matrix = calculate_svd_matrices(A_norm.T, lambdas, V_full, k_max, column_block)
+        return U_matrix, S_vector, V_matrix
+    
     # Βήμα 4α: Υπολογισμός ιδιάζουσων τιμών σ_i = sqrt(λ_i)- χρησιμοποιώ το np.maximu() για να αποφύγω το σφάλμα στρογγυλοποίησης
     sigmas = np.sqrt(np.maximum(lambdas, 0))
     
     # Επιλογή μη μηδενικών τιμών (προσδιορισμός rank) - επιλέγω μόνο όσες δεν είναι  ή πολύ μικρές 
     # Βαθμός πίνακα = πλήθος από ανεξάρτητες πληροφορίες που περιέχονται στο κανάλι της εικόνας
-    non_zero_sigmas_idx = sigmas > 1e-10 
+    # Το όριο είναι σχετικό και ανάλογο της ακρίβειας του τύπου, όπως στην qr_svd, αλλά
+    # εφαρμόζεται στις λ_i: η ιδιοανάλυση του W έχει σφάλμα ~ eps * λ_1, δηλαδή οι σ_i κάτω
+    # από ~ sqrt(eps) * σ_1 είναι θόρυβος στρογγυλοποίησης
+    non_zero_sigmas_idx = np.flatnonzero(lambdas > rank_tolerance(A_norm, lambdas))
+    
+    # Αν ζητηθεί k_max, σταματάμε στις k_max μεγαλύτερες αντί για ολόκληρο το rank
+    if k_max is not None:
+        non_zero_sigmas_idx = non_zero_sigmas_idx[:k_max]
     S_vector = sigmas[non_zero_sigmas_idx]
     
     # Ο πίνακας V περιέχει ως στήλες τα διανύσματα v_i (Βήμα 4β)
     V_matrix = V_full[:, non_zero_sigmas_idx]
     
-    # Βήμα 4γ: Υπολογισμός του πίνακα U κατά στήλες: u_i = (1/σ_i) * (A * v_i)
+    # Βήμα 4γ: Υπολογισμός του πίνακα U για όλες τις στήλες μαζί: U = (A * V) / σ
+    # (κάθε στήλη u_i = (1/σ_i) * (A * v_i)), με ένα γινόμενο αντί για ένα ανά στήλη
     M, N = A_norm.shape #Διαστάσεις του πίνακα
-    U_matrix = np.zeros((M, len(S_vector))) #Δημιουργεία κενού πίνακα με μηδενικά
+    rank = len(S_vector)
     
-    for i in range(len(S_vector)): #Για κάθε στήλη  u_i ξεχωριστά 
-        # Επιλέγουμε την i-οστή ιδιάζουσα τιμή και το αντίστοιχο i-οστό ιδιοδιάνυσμα του V 
-        sigma_i = S_vector[i]
-        # Επιλογή της i-οστής στήλης του V
-        v_i = V_matrix[:, i]
-        
-        # Μετατροπή του διανύσματος v_i σε πίνακα (N x 1) για τον custom πολλαπλασιασμό
-        v_i_2d = v_i.reshape(-1, 1)
-        
-        # Χρήση της custom matrix_multiply
-        A_times_v_i_2d = matrix_multiply(A_norm, v_i_2d)
+    if column_block is None or column_block >= rank:
+        U_matrix = matrix_multiply(A_norm, V_matrix)
+        U_matrix /= S_vector
+    else:
+        # Υπολογισμός ανά ομάδες στηλών για έλεγχο της μνήμης των ενδιάμεσων
+        U_matrix = np.empty((M, rank), dtype=A_norm.dtype)
+        for c0 in range(0, rank, column_block):
+            c1 = min(c0 + column_block, rank)
+            U_matrix[:, c0:c1] = matrix_multiply(A_norm, V_matrix[:, c0:c1]) / S_vector[c0:c1]
         
-        # Επαναφορά σε μορφή διανύσματος (flatten) και υπολογισμός του u_i
-        u_i = (1.0 / sigma_i) * A_times_v_i_2d.flatten()
-        
-        # Τοποθέτηση του u_i στην i-οστή στήλη του U
-        U_matrix[:, i] = u_i
-        
-    return U_matrix, S_vector, V_matrix
\ No newline at end of file
+    return U_matrix, S_vector, V_matrix
+
+def randomized_svd(A_norm, k, oversampling=10, power_iterations=2, seed=0):
+    """
+    Τυχαιοποιημένη SVD (Halko-Martinsson-Tropp) για τις k κορυφαίες ιδιάζουσες τριάδες,
+    εναλλακτική των calculate_eigens/calculate_svd_matrices που δεν σχηματίζει τον W = A^T A.
+    
+    1. Y = A * Omega, με Omega τυχαίο Gaussian πίνακα N x (k + oversampling)
+    2. power_iterations επαναλήψεις Y = A (A^T Q) με ορθοκανονικοποίηση (QR) σε κάθε βήμα,
+       ώστε να "οξυνθεί" το φάσμα όταν οι ιδιάζουσες τιμές φθίνουν αργά
+    3. B = Q^T A (μικρός πίνακας (k + oversampling) x N) και SVD του B
+    
+    seed: Σταθερός σπόρος της γεννήτριας για αναπαραγώγιμα αποτελέσματα.
+    
+    Επιστρέφει: U (M x k), S_vector (k), V (N x k) όπως η calculate_svd_matrices.
+    """
+    if k is None:
+        raise ValueError("Η τυχαιοποιημένη SVD απαιτεί πεπερασμένο k (ορίστε K_MAX).")
+    
+    M, N = A_norm.shape
+    block = min(k + oversampling, M, N)
+    
+    # Βήμα 1: Τυχαία προβολή και ορθοκανονική βάση Q του εύρους (range) του A
+    rng = np.random.default_rng(seed)
+    Omega = rng.standard_normal((N, block)).astype(A_norm.dtype)
+    Q, _ = np.linalg.qr(matrix_multiply(A_norm, Omega))
+    
+    # Βήμα 2: Επαναλήψεις δύναμης (power iterations)
+    for _ in range(power_iterations):
+        Z, _ = np.linalg.qr(matrix_multiply(A_norm.T, Q))
+        Q, _ = np.linalg.qr(matrix_multiply(A_norm, Z))
+    
+    # Βήμα 3: SVD του μικρού πίνακα B = Q^T A και επιστροφή στον αρχικό χώρο
+    B = matrix_multiply(Q.T, A_norm)
+    U_small, sigmas, Vt = np.linalg.svd(B, full_matrices=False)
+    
+    # Κρατάμε τις k πρώτες μη μηδενικές ιδιάζουσες τιμές, όπως στην calculate_svd_matrices
+    keep = np.flatnonzero(sigmas[:k] > rank_tolerance(A_norm, sigmas))
+    S_vector = sigmas[keep]
+    U_matrix = matrix_multiply(Q, U_small[:, keep])
+    V_matrix = Vt[keep, :].T
+    
+    return U_matrix, S_vector, V_matrix
+
+def qr_svd(A_norm, k_max=None):
+    """
+    SVD χωρίς πίνακα Gram: QR παραγοντοποίηση και SVD του μικρού τριγωνικού παράγοντα.
+    
+    Ο W = A^T A τετραγωνίζει τον δείκτη κατάστασης (cond(W) = cond(A)^2), οπότε οι μικρές
+    σ_i χάνονται (σ_i^2 κάτω από την ακρίβεια του τύπου) και οι στήλες u_i = A v_i / σ_i
+    παύουν να είναι ορθογώνιες. Εδώ δουλεύουμε απευθείας με τον A:
+    
+    1. A = Q R (Q: M x N ορθοκανονικός, R: N x N άνω τριγωνικός), για M >= N
+    2. R = U_R Σ V^T (SVD του μικρού πίνακα R)
+    3. U = Q U_R
+    
+    Για φαρδύ A (M < N) εφαρμόζεται στον A^T. Το σφάλμα είναι της τάξης eps * σ_1 για
+    όλες τις σ_i, οπότε λειτουργεί σωστά και σε float32.
+    
+    Κρατούνται οι σ_i πάνω από max(M, N) * eps * σ_1 (αριθμητικός βαθμός, όπως η
+    np.linalg.matrix_rank) και, αν δοθεί, μόνο οι k_max πρώτες.
+    
+    Επιστρέφει: U (M x k), S_vector (k), V (N x k) όπως η calculate_svd_matrices.
+    """
+    M, N = A_norm.shape
+    if M < N:
+        V_matrix, S_vector, U_matrix = qr_svd(A_norm.T, k_max)
+        return U_matrix, S_vector, V_matrix
+    
+    # Βήμα 1: QR (reduced) του A
+    Q, R = np.linalg.qr(A_norm)
+    
+    # Βήμα 2: SVD του τριγωνικού παράγοντα (N x N)
+    U_R, sigmas, Vt = np.linalg.svd(R)
+    
+    # Αριθμητικός βαθμός με σχετικό κατώφλι (ανάλογο του τύπου float32/float64)
+    tol = rank_tolerance(A_norm, sigmas)
+    keep = np.flatnonzero(sigmas > tol)
+    if k_max is not None:
+        keep = keep[:k_max]
+    
+    # Βήμα 3: U = Q U_R (μόνο για τις στήλες που κρατάμε)
+    U_matrix = matrix_multiply(Q, U_R[:, keep])
+    S_vector = sigmas[keep]
+    V_matrix = Vt[keep, :].T
+    
+    return U_matrix, S_vector, V_matrix
+
+def factorization_report(A_norm, U, S_vector, V, S_reference=None):
+    """
+    Αναφορά ακρίβειας μιας (περικομμένης) SVD A ~ U diag(S) V^T.
+    
+    - orthogonality_U, orthogonality_V: max |U^T U - I| και max |V^T V - I|
+    - residual: max_i ||A v_i - σ_i u_i|| / σ_1 (πόσο ικανοποιείται η A v_i = σ_i u_i)
+    - tail_orthogonality_U, tail_orthogonality_V: το ίδιο στο μισό των στηλών με τις
+      μικρότερες σ_i, όπου χάνεται πρώτα η ορθογωνιότητα του παράγοντα που βγαίνει
+      από τον πίνακα Gram (u_i = A v_i / σ_i ή v_i = A^T u_i / σ_i)
+    - sigma_error: max |σ_i - σ_i(αναφοράς)| / σ_1, αν δοθεί το S_reference
+    
+    Επιστρέφει: Λεξικό με τα παραπάνω και το πλήθος k των συνιστωσών.
+    """
+    U = np.asarray(U, dtype=np.float64)
+    V = np.asarray(V, dtype=np.float64)
+    S_vector = np.asarray(S_vector, dtype=np.float64)
+    k = len(S_vector)
+    sigma_1 = S_vector[0] if k else 1.0
+    
+    gram_U = U.T @ U - np.eye(k)
+    gram_V = V.T @ V - np.eye(k)
+    residual = np.asarray(A_norm, dtype=np.float64) @ V - U * S_vector
+    tail = slice(k // 2, k)
+    
+    report = {
+        'k': k,
+        'orthogonality_U': float(np.max(np.abs(gram_U))) if k else 0.0,
+        'orthogonality_V': float(np.max(np.abs(gram_V))) if k else 0.0,
+        'tail_orthogonality_U': float(np.max(np.abs(gram_U[tail, tail]))) if k > 1 else 0.0,
+        'tail_orthogonality_V': float(np.max(np.abs(gram_V[tail, tail]))) if k > 1 else 0.0,
+        'residual': float(np.max(np.linalg.norm(residual, axis=0)) / sigma_1) if k else 0.0,
+        'sigma_error': None,
+    }
+    if S_reference is not None:
+        rank = min(k, len(S_reference))
+        report['sigma_error'] = float(np.max(np.abs(S_vector[:rank] - S_reference[:rank])) / sigma_1)
+    
+    return report
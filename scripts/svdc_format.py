@@ -0,0 +1,286 @@
+import io
+import lzma
+import zlib
+import struct
+import numpy as np
+
+from compression import reconstruct_channel, add_rank_update, denormalize_into_uint8
+
+# --- Μορφή αρχείου .svdc: συμπαγής αποθήκευση των περικομμένων παραγόντων U_k, S_k, V_k ---
+#
+# Κεφαλίδα (little-endian):
+#   magic b'SVDC' | version (u8) | dtype (u8) | codec (u8) | channels (u8)
+#   M (u32) | N (u32) | k (u32) | group_size (u32)
+#
+# Ακολουθούν ομάδες (groups) από group_size διαδοχικές συνιστώσες, με σειρά
+# φθίνουσας ιδιάζουσας τιμής. Κάθε ομάδα είναι: μήκος (u32) + δεδομένα (συμπιεσμένα με
+# τον codec). Για κάθε κανάλι, τα δεδομένα μιας ομάδας g συνιστωσών περιέχουν:
+#   S (g x float32)
+#   [κλίμακες των στηλών του U (g x float32), μόνο για int8]  U^T (g x M)
+#   [κλίμακες των στηλών του V (g x float32), μόνο για int8]  V^T (g x N)
+# Έτσι κάθε συνιστώσα (σ_i, u_i, v_i) είναι συνεχής και το αρχείο διαβάζεται σταδιακά.
+
+SVDC_MAGIC = b'SVDC'
+SVDC_VERSION = 1
+_HEADER = struct.Struct('<4sBBBBIIII')
+_GROUP_LENGTH = struct.Struct('<I')
+
+FACTOR_DTYPES = {'float16': 0, 'int8': 1}
+CODECS = {'none': 0, 'zlib': 1, 'lzma': 2}
+
+DEFAULT_GROUP_SIZE = 8
+
+
+def _compress(data, codec):
+    if codec == 'zlib':
+        return zlib.compress(data, 9)
+    if codec == 'lzma':
+        return lzma.compress(data)
+    return data
+
+def _decompress(data, codec):
+    if codec == 'zlib':
+        return zlib.decompress(data)
+    if codec == 'lzma':
+        return lzma.decompress(data)
+    return data
+
+def _encode_columns(columns, dtype):
+    # columns: πίνακας (g x L), μία γραμμή ανά διάνυσμα u_i ή v_i
+    if dtype == 'float16':
+        return columns.astype(np.float16).tobytes()
+
+    # int8 με μία κλίμακα ανά στήλη: q = round(x / scale), scale = max|x| / 127
+    scales = np.max(np.abs(columns), axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    quantized = np.clip(np.rint(columns / scales[:, None]), -127, 127).astype(np.int8)
+    return scales.astype(np.float32).tobytes() + quantized.tobytes()
+
+def _decode_columns(buffer, offset, count, length, dtype):
+    # Αντίστροφο του _encode_columns. Επιστρέφει (πίνακας count x length, νέο offset)
+    if dtype == 'float16':
+        columns = np.frombuffer(buffer, np.float16, count * length, offset)
+        return columns.reshape(count, length).astype(np.float32), offset + 2 * count * length
+
+    scales = np.frombuffer(buffer, np.float32, count, offset)
+    offset += 4 * count
+    quantized = np.frombuffer(buffer, np.int8, count * length, offset)
+    columns = quantized.reshape(count, length).astype(np.float32) * scales[:, None]
+    return columns, offset + count * length
+
+
+def write_svdc(path_or_stream, factors, k, dtype='float16', codec='zlib', group_size=DEFAULT_GROUP_SIZE):
+    """
+    Γράφει τις k πρώτες συνιστώσες των παραγόντων κάθε καναλιού σε αρχείο .svdc.
+
+    factors: Λίστα με (U, S_vector, V) ανά κανάλι (π.χ. R, G, B).
+    k: Τουλάχιστον 1. Περιορίζεται στο πλήθος των σ_i του φτωχότερου καναλιού, οπότε
+       μπορεί να γραφτεί αρχείο με k = 0 (π.χ. για ένα εντελώς μαύρο κανάλι).
+    dtype: "float16" ή "int8" (κβάντιση με κλίμακα ανά στήλη) για τα U, V.
+    codec: "none", "zlib" ή "lzma".
+
+    Επιστρέφει: Το μέγεθος του αρχείου σε bytes.
+    """
+    if dtype not in FACTOR_DTYPES:
+        raise ValueError(f"Άγνωστος τύπος: '{dtype}'. Διαθέσιμοι: {', '.join(FACTOR_DTYPES)}.")
+    if codec not in CODECS:
+        raise ValueError(f"Άγνωστος codec: '{codec}'. Διαθέσιμοι: {', '.join(CODECS)}.")
+    if k < 1:
+        raise ValueError(f"Το k πρέπει να είναι τουλάχιστον 1 (δόθηκε {k}).")
+
+    M, N = factors[0][0].shape[0], factors[0][2].shape[0]
+    k = min([k] + [len(S_vector) for _, S_vector, _ in factors])
+
+    stream = path_or_stream
+    if isinstance(path_or_stream, str):
+        stream = open(path_or_stream, 'wb')
+
+    try:
+        written = stream.write(_HEADER.pack(
+            SVDC_MAGIC, SVDC_VERSION, FACTOR_DTYPES[dtype], CODECS[codec],
+            len(factors), M, N, k, group_size,
+        ))
+
+        for i0 in range(0, k, group_size):
+            i1 = min(i0 + group_size, k)
+            parts = []
+            for U, S_vector, V in factors:
+                parts.append(np.asarray(S_vector[i0:i1], dtype=np.float32).tobytes())
+                parts.append(_encode_columns(np.asarray(U[:, i0:i1]).T, dtype))
+                parts.append(_encode_columns(np.asarray(V[:, i0:i1]).T, dtype))
+
+            payload = _compress(b''.join(parts), codec)
+            written += stream.write(_GROUP_LENGTH.pack(len(payload)))
+            written += stream.write(payload)
+    finally:
+        if stream is not path_or_stream:
+            stream.close()
+
+    return written
+
+def read_svdc_header(stream):
+    """
+    Διαβάζει την κεφαλίδα ενός .svdc από ένα ανοιχτό stream (αρχείο ή bytes).
+
+    Επιστρέφει: Λεξικό {dtype, codec, channels, M, N, k, group_size}.
+    """
+    raw = stream.read(_HEADER.size)
+    if len(raw) < _HEADER.size:
+        raise ValueError("Το αρχείο .svdc είναι κομμένο (ελλιπής κεφαλίδα).")
+
+    magic, version, dtype_code, codec_code, channels, M, N, k, group_size = _HEADER.unpack(raw)
+    if magic != SVDC_MAGIC:
+        raise ValueError("Δεν είναι αρχείο .svdc (λάθος magic bytes).")
+    if version != SVDC_VERSION:
+        raise ValueError(f"Μη υποστηριζόμενη έκδοση .svdc: {version}.")
+
+    dtypes = {code: name for name, code in FACTOR_DTYPES.items()}
+    codecs = {code: name for name, code in CODECS.items()}
+    if dtype_code not in dtypes:
+        raise ValueError(f"Άγνωστος κωδικός τύπου παραγόντων στο .svdc: {dtype_code}.")
+    if codec_code not in codecs:
+        raise ValueError(f"Άγνωστος κωδικός συμπίεσης στο .svdc: {codec_code}.")
+    return {
+        'dtype': dtypes[dtype_code],
+        'codec': codecs[codec_code],
+        'channels': channels,
+        'M': M,
+        'N': N,
+        'k': k,
+        'group_size': group_size,
+    }
+
+def iter_svdc_groups(stream, header, max_components=None):
+    """
+    Διαβάζει διαδοχικά τις ομάδες συνιστωσών ενός .svdc (μετά την κεφαλίδα).
+
+    Επιστρέφει (generator): Για κάθε ομάδα, λίστα με (U_g, S_g, V_g) ανά κανάλι,
+    όπου U_g είναι M x g και V_g είναι N x g.
+    """
+    M, N = header['M'], header['N']
+    total = header['k'] if max_components is None else min(header['k'], max_components)
+
+    for i0 in range(0, total, header['group_size']):
+        count = min(header['group_size'], header['k'] - i0)
+        raw_length = stream.read(_GROUP_LENGTH.size)
+        if len(raw_length) < _GROUP_LENGTH.size:
+            raise ValueError("Το αρχείο .svdc είναι κομμένο (ελλιπής ομάδα).")
+        (length,) = _GROUP_LENGTH.unpack(raw_length)
+
+        payload = stream.read(length)
+        if len(payload) < length:
+            raise ValueError("Το αρχείο .svdc είναι κομμένο (ελλιπής ομάδα).")
+        buffer = _decompress(payload, header['codec'])
+
+        offset = 0
+        group = []
+        for _ in range(header['channels']):
+            S_g = np.frombuffer(buffer, np.float32, count, offset).astype(np.float64)
+            offset += 4 * count
+            U_g, offset = _decode_columns(buffer, offset, count, M, header['dtype'])
+            V_g, offset = _decode_columns(buffer, offset, count, N, header['dtype'])
+            group.append((U_g.T.astype(np.float64), S_g, V_g.T.astype(np.float64)))
+
+        yield group
+
+def read_svdc_factors(path_or_stream, k=None):
+    """
+    Διαβάζει μόνο τις ομάδες που χρειάζονται για τις k πρώτες συνιστώσες.
+
+    Επιστρέφει: (header, factors) με factors λίστα από (U, S_vector, V) ανά κανάλι.
+    Για k = 0 (ή αρχείο χωρίς συνιστώσες) οι παράγοντες είναι κενοί (M x 0, 0, N x 0).
+    """
+    stream = path_or_stream
+    if isinstance(path_or_stream, (bytes, bytearray)):
+        stream = io.BytesIO(path_or_stream)
+    elif isinstance(path_or_stream, str):
+        stream = open(path_or_stream, 'rb')
+
+    try:
+        header = read_svdc_header(stream)
+        k = header['k'] if k is None else min(k, header['k'])
+
+        groups = list(iter_svdc_groups(stream, header, k))
+    finally:
+        if stream is not path_or_stream:
+            stream.close()
+
+    factors = []
+    if not groups:
+        empty = (np.empty((header['M'], 0)), np.empty(0), np.empty((header['N'], 0)))
+        return header, [empty] * header['channels']
+
+    for channel in range(header['channels']):
+        U = np.hstack([group[channel][0] for group in groups])[:, :k]
+        S_vector = np.concatenate([group[channel][1] for group in groups])[:k]
+        V = np.hstack([group[channel][2] for group in groups])[:, :k]
+        factors.append((U, S_vector, V))
+
+    return header, factors
+
+def decode_svdc_image(path_or_stream, k=None):
+    """
+    Αποκωδικοποιεί την εικόνα ενός .svdc όταν ζητηθεί (lazy): διαβάζει μόνο όσες
+    συνιστώσες χρειάζονται για το k και ανακατασκευάζει κάθε κανάλι.
+
+    Επιστρέφει: Εικόνα uint8 (M x N x channels).
+    """
+    header, factors = read_svdc_factors(path_or_stream, k)
+    k = len(factors[0][1])
+
+    channels = [reconstruct_channel(U, S_vector, V, k) for U, S_vector, V in factors]
+    return np.dstack(channels)
+
+def progressive_decode(path_or_stream, checkpoints=None):
+    """
+    Προοδευτική (progressive) αποκωδικοποίηση ενός .svdc από αρχείο ή byte stream.
+
+    Οι συνιστώσες διαβάζονται με σειρά φθίνουσας ιδιάζουσας τιμής και προστίθενται
+    σταδιακά στην ανακατασκευή κάθε καναλιού (όπως στη reconstruct_channel_sweep).
+    Έτσι μια πρώτη, χονδρική εικόνα είναι διαθέσιμη μόλις φτάσουν οι πρώτες
+    συνιστώσες και βελτιώνεται όσο φτάνουν οι υπόλοιπες.
+
+    checkpoints: Οι βαθμοί k στους οποίους παράγεται εικόνα (προεπιλογή: στο τέλος
+                 κάθε ομάδας συνιστωσών). Τιμές πάνω από το k του αρχείου αγνοούνται.
+
+    Επιστρέφει (generator): Ζεύγη (k, εικόνα uint8 M x N x channels).
+    """
+    stream = path_or_stream
+    if isinstance(path_or_stream, (bytes, bytearray)):
+        stream = io.BytesIO(path_or_stream)
+    elif isinstance(path_or_stream, str):
+        stream = open(path_or_stream, 'rb')
+
+    try:
+        header = read_svdc_header(stream)
+        M, N, k_total = header['M'], header['N'], header['k']
+
+        if checkpoints is None:
+            checkpoints = list(range(header['group_size'], k_total, header['group_size'])) + [k_total]
+        pending = sorted(k for k in set(checkpoints) if 0 < k <= k_total)
+        if not pending:
+            return
+
+        accumulators = [np.zeros((M, N)) for _ in range(header['channels'])]
+        k_done = 0
+
+        for group in iter_svdc_groups(stream, header, pending[-1]):
+            count = len(group[0][1])
+            start = 0
+
+            # Ένα checkpoint μπορεί να πέφτει μέσα στην ομάδα: προσθέτουμε τμηματικά
+            while start < count:
+                stop = min(count, start + pending[0] - k_done)
+                for A_acc, (U_g, S_g, V_g) in zip(accumulators, group):
+                    add_rank_update(A_acc, U_g[:, start:stop], S_g[start:stop], V_g[:, start:stop])
+                k_done += stop - start
+                start = stop
+
+                if pending and k_done == pending[0]:
+                    pending.pop(0)
+                    yield k_done, np.dstack([denormalize_into_uint8(A_acc) for A_acc in accumulators])
+                    if not pending:
+                        return
+    finally:
+        if stream is not path_or_stream:
+            stream.close()
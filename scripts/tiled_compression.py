@@ -0,0 +1,238 @@
+import os
+import sys
+import argparse
+import tempfile
+import numpy as np
+from PIL import Image
+
+# Προσθέτουμε τον φάκελο 'scripts' στο PATH για να βρει τα modules (όπως στο main.py)
+if 'scripts' not in sys.path:
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from image_split import normalize_and_prepare_w
+from svd_core import calculate_eigens, calculate_svd_matrices, choose_gram_side
+from compression import reconstruct_channel
+from rank_selection import select_rank_for_energy
+
+# --- Συμπίεση σε πλακίδια (tiles) για εικόνες μεγαλύτερες από τη μνήμη ---
+# Κάθε κανάλι χωρίζεται σε πλακίδια TILE_SIZE x TILE_SIZE και κάθε πλακίδιο συμπιέζεται
+# με τη δική του SVD. Η εικόνα διαβάζεται από memory-mapped αρχείο .npy (uint8), άρα
+# η μέγιστη μνήμη εξαρτάται από το μέγεθος του πλακιδίου και όχι της εικόνας.
+TILE_SIZE = 256
+TILE_RANK = 20
+
+# Ύψος (σε γραμμές) των λωρίδων κατά τη μετατροπή εικόνας σε .npy
+CONVERT_STRIP_ROWS = 1024
+
+
+def _raw_rgb_tiles(img):
+    """
+    Για εικόνα αποθηκευμένη ασυμπίεστη (PPM, BMP, ασυμπίεστο TIFF, 8 bit RGB/BGR)
+    επιστρέφει τα τμήματά της ως λίστα (r0, c0, view), όπου view είναι memory-mapped
+    όψη (h x w x 3, σειρά RGB) του αρχείου στον δίσκο, χωρίς αποκωδικοποίηση από το Pillow.
+
+    Επιστρέφει None για κάθε άλλη μορφή (π.χ. PNG, JPEG).
+    """
+    if img.mode != 'RGB' or not img.tile:
+        return None
+
+    tiles = []
+    for tile in img.tile:
+        codec, (c0, r0, c1, r1), offset, args = tile
+        rawmode, stride, orientation = (args, 0, 1) if isinstance(args, str) else args
+        if codec != 'raw' or rawmode not in ('RGB', 'BGR') or orientation not in (1, -1):
+            return None
+
+        h, w = r1 - r0, c1 - c0
+        stride = stride or w * 3
+        rows = np.memmap(img.filename, dtype=np.uint8, mode='r', offset=offset, shape=(h, stride))
+        view = rows[:, :w * 3].reshape(h, w, 3)
+        if orientation == -1:
+            view = view[::-1]
+        if rawmode == 'BGR':
+            view = view[:, :, ::-1]
+        tiles.append((r0, c0, view))
+
+    return tiles
+
+def image_to_memmap(image_path, npy_path, strip_rows=CONVERT_STRIP_ROWS, full_decode=False):
+    """
+    Μετατρέπει μια εικόνα σε αρχείο .npy (uint8, M x N x 3) που μπορεί να ανοιχτεί
+    με memory-mapping, κατά λωρίδες γραμμών.
+
+    Μόνο οι ασυμπίεστες μορφές (PPM, BMP, ασυμπίεστο TIFF, 8 bit RGB) διαβάζονται
+    τμηματικά από τον δίσκο, με μνήμη ανάλογη της λωρίδας. Οι συμπιεσμένες (PNG, JPEG, ...)
+    αποκωδικοποιούνται από το Pillow ολόκληρες στη μνήμη, οπότε απορρίπτονται εκτός αν
+    δοθεί full_decode=True (μνήμη ανάλογη της εικόνας, μία φορά κατά τη μετατροπή).
+
+    Το .npy γράφεται πρώτα σε προσωρινό αρχείο και μετονομάζεται, ώστε μια διακοπή
+    να μην αφήνει μισογραμμένο (αλλά νεότερο από την εικόνα) αρχείο στο npy_path.
+
+    Επιστρέφει: Τον memory-mapped πίνακα (μόνο ανάγνωση).
+    """
+    # Το όριο του Pillow για "decompression bombs" απορρίπτει τις πολύ μεγάλες σαρώσεις
+    max_pixels = Image.MAX_IMAGE_PIXELS
+    Image.MAX_IMAGE_PIXELS = None
+    try:
+        with Image.open(image_path) as img:
+            width, height = img.size
+            tiles = _raw_rgb_tiles(img)
+            if tiles is None:
+                if not full_decode:
+                    raise ValueError(
+                        f"Η {image_path} ({img.format}) δεν διαβάζεται τμηματικά και θα αποκωδικοποιούνταν "
+                        f"ολόκληρη στη μνήμη. Χρησιμοποιήστε .npy, PPM, BMP ή ασυμπίεστο TIFF "
+                        f"(ή --full-decode / full_decode=True).")
+                # Η εικόνα αποκωδικοποιείται μία φορά και γράφεται ανά λωρίδα
+                rgb = img.convert('RGB')
+                tiles = [(0, 0, None)]
+
+            fd, tmp_path = tempfile.mkstemp(prefix='.tmp-', suffix='.npy',
+                                            dir=os.path.dirname(os.path.abspath(npy_path)))
+            os.close(fd)
+            try:
+                target = np.lib.format.open_memmap(tmp_path, mode='w+', dtype=np.uint8,
+                                                   shape=(height, width, 3))
+                for r0, c0, view in tiles:
+                    h, w = (height, width) if view is None else view.shape[:2]
+                    for s0 in range(0, h, strip_rows):
+                        s1 = min(s0 + strip_rows, h)
+                        if view is None:
+                            strip = np.asarray(rgb.crop((0, s0, width, s1)))
+                        else:
+                            strip = view[s0:s1]
+                        target[r0 + s0:r0 + s1, c0:c0 + w] = strip
+                target.flush()
+                del target
+                os.replace(tmp_path, npy_path)
+            except BaseException:
+                # Και με KeyboardInterrupt: κανένα μισογραμμένο αρχείο δεν μένει πίσω
+                os.remove(tmp_path)
+                raise
+    finally:
+        Image.MAX_IMAGE_PIXELS = max_pixels
+
+    return np.load(npy_path, mmap_mode='r')
+
+def open_tiled_source(path, full_decode=False):
+    """
+    Ανοίγει την πηγή της εικόνας: ένα .npy ανοίγει απευθείας (memory-mapped), ενώ κάθε
+    άλλη εικόνα μετατρέπεται πρώτα σε <όνομα>.npy δίπλα στο αρχείο (βλ. image_to_memmap
+    για τις μορφές που μετατρέπονται χωρίς να φορτωθεί όλη η εικόνα).
+    """
+    if path.lower().endswith('.npy'):
+        return np.load(path, mmap_mode='r')
+
+    npy_path = os.path.splitext(path)[0] + '.npy'
+    if not os.path.isfile(npy_path) or os.path.getmtime(npy_path) < os.path.getmtime(path):
+        print(f"Μετατροπή της {path} σε {npy_path} (memory-mapped uint8)...")
+        return image_to_memmap(path, npy_path, full_decode=full_decode)
+
+    return np.load(npy_path, mmap_mode='r')
+
+def compress_tile_channel(A_tile, rank, energy=None):
+    """
+    Συμπιέζει ένα κανάλι ενός πλακιδίου (uint8 ή 0-255) με SVD βαθμού έως rank.
+
+    energy: Αν δοθεί (π.χ. 0.99), ο βαθμός προσαρμόζεται ανά πλακίδιο: το μικρότερο k
+            που κρατά τόσο ποσοστό της ενέργειας, με ανώτατο όριο το rank.
+
+    Επιστρέφει: (ανακατασκευή uint8, βαθμός k που χρησιμοποιήθηκε)
+    """
+    # Τα πλακίδια στις άκρες δεν είναι τετράγωνα: ο μικρότερος πίνακας Gram
+    side = choose_gram_side(A_tile.shape)
+    A_norm, W = normalize_and_prepare_w(A_tile, side=side)
+    lambdas, V_full = calculate_eigens(W)
+    U, S_vector, V = calculate_svd_matrices(A_norm, lambdas, V_full, side=side)
+
+    k = min(rank, len(S_vector))
+    if energy is not None and len(S_vector) > 0:
+        k_energy = select_rank_for_energy(S_vector, energy)
+        if k_energy is not None:
+            k = min(k, max(k_energy, 1))
+
+    if k == 0:
+        # Μηδενικό πλακίδιο (π.χ. μαύρο περιθώριο): τίποτα να αποθηκευτεί
+        return np.zeros(A_tile.shape, dtype=np.uint8), 0
+
+    return reconstruct_channel(U, S_vector, V, k), k
+
+def compress_tiled(source, tile_size=TILE_SIZE, rank=TILE_RANK, energy=None, output_path=None,
+                   full_decode=False):
+    """
+    Συμπίεση σε πλακίδια: κάθε πλακίδιο κάθε καναλιού συμπιέζεται ανεξάρτητα.
+
+    source: Διαδρομή εικόνας/.npy ή πίνακας (M x N x 3), ιδανικά memory-mapped.
+    output_path: Αν δοθεί, η ανακατασκευή γράφεται σε memory-mapped .npy (uint8).
+    full_decode: Επιτρέπει συμπιεσμένες εικόνες (PNG, JPEG) ως πηγή, που αποκωδικοποιούνται
+                 ολόκληρες στη μνήμη κατά τη μετατροπή σε .npy (βλ. image_to_memmap).
+
+    Επιστρέφει: Λεξικό με το MSE, τον λόγο συμπίεσης (πλήθος αποθηκευμένων αριθμών
+    sum k*(m+n+1) σε σχέση με τα pixels) και τους βαθμούς ανά πλακίδιο.
+    """
+    image = open_tiled_source(source, full_decode) if isinstance(source, str) else source
+    M, N, C = image.shape
+
+    output = None
+    if output_path is not None:
+        output = np.lib.format.open_memmap(output_path, mode='w+', dtype=np.uint8, shape=(M, N, C))
+
+    squared_error = 0.0
+    stored_values = 0
+    tile_ranks = []
+
+    for r0 in range(0, M, tile_size):
+        r1 = min(r0 + tile_size, M)
+        for c0 in range(0, N, tile_size):
+            c1 = min(c0 + tile_size, N)
+
+            # Μόνο αυτό το πλακίδιο φορτώνεται στη μνήμη
+            tile = np.asarray(image[r0:r1, c0:c1])
+            ranks = []
+            for channel in range(C):
+                A_k, k = compress_tile_channel(tile[:, :, channel], rank, energy)
+
+                diff = A_k.astype(np.float64) - tile[:, :, channel]
+                squared_error += float(np.sum(diff * diff))
+                stored_values += k * ((r1 - r0) + (c1 - c0) + 1)
+                ranks.append(k)
+
+                if output is not None:
+                    output[r0:r1, c0:c1, channel] = A_k
+
+            tile_ranks.append(((r0, c0), ranks))
+
+    if output is not None:
+        output.flush()
+
+    return {
+        'shape': (M, N, C),
+        'tile_size': tile_size,
+        'MSE': squared_error / (M * N * C),
+        'CR': (M * N * C) / stored_values if stored_values else np.inf,
+        'tile_ranks': tile_ranks,
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="SVD συμπίεση σε πλακίδια για πολύ μεγάλες εικόνες.")
+    parser.add_argument('source', help="Αρχείο .npy (M x N x 3, uint8) ή ασυμπίεστη εικόνα "
+                                       "(PPM, BMP, TIFF).")
+    parser.add_argument('--tile', type=int, default=TILE_SIZE)
+    parser.add_argument('--rank', type=int, default=TILE_RANK)
+    parser.add_argument('--energy', type=float, default=None,
+                        help="Προσαρμοστικός βαθμός ανά πλακίδιο (π.χ. 0.99 της ενέργειας).")
+    parser.add_argument('--output', default=None, help="Αρχείο .npy για την ανακατασκευή.")
+    parser.add_argument('--full-decode', action='store_true',
+                        help="Δέχεται και συμπιεσμένες εικόνες (PNG, JPEG), που φορτώνονται ολόκληρες "
+                             "στη μνήμη κατά τη μετατροπή σε .npy.")
+    return parser.parse_args(argv)
+
+if __name__ == '__main__':
+    args = parse_args()
+    stats = compress_tiled(args.source, args.tile, args.rank, args.energy, args.output, args.full_decode)
+
+    mean_rank = np.mean([k for _, ranks in stats['tile_ranks'] for k in ranks])
+    print(f"Διαστάσεις: {stats['shape']}, πλακίδια {args.tile}x{args.tile}: {len(stats['tile_ranks'])}")
+    print(f"Μέσος βαθμός ανά πλακίδιο: {mean_rank:.1f}")
+    print(f"CR: {stats['CR']:.2f} : 1.00, MSE: {stats['MSE']:.2f}")